@@ -0,0 +1,212 @@
+"""
+Offline benchmark suite for each agent's hot path, driven by the synthetic data provider.
+
+Times data fetching through the price cache, market indicators and screens, quant strategies and
+backtests, chunked intraday indicators and strategy statistics over the bar store, portfolio metrics,
+optimization, risk and rolling analytics, Google Trends batching and keyword/ticker lead-lag, and
+chart rendering. Writes a JSON report
+and, given a previous report as --baseline, exits non-zero when a case got slower than --tolerance.
+
+    python -m benchmarks.bench_agents --tickers 500 --period 2y --report bench.json
+    python -m benchmarks.bench_agents --tickers 500 --period 2y --baseline bench.json
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Dict, List
+
+import numpy as np
+import pandas as pd
+
+from src.agents.market_analyst import MarketDataAnalyst
+from src.agents.portfolio_manager_analyst import PortfolioManagerAnalyst
+from src.agents.quant_analyst import QuantAnalyst
+from src.agents.sentiment_analyst import SentimentAnalyst
+from src.analytics import panel, screener
+from src.analytics.backtest import backtest_grid
+from src.core.bar_store import BarStore
+from src.core.bulk_fetch import BulkFetchResult, fetch_many
+from src.core.price_cache import PriceCache
+from src.core.providers import SyntheticProvider, SyntheticTrendsClient, synthetic_tickers
+from src.core.rendering import ChartRenderer
+from src.core.trends import TokenBucket, TrendsScheduler
+from src.models.signal_store import SignalStore, threshold_signals
+from src.models.trading_signals import SignalType
+
+
+def measure(fn: Callable[[], Any], repeat: int, warmup: int = 1) -> Dict[str, float]:
+    # Untimed warm-up calls keep one-off costs (lazy imports, first-touch allocations) out of the numbers.
+    for _ in range(warmup):
+        fn()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return {"best": min(timings), "median": statistics.median(timings), "repeat": repeat}
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except OSError:
+        return ""
+
+
+def cases(args, scratch: str) -> Dict[str, Callable[[], Any]]:
+    """Benchmark name -> zero-argument callable. Setup work happens here, outside the timings."""
+    provider = SyntheticProvider(seed=args.seed)
+    tickers = synthetic_tickers(args.tickers)
+    frames = {ticker: provider.history(ticker, args.interval, period=args.period) for ticker in tickers}
+    fetched = BulkFetchResult(frames, {})
+    prices = fetched.panel("Close")
+
+    market = MarketDataAnalyst("")
+    quant = QuantAnalyst("")
+    portfolio = PortfolioManagerAnalyst("")
+    holdings = tickers[:args.portfolio_size]
+    portfolio.set_portfolio({ticker: 1 / len(holdings) for ticker in holdings})
+    portfolio.use_data(fetched)
+    portfolio.renderer = ChartRenderer("file", output_dir=os.path.join(scratch, "charts"), processes=1)
+
+    sentiment = SentimentAnalyst("")
+    keywords = [f"keyword {i}" for i in range(args.keywords)]
+    lead_lag = SentimentAnalyst("")
+    # Weekly interest over the same span as the prices.
+    weeks = max(len(prices) // 5, 20)
+    lead_lag.trends = TrendsScheduler(SyntheticTrendsClient(args.seed, periods=weeks),
+                                      cache_dir=os.path.join(scratch, "lead_lag_trends"), bucket=TokenBucket(1e9, 1))
+
+    def fetch_cold():
+        cache = PriceCache(tempfile.mkdtemp(dir=scratch), fetcher=provider.history)
+        fetch_many(tickers, period=args.period, interval=args.interval, cache=cache)
+
+    warm_cache = PriceCache(os.path.join(scratch, "warm"), fetcher=provider.history)
+    fetch_many(tickers, period=args.period, interval=args.interval, cache=warm_cache)
+
+    # Two months of five-minute bars for a few tickers, walked a chunk of days at a time.
+    bar_store = BarStore(os.path.join(scratch, "bars"))
+    intraday_tickers = tickers[:5]
+    for ticker in intraday_tickers:
+        bar_store.write(ticker, "5m", provider.history(ticker, "5m", period="60d"))
+    market.bar_store = quant.bar_store = bar_store
+
+    rsi = panel.rsi(prices.to_numpy(), 14)
+    table = screener.build_table(prices)
+
+    def signals():
+        # Screen every bar of the panel's RSI, as a live run would bar by bar.
+        store = SignalStore(max_rows=1_000_000)
+        for timestamp, row in zip(prices.index, rsi):
+            threshold_signals(store, tickers, row, 30, 70, SignalType.RSI_OVERSOLD, SignalType.RSI_OVERBOUGHT,
+                              timestamp)
+
+    def signals_bulk():
+        # One extend per ticker over the whole history, stamped with the price index (tz-aware).
+        store = SignalStore(max_rows=len(tickers) * len(prices))
+        for j, ticker in enumerate(tickers):
+            store.extend([ticker] * len(prices), SignalType.RSI_OVERSOLD, rsi[:, j], prices.index)
+
+    def trends():
+        # A fresh cache each run so every batch is requested and rescaled.
+        sentiment.trends = TrendsScheduler(provider.trends_client(), cache_dir=tempfile.mkdtemp(dir=scratch),
+                                           bucket=TokenBucket(1e9, 1))
+        sentiment.get_trending_keywords(keywords, visualize=False)
+
+    return {
+        "data.fetch_cold": fetch_cold,
+        "data.fetch_warm": lambda: fetch_many(tickers, period=args.period, interval=args.interval, cache=warm_cache),
+        "market.indicators": lambda: market.analyze_fetched(fetched),
+        "market.panel": lambda: market.analyze_panel(prices),
+        "market.screen_build": lambda: screener.build_table(prices),
+        "market.screen_query": lambda: screener.screen(table, "rsi < 50 and volatility > 0.2", "volatility", 50),
+        "market.intraday": lambda: [market.analyze_intraday(ticker, "5m", chunk_days=5) for ticker in intraday_tickers],
+        "quant.mean_reversion": lambda: quant.analyze_fetched("mean_reversion", fetched),
+        "quant.momentum": lambda: quant.analyze_fetched("momentum", fetched),
+        "quant.pairs_trading": lambda: quant.analyze_fetched("pairs_trading", fetched),
+        "quant.backtest_grid": lambda: backtest_grid(prices, "mean_reversion", [10, 20, 40], [1.0, 1.5, 2.0, 2.5]),
+        "quant.intraday": lambda: [quant.analyze_intraday("mean_reversion", ticker, "5m", chunk_days=5)
+                                   for ticker in intraday_tickers],
+        "signals.record": signals,
+        "signals.extend": signals_bulk,
+        "portfolio.metrics": portfolio.calculate_portfolio_metrics,
+        "portfolio.optimize": lambda: portfolio.optimize("max_sharpe"),
+        "portfolio.risk": lambda: portfolio.risk_report(paths=100_000, seed=0),
+        "portfolio.rolling": lambda: (portfolio.rolling_metrics(), portfolio.rolling_correlations(60, step=5)),
+        "sentiment.trends": trends,
+        "sentiment.lead_lag": lambda: lead_lag.lead_lag(keywords, tickers, max_lag=8, fetched=fetched),
+        "charts.portfolio": lambda: portfolio.renderer.render_many(portfolio.chart_jobs()),
+    }
+
+
+def compare(results: Dict[str, Dict[str, float]], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    regressions = []
+    for name, result in results.items():
+        previous = baseline.get("results", {}).get(name)
+        if previous and result["median"] > previous["median"] * (1 + tolerance):
+            regressions.append(f"{name}: {previous['median']:.4f}s -> {result['median']:.4f}s "
+                               f"({result['median'] / previous['median']:.2f}x)")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--tickers", type=int, default=200, help="Synthetic tickers in the universe")
+    parser.add_argument("--period", default="2y", help="History length per ticker (yfinance period)")
+    parser.add_argument("--interval", default="1d", help="Bar interval, e.g. 1d or 5m")
+    parser.add_argument("--portfolio-size", type=int, default=20, help="Tickers held by the benchmarked portfolio")
+    parser.add_argument("--keywords", type=int, default=50, help="Google Trends keywords")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--warmup", type=int, default=1, help="Untimed runs before each case")
+    parser.add_argument("--only", default=None, help="Comma-separated name prefixes to run, e.g. market,quant.pairs")
+    parser.add_argument("--report", default=None, help="Write the JSON report here")
+    parser.add_argument("--baseline", default=None, help="Previous JSON report to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed slowdown versus the baseline")
+    args = parser.parse_args()
+
+    prefixes = [prefix.strip() for prefix in args.only.split(",")] if args.only else None
+    results: Dict[str, Dict[str, float]] = {}
+    with tempfile.TemporaryDirectory() as scratch:
+        for name, fn in cases(args, scratch).items():
+            if prefixes and not any(name.startswith(prefix) for prefix in prefixes):
+                continue
+            results[name] = measure(fn, args.repeat, args.warmup)
+            print(f"{name:<24} best {results[name]['best']:>8.4f}s  median {results[name]['median']:>8.4f}s")
+
+    report = {
+        "meta": {
+            "commit": git_commit(),
+            "timestamp": pd.Timestamp.now(tz="UTC").isoformat(),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "pandas": pd.__version__,
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "params": {key: value for key, value in vars(args).items() if key not in ("report", "baseline")},
+        },
+        "results": results,
+    }
+    if args.report:
+        with open(args.report, "w") as file:
+            json.dump(report, file, indent=2)
+        print(f"Report written to {args.report}")
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            regressions = compare(results, json.load(file), args.tolerance)
+        if regressions:
+            print("\n".join(["", "REGRESSIONS:"] + regressions))
+            sys.exit(1)
+        print(f"No case is more than {args.tolerance:.0%} slower than {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
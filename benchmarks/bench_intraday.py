@@ -0,0 +1,109 @@
+"""
+Intraday bars from the memory-mapped bar store: chunked indicators and strategy statistics against
+loading each ticker's whole history into pandas.
+
+Writes a year of synthetic one-minute bars per ticker to a temporary bar store, then runs each mode
+in a fresh interpreter and reports its time and peak traced memory. Exits non-zero if the chunked results
+differ from the whole-history ones.
+
+    python -m benchmarks.bench_intraday --tickers 5 --days 252 --chunk-days 20
+"""
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from src.core.bar_store import BarStore
+from src.core.providers import MARKET_TZ, SESSION_MINUTES
+
+CHILD = """
+import json, sys, time, tracemalloc
+import numpy as np, pandas as pd
+from src.agents.market_analyst import MarketDataAnalyst
+from src.agents.quant_analyst import QuantAnalyst
+from src.analytics.backtest import performance, positions, strategy_signal
+from src.analytics import panel
+from src.core.bar_store import BarStore
+from src.core.providers import bars_per_year
+
+root, tickers, mode, chunk_days = sys.argv[1], int(sys.argv[2]), sys.argv[3], int(sys.argv[4])
+store = BarStore(root)
+market, quant = MarketDataAnalyst(""), QuantAnalyst("")
+market.bar_store = quant.bar_store = store
+
+def analyze():
+    results = {}
+    for j in range(tickers):
+        ticker = f"T{j:03d}"
+        if mode == "chunked":
+            latest = market.analyze_intraday(ticker, "1m", chunk_days=chunk_days).latest
+            stats = quant.analyze_intraday("mean_reversion", ticker, "1m", chunk_days=chunk_days)
+        else:
+            frame = pd.concat(list(store.iter_chunks(ticker, "1m", 10 ** 6)))
+            latest = market.indicator_engine.compute(frame, annualization=bars_per_year("1m")).latest
+            values = frame["Close"].to_numpy(dtype=float)[:, None]
+            returns = np.nan_to_num(values / panel.shift(values) - 1)
+            position = positions("mean_reversion", strategy_signal("mean_reversion", values, 20), np.array([2.0]))
+            stats = {k: float(v.ravel()[0]) for k, v in performance(position, returns, 0.0, bars_per_year("1m")).items()}
+        results[ticker] = {**latest, "sharpe": stats["sharpe"], "total_return": stats["total_return"]}
+    return results
+
+start = time.perf_counter()
+results = analyze()
+seconds = time.perf_counter() - start
+# Tracing slows allocation-heavy code down, so peak memory comes from a second, traced run. NumPy
+# reports its buffers to tracemalloc, so the peak covers the arrays.
+tracemalloc.start()
+analyze()
+print(json.dumps({"seconds": seconds, "peak_mb": tracemalloc.get_traced_memory()[1] / 1024 ** 2, "results": results}))
+"""
+
+
+def write_bars(store: BarStore, tickers: int, days: int, seed: int = 0) -> int:
+    rng = np.random.default_rng(seed)
+    sessions = pd.bdate_range(end="2024-12-31", periods=days)
+    offsets = pd.to_timedelta(np.arange(SESSION_MINUTES) + 9 * 60 + 30, unit="min")
+    index = pd.DatetimeIndex((sessions.to_numpy()[:, None] + offsets.to_numpy()[None, :]).ravel()).tz_localize(MARKET_TZ)
+    for j in range(tickers):
+        close = 100 * np.exp(np.cumsum(rng.normal(0, 0.0008, len(index))))
+        frame = pd.DataFrame({"Open": close, "High": close, "Low": close, "Close": close,
+                              "Volume": rng.integers(100, 10_000, len(index)).astype(float)}, index=index)
+        store.write(f"T{j:03d}", "1m", frame)
+    return len(index)
+
+
+def run(root: str, tickers: int, mode: str, chunk_days: int) -> dict:
+    output = subprocess.run([sys.executable, "-c", CHILD, root, str(tickers), mode, str(chunk_days)],
+                            capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--tickers", type=int, default=5)
+    parser.add_argument("--days", type=int, default=252)
+    parser.add_argument("--chunk-days", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="zenith-bars-") as root:
+        bars = write_bars(BarStore(root), args.tickers, args.days)
+        print(f"{args.tickers} tickers x {bars} one-minute bars ({args.days} days), chunks of {args.chunk_days} days")
+        full = run(root, args.tickers, "full", args.chunk_days)
+        chunked = run(root, args.tickers, "chunked", args.chunk_days)
+
+    error = max(abs(chunked["results"][ticker][name] - value) / max(abs(value), 1.0)
+                for ticker, values in full["results"].items() for name, value in values.items())
+    for mode, result in (("whole history", full), ("chunked", chunked)):
+        print(f"{mode:<14} {result['seconds']:>7.2f}s   peak {result['peak_mb']:>7.1f} MB")
+    print(f"max relative difference {error:.2e}")
+    if error > 1e-8:
+        print("FAIL: chunked results differ from the whole-history ones")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
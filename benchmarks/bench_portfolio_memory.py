@@ -0,0 +1,92 @@
+"""
+Peak memory and time of portfolio statistics: the in-memory pandas path against streamed date blocks.
+
+Each mode runs in a fresh interpreter over a synthetic (dates x tickers) random-walk universe where a
+few tickers list late, computing portfolio metrics and the correlation matrix. Exits non-zero if the
+streamed mode's peak RSS grows past --budget-mb, or its statistics differ from pandas'.
+
+    python -m benchmarks.bench_portfolio_memory --tickers 3000 --days 5040 --memory-limit 400
+"""
+import argparse
+import json
+import subprocess
+import sys
+
+CHILD = """
+import json, resource, sys, time
+import numpy as np, pandas as pd
+from src.agents.portfolio_manager_analyst import PortfolioManagerAnalyst
+from src.core.bulk_fetch import BulkFetchResult
+
+tickers, days, limit, dtype = int(sys.argv[1]), int(sys.argv[2]), float(sys.argv[3]), sys.argv[4]
+rng = np.random.default_rng(7)
+index = pd.bdate_range("2000-01-03", periods=days)
+series = {}
+for j in range(tickers):
+    prices = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, days)))
+    if j % 20 == 0:
+        prices[:rng.integers(1, 60)] = np.nan  # listed a little later than the rest
+    series[f"T{j:05d}"] = pd.Series(prices, index=index)
+baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+start = time.perf_counter()
+manager = PortfolioManagerAnalyst("")
+manager.set_portfolio({ticker: 1 / tickers for ticker in series})
+manager.memory_limit_mb = limit or None
+manager.dtype = np.float32 if dtype == "float32" else np.float64
+manager.use_data(BulkFetchResult(series, {}), field=None)
+del series
+metrics = manager.calculate_portfolio_metrics()
+corr = manager.correlation_matrix()
+print(json.dumps({
+    "seconds": time.perf_counter() - start,
+    "peak_mb": (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - baseline) / 1024,
+    "volatility": float(metrics["portfolio_volatility"]),
+    "corr_sum": float(np.nansum(corr.to_numpy())),
+}))
+"""
+
+
+def run(tickers: int, days: int, limit: float, dtype: str) -> dict:
+    output = subprocess.run([sys.executable, "-c", CHILD, str(tickers), str(days), str(limit), dtype],
+                            capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--tickers", type=int, default=1500)
+    parser.add_argument("--days", type=int, default=2520)
+    parser.add_argument("--memory-limit", type=float, default=200, help="MB given to the streamed modes")
+    parser.add_argument("--budget-mb", type=float, default=None,
+                        help="Allowed peak growth for the streamed modes (default: 1.5x --memory-limit)")
+    args = parser.parse_args()
+    budget = args.budget_mb or 1.5 * args.memory_limit
+
+    results = {
+        "pandas float64": run(args.tickers, args.days, 0, "float64"),
+        "streamed float64": run(args.tickers, args.days, args.memory_limit, "float64"),
+        "streamed float32": run(args.tickers, args.days, args.memory_limit, "float32"),
+    }
+    print(f"{args.tickers} tickers x {args.days} days, memory limit {args.memory_limit:.0f} MB")
+    for mode, result in results.items():
+        print(f"{mode:<18} peak +{result['peak_mb']:>8.0f} MB   {result['seconds']:>7.2f}s   "
+              f"volatility {result['volatility']:.6g}")
+
+    failures = []
+    reference = results["pandas float64"]
+    for mode in ("streamed float64", "streamed float32"):
+        result = results[mode]
+        tolerance = 1e-9 if mode.endswith("float64") else 1e-4
+        if abs(result["volatility"] - reference["volatility"]) > tolerance * abs(reference["volatility"]):
+            failures.append(f"{mode} volatility {result['volatility']} != {reference['volatility']}")
+        if result["peak_mb"] > budget:
+            failures.append(f"{mode} peaked at +{result['peak_mb']:.0f} MB, budget {budget:.0f} MB")
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Cost of the span instrumentation with profiling off and on.
+
+Times a bare span enter/exit, then the market agent's indicators over a synthetic universe with the
+metrics registry disabled and enabled. Exits non-zero if disabled spans cost more than --budget-ns.
+
+    python -m benchmarks.bench_profiling --tickers 500
+"""
+import argparse
+import sys
+import time
+
+from src.agents.market_analyst import MarketDataAnalyst
+from src.core.bulk_fetch import BulkFetchResult
+from src.core.profiling import METRICS, span
+from src.core.providers import SyntheticProvider, synthetic_tickers
+
+
+def per_call_ns(calls: int, ticker: str = "SYN00000") -> float:
+    start = time.perf_counter_ns()
+    for _ in range(calls):
+        with span("compute", ticker):
+            pass
+    return (time.perf_counter_ns() - start) / calls
+
+
+def best_of(fn, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--tickers", type=int, default=200)
+    parser.add_argument("--calls", type=int, default=200_000, help="Span enter/exits for the per-call timing")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--budget-ns", type=float, default=2000, help="Allowed cost of a disabled span")
+    args = parser.parse_args()
+
+    provider = SyntheticProvider()
+    frames = {ticker: provider.history(ticker, "1d", period="2y") for ticker in synthetic_tickers(args.tickers)}
+    fetched = BulkFetchResult(frames, {})
+    market = MarketDataAnalyst("")
+
+    results = {}
+    for enabled in (False, True):
+        METRICS.enabled = enabled
+        METRICS.reset()
+        label = "enabled" if enabled else "disabled"
+        results[label] = per_call_ns(args.calls)
+        agent_seconds = best_of(lambda: market.analyze_fetched(fetched), args.repeat)
+        print(f"span {label:<9} {results[label]:>8.0f} ns/call   "
+              f"market.indicators ({args.tickers} tickers) {agent_seconds:.4f}s")
+    METRICS.enabled = False
+
+    if results["disabled"] > args.budget_ns:
+        print(f"FAIL: disabled spans cost {results['disabled']:.0f} ns, budget {args.budget_ns:.0f} ns")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Rolling correlation matrices: incremental rank updates against recomputing every window.
+
+Runs over synthetic (days x assets) returns, e.g. 500 assets over ten years of trading days. The
+recomputation is timed on the first --sample windows and extrapolated, and its matrices are checked
+against the incremental ones; rolling portfolio metrics are checked against pandas' rolling, also
+with gaps (a leading NaN and missing days) in the returns.
+
+    python -m benchmarks.bench_rolling --assets 500 --days 2520 --window 60
+"""
+import argparse
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.analytics.rolling import rolling_correlation, rolling_metrics
+
+
+def metrics_error(result, portfolio: pd.Series, benchmark: pd.Series) -> float:
+    """Largest difference from pandas' rolling for every window and metric; inf if NaNs fall elsewhere."""
+    error = 0.0
+    for window in result.windows:
+        rolling = portfolio.rolling(window)
+        mean, std = rolling.mean(), rolling.std()
+        reference = pd.DataFrame({
+            "return": mean * 252,
+            "volatility": std * np.sqrt(252),
+            "sharpe": mean / std * np.sqrt(252),
+            "beta": rolling.cov(benchmark) / benchmark.rolling(window).var(),
+        })
+        ours = result.frame(window)[reference.columns]
+        if not (ours.isna() == reference.isna()).all().all():
+            return float("inf")
+        # Relative to the magnitude, since annualized returns and Sharpe ratios differ in scale.
+        error = max(error, float(np.nanmax(np.abs(ours - reference) / np.maximum(np.abs(reference), 1.0))))
+    return error
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--assets", type=int, default=500)
+    parser.add_argument("--days", type=int, default=2520)
+    parser.add_argument("--window", type=int, default=60)
+    parser.add_argument("--step", type=int, default=1)
+    parser.add_argument("--sample", type=int, default=100, help="Windows recomputed from scratch for comparison")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    market = rng.normal(0, 0.01, (args.days, 1))
+    returns = market * rng.uniform(0.5, 1.5, args.assets) + rng.normal(0, 0.015, (args.days, args.assets))
+
+    start = time.perf_counter()
+    ends, matrices = rolling_correlation(returns, args.window, args.step)
+    incremental = time.perf_counter() - start
+
+    sample = ends[:args.sample]
+    start = time.perf_counter()
+    error = 0.0
+    for k, end in enumerate(sample):
+        reference = np.corrcoef(returns[end - args.window + 1:end + 1].T)
+        error = max(error, float(np.abs(reference - matrices[k]).max()))
+    recompute = (time.perf_counter() - start) / len(sample) * len(ends)
+
+    index = pd.bdate_range(end="2024-12-31", periods=args.days)
+    portfolio = pd.Series(returns.mean(axis=1), index=index)
+    benchmark = pd.Series(market[:, 0], index=index)
+    start = time.perf_counter()
+    result = rolling_metrics(portfolio, (60, 120, 252), benchmark)
+    metrics = time.perf_counter() - start
+    beta_error = metrics_error(result, portfolio, benchmark)
+
+    # A leading NaN and scattered gaps must only blank the windows that contain them.
+    gappy = portfolio.copy()
+    gappy.iloc[[0, 300, 301, 1500]] = np.nan
+    gappy_benchmark = benchmark.drop(benchmark.index[[900, 2000]])
+    gap_error = metrics_error(rolling_metrics(gappy, (60, 120, 252), gappy_benchmark), gappy,
+                              gappy_benchmark.reindex(index))
+
+    size = matrices.nbytes / 1024 ** 2
+    print(f"{args.assets} assets x {args.days} days, {len(ends)} windows of {args.window} days ({size:.0f} MB float32)")
+    print(f"incremental   {incremental:>8.2f}s")
+    print(f"recompute     {recompute:>8.2f}s (extrapolated from {len(sample)} windows)   max diff {error:.2e}")
+    print(f"metrics       {metrics:>8.4f}s for 3 windows   max diff vs pandas {beta_error:.2e}, with gaps {gap_error:.2e}")
+    if error > 1e-4 or beta_error > 1e-9 or gap_error > 1e-9:
+        print("FAIL: rolling results differ from the reference")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
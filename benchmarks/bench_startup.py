@@ -0,0 +1,82 @@
+"""
+Cold-start budget check for the CLI.
+
+Times `python -m src.terminal.cli --help` in fresh interpreters and uses `-X importtime` to make sure
+each entry point only loads the heavy dependencies it needs. Exits non-zero when a budget is blown or a
+forbidden module is imported, so it can gate releases or cron deployments.
+
+    python -m benchmarks.bench_startup --budget 0.5
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+from typing import List, Set
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+HEAVY = {"pandas", "numpy", "yfinance", "matplotlib", "seaborn", "pytrends", "scipy"}
+
+# Entry point -> heavy modules it must not import.
+FORBIDDEN = {
+    "src.terminal.cli": HEAVY,
+    "src.terminal.client": HEAVY,  # thin client for --server
+    "src.core.output": HEAVY,  # result writers, also used by the thin client
+    "src.agents.quant_analyst": {"yfinance", "matplotlib", "seaborn", "pytrends", "scipy"},
+    "src.agents.market_analyst": {"yfinance", "matplotlib", "seaborn", "pytrends", "scipy"},
+    "src.agents.portfolio_manager_analyst": {"yfinance", "matplotlib", "seaborn", "pytrends", "scipy"},
+    "src.agents.sentiment_analyst": {"yfinance", "matplotlib", "seaborn", "pytrends", "scipy"},
+    "src.agents.orchestrator": {"yfinance", "matplotlib", "seaborn", "pytrends", "scipy"},
+}
+
+
+def imported_modules(module: str) -> Set[str]:
+    """Top-level package names imported when `module` is imported in a fresh interpreter."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    names = set()
+    for line in result.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            names.add(line.rsplit("|", 1)[1].strip().split(".")[0])
+    return names
+
+
+def cold_start(repeat: int) -> List[float]:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-m", "src.terminal.cli", "--help"], cwd=ROOT,
+                       capture_output=True, check=True)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--budget", type=float, default=0.5, help="Maximum seconds for `cli --help`")
+    parser.add_argument("--repeat", type=int, default=5, help="Cold starts to time (the best one counts)")
+    args = parser.parse_args()
+
+    failures = []
+    for module, forbidden in FORBIDDEN.items():
+        leaked = sorted(imported_modules(module) & forbidden)
+        status = "ok" if not leaked else f"imports {', '.join(leaked)}"
+        print(f"{module:<40} {status}")
+        if leaked:
+            failures.append(f"{module} imports {leaked}")
+
+    best = min(cold_start(args.repeat))
+    print(f"{'cli --help cold start':<40} {best:.3f}s (budget {args.budget:.3f}s)")
+    if best > args.budget:
+        failures.append(f"cli --help took {best:.3f}s, over the {args.budget:.3f}s budget")
+
+    if failures:
+        print("\n".join(["", "FAILED:"] + failures))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
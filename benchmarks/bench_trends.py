@@ -0,0 +1,101 @@
+"""
+Google Trends batching, rescaling, caching and pacing against a local stub of the endpoint.
+
+The stub (SyntheticTrendsClient) answers like Google Trends, with integer 0-100 interest relative to
+the busiest term of each request, so the stitched result can be checked against the known underlying
+popularity. Runs offline and exits non-zero if the rescaling error or the request/caching accounting
+is off.
+
+    python -m benchmarks.bench_trends --keywords 200
+"""
+import argparse
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+from src.core.providers import SyntheticTrendsClient
+from src.core.trends import MAX_TERMS, TokenBucket, TrendsScheduler
+
+
+class FakeClock:
+    """Virtual time so pacing is measured without actually sleeping."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float):
+        self.now += seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--keywords", type=int, default=200)
+    parser.add_argument("--rate", type=float, default=0.2, help="Requests per second allowed by the bucket")
+    parser.add_argument("--tolerance", type=float, default=2.0, help="Allowed error in interest points")
+    args = parser.parse_args()
+
+    keywords = [f"keyword {i}" for i in range(args.keywords)]
+    client = SyntheticTrendsClient()
+    # Follow the README's advice and anchor on a popular term, so its values aren't rounded to a few points.
+    anchor = max((f"anchor {i}" for i in range(20)), key=lambda term: client.popularity(term).mean())
+    clock = FakeClock()
+    failures = []
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        scheduler = TrendsScheduler(client, cache_dir=cache_dir,
+                                    bucket=TokenBucket(args.rate, 3, clock=clock, sleep=clock.sleep))
+        start = time.perf_counter()
+        data = scheduler.interest_over_time([anchor] + keywords, anchor=anchor)
+        cold = time.perf_counter() - start
+        cold_stats = scheduler.stats()
+
+        start = time.perf_counter()
+        scheduler.interest_over_time([anchor] + keywords, anchor=anchor)
+        warm = time.perf_counter() - start
+        warm_stats = scheduler.stats()
+        paced = clock.now
+        related = scheduler.related_queries(keywords[:12])
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        # Every third response is a 429; retries must recover without losing or duplicating keywords.
+        flaky = TrendsScheduler(SyntheticTrendsClient(fail_every=3), cache_dir=cache_dir, backoff=0,
+                                bucket=TokenBucket(1e9, 1))
+        retried = flaky.interest_over_time([anchor] + keywords[:40], anchor=anchor)
+
+    truth = pd.DataFrame({keyword: client.popularity(keyword) for keyword in data.columns}, index=client.index)
+    truth *= 100 / truth.to_numpy().max()
+    error = float((data - truth).abs().to_numpy().max())
+    batches = -(-len(keywords) // (MAX_TERMS - 1))
+
+    print(f"{len(keywords)} keywords in {batches} batches, max abs error vs. truth {error:.2f} points")
+    print(f"cold: {cold:.3f}s, {cold_stats['requests']} requests, {paced:.0f}s of simulated pacing")
+    print(f"warm: {warm:.3f}s, {warm_stats['hits'] - cold_stats['hits']} cache hits, "
+          f"{warm_stats['requests'] - cold_stats['requests']} requests")
+
+    # Each batch is rounded to whole points on its own scale, so some error after stitching is inherent.
+    if error > args.tolerance:
+        failures.append(f"rescaled interest is off by {error:.2f} points")
+    if cold_stats["requests"] != batches:
+        failures.append(f"expected {batches} requests, made {cold_stats['requests']}")
+    if warm_stats["requests"] != cold_stats["requests"]:
+        failures.append("warm run hit the endpoint instead of the cache")
+    if list(retried.columns) != [anchor] + keywords[:40] or flaky.requests <= flaky.misses:
+        failures.append("throttled requests were not retried")
+    if sorted(related) != sorted(keywords[:12]):
+        failures.append("related queries missing keywords")
+    expected_wait = (batches - 3) / args.rate
+    if abs(paced - expected_wait) > 1e-6:
+        failures.append(f"token bucket waited {paced:.1f}s, expected {expected_wait:.1f}s")
+
+    if failures:
+        print("\n".join(["", "FAILED:"] + failures))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,19 @@
+import os
 import pandas as pd
 import numpy as np
-import yfinance as yf
-from typing import Dict
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+from src.analytics import panel, screener
+from src.analytics.indicators import IndicatorEngine, IndicatorResult
+from src.analytics.streaming import (
+    SignalRule, StreamMonitor, StreamingRSI, StreamingSMA, StreamingVolatility, bar_close,
+)
 from src.base.base_agent import BaseAgent  # Absolute import path
+from src.core.bar_store import DEFAULT_CHUNK_DAYS, get_bar_store, ingest
+from src.core.bulk_fetch import BulkFetchResult, fetch_many, iter_fetch
+from src.core.price_cache import get_price_cache
+from src.core.providers import bars_per_year
+from src.core.settings import DEFAULT_WORKERS
+from src.core.timeframes import Timeframe, get_timeframes
 from src.models.trading_signals import SignalType  # Absolute import path
 from src.models.data_models import Signal  # Absolute import path 
 
@@ -15,64 +26,285 @@ class MarketDataAnalyst(BaseAgent):
         self.moving_averages: Dict[str, Dict[str, float]] = {}
         self.rsi_values: Dict[str, float] = {}
         self.volatility: Dict[str, float] = {}
+        self.price_cache = get_price_cache()
+        self.timeframes = get_timeframes()
+        self.bar_store = get_bar_store()
+        self.screen_dir = os.environ.get("ZENITH_SCREEN_DIR", screener.DEFAULT_SCREEN_DIR)
+        self.screen_thresholds = {**screener.DEFAULT_THRESHOLDS, **self.config.get("screen", {})}
+        self.indicator_engine = IndicatorEngine(
+            short_window=self.analysis_config.get("moving_average_short_window", 20),
+            long_window=self.analysis_config.get("moving_average_long_window", 50),
+            rsi_period=self.analysis_config.get("rsi_period", 14),
+            volatility_period=self.analysis_config.get("volatility_period", 20),
+        )
 
-    def analyze_moving_averages(self, ticker: str, short_window: int = 20, long_window: int = 50) -> Dict[str, float]:
-        """Calculate and return moving averages for a ticker."""
-        data = self._fetch_ticker_data(ticker)
+    def analyze_indicators(self, ticker: str, indicators: Optional[List[str]] = None,
+                           data: Optional[pd.DataFrame] = None, **params) -> IndicatorResult:
+        """
+        Fetch a ticker once and compute the requested indicators (all by default) in a single pass.
+        """
+        if data is None:
+            data = self._fetch_ticker_data(ticker)
         if data.empty:
             raise ValueError(f"No data available for ticker: {ticker}")
 
-        short_ma = data["Close"].rolling(window=short_window).mean().iloc[-1]
-        long_ma = data["Close"].rolling(window=long_window).mean().iloc[-1]
+        with self.span("compute", ticker):
+            result = self.indicator_engine.compute(data, indicators, ticker=ticker, **params)
 
-        self.moving_averages[ticker] = {"short": short_ma, "long": long_ma}
+        if "ma_short" in result.latest:
+            self.moving_averages[ticker] = result.moving_averages
+        if "rsi" in result.latest:
+            self.rsi_values[ticker] = result.rsi
+        if "volatility" in result.latest:
+            self.volatility[ticker] = result.volatility
 
-        return {"short": short_ma, "long": long_ma}
+        return result
 
-    def analyze_rsi(self, ticker: str, period: int = 14) -> float:
-        """Calculate and return the RSI for a ticker."""
-        data = self._fetch_ticker_data(ticker)
-        if data.empty:
-            raise ValueError(f"No data available for ticker: {ticker}")
+    def analyze_universe(self, tickers: List[str], period: str = "1y", interval: str = "1d",
+                         max_workers: int = DEFAULT_WORKERS) -> Tuple[Dict[str, IndicatorResult], Dict[str, str]]:
+        """
+        Download every ticker concurrently, then compute indicators for each one that was fetched.
+        Returns the results keyed by ticker and the error message of every ticker that failed.
+        """
+        with self.stage("fetch"):
+            fetched = fetch_many(tickers, period=period, interval=interval, max_workers=max_workers,
+                                 cache=self.price_cache)
+        return self.analyze_fetched(fetched, interval), fetched.failures
 
-        delta = data["Close"].diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
-        rs = gain / loss
-        rsi = 100 - (100 / (1 + rs))
-        rsi_value = rsi.iloc[-1]
+    def iter_universe(self, tickers: List[str], period: str = "1y", interval: str = "1d",
+                      max_workers: int = DEFAULT_WORKERS) -> Iterator[Tuple[str, Optional[IndicatorResult], Optional[str]]]:
+        """
+        Streaming `analyze_universe`: yields (ticker, result, None) or (ticker, None, error) as each
+        ticker finishes, without holding the universe's prices in memory.
+        """
+        with self.stage("universe"):
+            for ticker, data, error in iter_fetch(tickers, period=period, interval=interval,
+                                                  max_workers=max_workers, cache=self.price_cache):
+                if error is not None:
+                    yield ticker, None, error
+                    continue
+                try:
+                    result = self.analyze_indicators(ticker, data=data, annualization=bars_per_year(interval))
+                except ValueError as e:
+                    yield ticker, None, str(e)
+                    continue
+                yield ticker, result, None
 
-        self.rsi_values[ticker] = rsi_value
+    def analyze_timeframes(self, tickers: List[str], timeframes: List[Timeframe],
+                           max_workers: int = DEFAULT_WORKERS) -> Tuple[Dict[str, Dict[str, IndicatorResult]], Dict[str, str]]:
+        """
+        Compute indicators for every ticker in every (period, interval) timeframe. Each ticker is
+        downloaded once per base interval and the other timeframes are resampled locally, so e.g.
+        1mo:1d, 1y:1wk and 5y:1mo cost a single daily download. Results are keyed "period/interval".
+        """
+        self.timeframes.max_workers = max_workers
+        with self.stage("fetch"):
+            fetched = self.timeframes.fetch_many(tickers, timeframes)
+        results: Dict[str, Dict[str, IndicatorResult]] = {}
+        failures: Dict[str, str] = {}
+        for (period, interval), frames in fetched.items():
+            results[f"{period}/{interval}"] = self.analyze_fetched(frames, interval)
+            failures.update(frames.failures)
+        return results, failures
 
-        return rsi_value
+    def analyze_fetched(self, fetched: BulkFetchResult, interval: str = "1d") -> Dict[str, IndicatorResult]:
+        """
+        Compute indicators for every ticker of an existing fetch, e.g. one shared with other agents,
+        annualizing volatility for its bar `interval`.
+        """
+        annualization = bars_per_year(interval)
+        with self.stage("indicators"):
+            return {
+                ticker: self.analyze_indicators(ticker, data=data, annualization=annualization)
+                for ticker, data in fetched.frames.items()
+            }
 
-    def analyze_volatility(self, ticker: str, period: int = 20) -> float:
-        """Calculate and return the volatility for a ticker."""
-        data = self._fetch_ticker_data(ticker)
-        if data.empty:
-            raise ValueError(f"No data available for ticker: {ticker}")
+    def analyze_panel(self, prices: pd.DataFrame, indicators: Optional[List[str]] = None,
+                      rsi_method: str = "sma") -> pd.DataFrame:
+        """
+        Compute indicators for every column of a dates x tickers Close panel at once and return each
+        ticker's latest values as a tickers x indicators frame.
+        """
+        params = self.indicator_engine.params
+        with self.span("compute"):
+            computed = panel.compute_panel(
+                prices,
+                indicators or ["ma_short", "ma_long", "rsi", "volatility"],
+                short_window=params["short_window"],
+                long_window=params["long_window"],
+                rsi_period=params["rsi_period"],
+                rsi_method=rsi_method,
+                volatility_period=params["volatility_period"],
+                annualization=params["annualization"],
+            )
+            return panel.latest(computed, prices)
+
+    def indicator_table(self, tickers: List[str], period: str = "1y", interval: str = "1d",
+                        as_of: Optional[str] = None, refresh: bool = False,
+                        max_workers: int = DEFAULT_WORKERS) -> pd.DataFrame:
+        """
+        The screener's indicator table for a universe (see screener.build_table), as of the latest bar
+        or the last bar on or before `as_of`. Tables are saved per universe, timeframe, parameters and
+        date: today's is reused while younger than the price cache's TTL, past dates' for good.
+        Tickers that couldn't be fetched are kept as rows with no values and an "error".
+        """
+        params = {key: value for key, value in self.indicator_engine.params.items() if key in (
+            "short_window", "long_window", "rsi_period", "volatility_period")}
+        params["annualization"] = bars_per_year(interval)
+        date = pd.Timestamp(as_of).date().isoformat() if as_of else pd.Timestamp.now(tz="UTC").date().isoformat()
+        path = screener.table_path(self.screen_dir, tickers, period, interval,
+                                   {**params, **self.screen_thresholds}, date)
+        if not refresh:
+            table = screener.load_table(path, max_age=None if as_of else self.price_cache.ttl)
+            if table is not None:
+                return table
+
+        self.timeframes.max_workers = max_workers
+        with self.stage("fetch"):
+            fetched = self.timeframes.fetch_many(tickers, [(period, interval)])[period, interval]
+        closes = pd.DataFrame({ticker: frame["Close"] for ticker, frame in fetched.frames.items()})
+        if as_of:
+            closes = closes.loc[:as_of]
+        closes = closes.reindex(columns=list(dict.fromkeys(ticker.strip().upper() for ticker in tickers)))
+        with self.span("compute", step="screen"):
+            table = screener.build_table(closes, params, self.screen_thresholds)
+        table["error"] = [fetched.failures.get(ticker) for ticker in table.index]
+        screener.save_table(table, path)
+        return table
+
+    def screen(self, tickers: List[str], where: Optional[str] = None, rank_by: Optional[str] = None,
+               top: Optional[int] = None, ascending: bool = False, **table_options) -> pd.DataFrame:
+        """
+        Tickers whose indicators match `where`, optionally ranked by a column and cut to the top k
+        (see screener.screen). `table_options` go to `indicator_table`.
+        """
+        table = self.indicator_table(tickers, **table_options)
+        with self.span("compute", step="filter"):
+            return screener.screen(table, where, rank_by, top, ascending)
 
-        returns = np.log(data["Close"] / data["Close"].shift(1))
-        volatility = returns.rolling(window=period).std() * np.sqrt(252)  # Annualized volatility
-        volatility_value = volatility.iloc[-1]
+    def ingest_intraday(self, tickers: List[str], period: str = "5d", interval: str = "1m",
+                        max_workers: int = DEFAULT_WORKERS) -> Tuple[Dict[str, int], Dict[str, str]]:
+        """
+        Download intraday bars for every ticker into the bar store. Returns the number of trading
+        days written per ticker and the error message of every ticker that failed.
+        """
+        written: Dict[str, int] = {}
+        failures: Dict[str, str] = {}
+        with self.stage("fetch"):
+            for ticker, days, error in ingest(self.bar_store, tickers, period, interval, max_workers,
+                                              cache=self.price_cache):
+                if error is not None:
+                    failures[ticker] = error
+                else:
+                    written[ticker] = days
+        return written, failures
 
-        self.volatility[ticker] = volatility_value
+    def iter_intraday(self, ticker: str, interval: str = "1m", start: Optional[str] = None,
+                      end: Optional[str] = None, indicators: Optional[List[str]] = None,
+                      chunk_days: int = DEFAULT_CHUNK_DAYS) -> Iterator[IndicatorResult]:
+        """
+        Indicators over a ticker's stored intraday bars between `start` and `end` (YYYY-MM-DD), one
+        result per chunk of `chunk_days` trading days, with windows carried across chunk boundaries
+        and volatility annualized for the interval. Only one chunk of bars is in memory at a time.
+        """
+        chunks = self.bar_store.iter_chunks(ticker, interval, chunk_days, start, end)
+        results = self.indicator_engine.compute_chunks(chunks, indicators, ticker=ticker,
+                                                       annualization=bars_per_year(interval))
+        while True:
+            with self.span("compute", ticker, step="intraday"):
+                result = next(results, None)
+            if result is None:
+                return
+            yield result
 
-        return volatility_value
+    def analyze_intraday(self, ticker: str, interval: str = "1m", start: Optional[str] = None,
+                         end: Optional[str] = None, indicators: Optional[List[str]] = None,
+                         chunk_days: int = DEFAULT_CHUNK_DAYS) -> IndicatorResult:
+        """
+        `iter_intraday` reduced to the last chunk's result, whose `latest` values are the indicators
+        at the last stored bar.
+        """
+        result = None
+        for result in self.iter_intraday(ticker, interval, start, end, indicators, chunk_days):
+            pass
+        if result is None or result.series.empty:
+            raise ValueError(f"No {interval} bars stored for {ticker}")
+        if "ma_short" in result.latest:
+            self.moving_averages[ticker] = result.moving_averages
+        if "rsi" in result.latest:
+            self.rsi_values[ticker] = result.rsi
+        if "volatility" in result.latest:
+            self.volatility[ticker] = result.volatility
+        return result
+
+    def stream(self, ticker: str, bars: Iterable[Any], history: Optional[pd.DataFrame] = None,
+               rsi_method: str = "sma", high_volatility: float = 0.4) -> Iterator[Dict[str, Any]]:
+        """
+        Seed MA, RSI and volatility state from history once, then update it in O(1) per incoming bar.
+        Yields the latest values for each bar along with any RSI, MA crossover or volatility signals, which
+        are also recorded in `self.signals`.
+        """
+        if history is None:
+            history = self._fetch_ticker_data(ticker)
+
+        params = self.indicator_engine.params
+        monitor = StreamMonitor(
+            {
+                "ma_short": StreamingSMA(params["short_window"]),
+                "ma_long": StreamingSMA(params["long_window"]),
+                "rsi": StreamingRSI(params["rsi_period"], rsi_method),
+                "volatility": StreamingVolatility(params["volatility_period"], params["annualization"]),
+            },
+            [
+                SignalRule(lambda v: v["ma_short"] - v["ma_long"], 0, 0,
+                           SignalType.MA_CROSSOVER_BEARISH, SignalType.MA_CROSSOVER_BULLISH),
+                SignalRule(lambda v: v["rsi"], 30, 70, SignalType.RSI_OVERSOLD, SignalType.RSI_OVERBOUGHT),
+                SignalRule(lambda v: v["volatility"], -np.inf, high_volatility, None, SignalType.HIGH_VOLATILITY),
+            ],
+        )
+        monitor.seed(history["Close"].to_numpy(dtype=float))
+
+        for bar in bars:
+            timestamp, close = bar_close(bar)
+            with self.span("compute", ticker):
+                values, _ = monitor.update(close)
+            self.moving_averages[ticker] = {"short": values["ma_short"], "long": values["ma_long"]}
+            self.rsi_values[ticker] = values["rsi"]
+            self.volatility[ticker] = values["volatility"]
+            yield {
+                "ticker": ticker,
+                "timestamp": timestamp,
+                "close": close,
+                **values,
+                "signals": self._record_triggered(ticker, monitor, timestamp),
+            }
+
+    def analyze_moving_averages(self, ticker: str, short_window: int = 20, long_window: int = 50) -> Dict[str, float]:
+        """Calculate and return moving averages for a ticker."""
+        result = self.analyze_indicators(ticker, ["moving_averages"], short_window=short_window, long_window=long_window)
+        return result.moving_averages
+
+    def analyze_rsi(self, ticker: str, period: int = 14) -> float:
+        """Calculate and return the RSI for a ticker."""
+        return self.analyze_indicators(ticker, ["rsi"], rsi_period=period).rsi
+
+    def analyze_volatility(self, ticker: str, period: int = 20) -> float:
+        """Calculate and return the volatility for a ticker."""
+        return self.analyze_indicators(ticker, ["volatility"], volatility_period=period).volatility
 
     def _fetch_ticker_data(self, ticker: str, period: str = "1y", interval: str = "1d") -> pd.DataFrame:
         """Fetch historical market data for a ticker."""
-        ticker_data = yf.Ticker(ticker).history(period=period, interval=interval)
+        with self.span("fetch", ticker):
+            ticker_data = self.price_cache.history(ticker, period=period, interval=interval)
         if ticker_data.empty:
             raise ValueError(f"Failed to fetch data for ticker: {ticker}")
         return ticker_data
 
-    def get_status(self) -> Dict[str, Dict[str, float]]:
+    def get_status(self) -> Dict[str, Any]:
         """Get the current analysis status."""
         return {
+            **super().get_status(),
             "moving_averages": self.moving_averages,
             "rsi_values": self.rsi_values,
             "volatility": self.volatility,
         }
-
-    
\ No newline at end of file
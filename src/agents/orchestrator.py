@@ -0,0 +1,122 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from src.agents.market_analyst import MarketDataAnalyst
+from src.agents.portfolio_manager_analyst import PortfolioManagerAnalyst
+from src.agents.quant_analyst import QuantAnalyst
+from src.agents.sentiment_analyst import SentimentAnalyst
+from src.base.base_agent import BaseAgent
+from src.core.bulk_fetch import BulkFetchResult, fetch_many
+from src.core.settings import DEFAULT_WORKERS
+
+
+class Orchestrator(BaseAgent):
+    """
+    Runs the market, quant, sentiment and portfolio agents together over one watchlist.
+
+    Prices are downloaded once and shared by every agent. The Google Trends fetch overlaps with the
+    price download, and the agents' CPU-bound analysis runs concurrently on an executor once prices
+    arrive. One agent failing doesn't stop the others; its section of the report holds the error.
+    """
+
+    def __init__(self, config_paths: Optional[Dict[str, str]] = None, max_workers: int = DEFAULT_WORKERS):
+        super().__init__("Orchestrator", "")
+        config_paths = config_paths or {}
+        self.market = MarketDataAnalyst(config_paths.get("market", "config/market_analyst_config.yaml"))
+        self.quant = QuantAnalyst(config_paths.get("quant", "config/quant_analyst_config.yaml"))
+        self.sentiment = SentimentAnalyst(config_paths.get("sentiment", "config/sentiment_analyst_config.yaml"))
+        self.portfolio = PortfolioManagerAnalyst(config_paths.get("portfolio", "config/portfolio_manager_config.yaml"))
+        self.max_workers = max_workers
+        self.quant.max_workers = max_workers
+
+    @property
+    def agents(self) -> List[BaseAgent]:
+        return [self.market, self.quant, self.sentiment, self.portfolio]
+
+    async def run(self, tickers: List[str], keywords: Optional[List[str]] = None, timeframe: str = "1y",
+                  trends_timeframe: str = "today 12-m", region: str = "",
+                  weights: Optional[Dict[str, float]] = None, executor=None,
+                  fetched: Optional[BulkFetchResult] = None) -> Dict[str, Any]:
+        """
+        Analyze `tickers` with every agent. Google Trends interest is fetched for `keywords` (the
+        tickers by default); the portfolio uses `weights` or an equal weighting of the fetched tickers.
+        Prices already in memory can be passed as `fetched` to skip the download.
+
+        `executor` defaults to a thread pool; the NumPy/pandas kernels behind each agent release the
+        GIL for most of their work.
+        """
+        loop = asyncio.get_running_loop()
+        own_executor = executor is None
+        executor = executor or ThreadPoolExecutor(max_workers=4)
+        try:
+            trends = loop.run_in_executor(executor, self._sentiment, keywords or tickers, trends_timeframe, region)
+            if fetched is None:
+                fetch = partial(fetch_many, tickers, period=timeframe, max_workers=self.max_workers,
+                                cache=self.market.price_cache)
+                fetched = await loop.run_in_executor(executor, self.run_stage, "fetch", fetch)
+            analyses = [
+                loop.run_in_executor(executor, self._market, fetched),
+                loop.run_in_executor(executor, self._quant, fetched),
+                loop.run_in_executor(executor, self._portfolio, fetched, weights),
+                trends,
+            ]
+            with self.stage("analysis"):
+                market, quant, portfolio, sentiment = await asyncio.gather(*analyses, return_exceptions=True)
+        finally:
+            if own_executor:
+                executor.shutdown(wait=False)
+
+        return {
+            "market": _section(market),
+            "quant": _section(quant),
+            "sentiment": _section(sentiment),
+            "portfolio": _section(portfolio),
+            "failures": fetched.failures,
+            "status": self.get_status(),
+        }
+
+    def run_sync(self, tickers: List[str], **kwargs) -> Dict[str, Any]:
+        """Blocking wrapper around `run` for callers without an event loop."""
+        return asyncio.run(self.run(tickers, **kwargs))
+
+    def get_status(self) -> Dict[str, Any]:
+        return {**super().get_status(), "agents": {agent.name: agent.get_status() for agent in self.agents}}
+
+    def _market(self, fetched: BulkFetchResult) -> Dict[str, Any]:
+        return {ticker: result.to_dict() for ticker, result in self.market.analyze_fetched(fetched).items()}
+
+    def _quant(self, fetched: BulkFetchResult) -> Dict[str, Any]:
+        results = {
+            strategy: self.quant.analyze_fetched(strategy, fetched) for strategy in ("mean_reversion", "momentum")
+        }
+        if len(fetched.frames) >= 2:
+            results["pairs_trading"] = self.quant.analyze_fetched("pairs_trading", fetched)
+        return results
+
+    def _sentiment(self, keywords: List[str], timeframe: str, region: str) -> Dict[str, Any]:
+        trends = self.sentiment.get_trending_keywords(keywords, timeframe, region, visualize=False)
+        return {
+            keyword: {"latest": values[-1], "mean": float(np.mean(values)), "peak": float(np.max(values))}
+            for keyword, values in trends.items()
+        }
+
+    def _portfolio(self, fetched: BulkFetchResult, weights: Optional[Dict[str, float]]) -> Dict[str, Any]:
+        if not weights:
+            if not fetched.frames:
+                raise ValueError("No tickers were fetched for the portfolio.")
+            weights = {ticker: 1 / len(fetched.frames) for ticker in fetched.frames}
+        with self.portfolio.stage("metrics"):
+            self.portfolio.set_portfolio(weights)
+            self.portfolio.use_data(fetched)
+            return {"weights": weights, **self.portfolio.calculate_portfolio_metrics()}
+
+
+def _section(result: Any) -> Any:
+    """An agent's results, or its error when it raised."""
+    if isinstance(result, Exception):
+        return {"error": str(result)}
+    return result
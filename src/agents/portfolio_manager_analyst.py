@@ -1,16 +1,31 @@
 import numpy as np
 import pandas as pd
-import yfinance as yf
-from typing import Dict, List, Any
-import matplotlib.pyplot as plt
-import seaborn as sns 
+from typing import Dict, List, Any, Optional, Sequence, Tuple
+from src.analytics import risk, rolling
+from src.analytics.online_stats import (OnlineCovariance, aligned_prices, block_rows, iter_return_blocks,
+                                        return_moments, weighted_returns)
+from src.base.base_agent import BaseAgent
+from src.core.bulk_fetch import BulkFetchResult, iter_fetch
+from src.core.price_cache import get_price_cache
+from src.core.settings import DEFAULT_WORKERS, MEMORY_LIMIT_MB
+from src.core.rendering import ChartJob, ChartRenderer
 
-class PortfolioManagerAnalyst:
+class PortfolioManagerAnalyst(BaseAgent):
     def __init__(self, config_path: str):
-        self.config_path = config_path
+        super().__init__("PortfolioManagerAnalyst", config_path)
         self.portfolio: Dict[str, float] = {}  # {ticker: weight}
         self.historical_data: Dict[str, pd.DataFrame] = {}
         self.timeframe = "1y"
+        self.price_cache = get_price_cache()
+        self.max_workers = DEFAULT_WORKERS
+        self.renderer = ChartRenderer()
+
+        # Large portfolios: with a memory limit (MB) or float32 prices, statistics are streamed over
+        # date blocks instead of being computed on a full float64 returns frame.
+        portfolio_config = self.config.get("portfolio", {})
+        self.memory_limit_mb: Optional[float] = portfolio_config.get("memory_limit_mb", MEMORY_LIMIT_MB) or None
+        self.dtype = np.float32 if portfolio_config.get("float32", False) else np.float64
+        self._moments: Optional[OnlineCovariance] = None
 
     def set_portfolio(self, portfolio: Dict[str, float]):
         """
@@ -21,16 +36,39 @@ class PortfolioManagerAnalyst:
         if not np.isclose(sum(portfolio.values()), 1):
             raise ValueError("Portfolio weights must sum up to 1.")
         self.portfolio = portfolio
+        self._moments = None
 
     def fetch_data(self):
         """
-        Fetch historical price data for all portfolio tickers.
+        Fetch historical price data for all portfolio tickers. Only each ticker's Close is kept, as
+        soon as its download completes.
+        """
+        failures: Dict[str, str] = {}
+        with self.stage("fetch"):
+            self.historical_data = {}
+            self._moments = None
+            closes = {}
+            for ticker, frame, error in iter_fetch(self.portfolio.keys(), period=self.timeframe,
+                                                   max_workers=self.max_workers, cache=self.price_cache):
+                if error is None:
+                    closes[ticker] = frame["Close"].astype(self.dtype)
+                else:
+                    failures[ticker] = error
+        self.use_data(BulkFetchResult(closes, failures), field=None)
+
+    def use_data(self, fetched: BulkFetchResult, field: Optional[str] = "Close"):
+        """
+        Take the portfolio's prices from an existing fetch, e.g. one shared with other agents.
+        `field=None` takes fetches that already hold one price series per ticker.
         """
+        missing = {ticker: fetched.failures.get(ticker.strip().upper(), "not fetched")
+                   for ticker in self.portfolio.keys() if ticker.strip().upper() not in fetched}
+        if missing:
+            raise ValueError(f"No data found for tickers: {missing}")
+        self._moments = None
         for ticker in self.portfolio.keys():
-            data = yf.Ticker(ticker).history(period=self.timeframe)
-            if data.empty:
-                raise ValueError(f"No data found for ticker: {ticker}")
-            self.historical_data[ticker] = data["Close"]
+            prices = fetched[ticker.strip().upper()]
+            self.historical_data[ticker] = (prices if field is None else prices[field]).astype(self.dtype)
 
     def calculate_portfolio_metrics(self) -> Dict[str, Any]:
         """
@@ -39,14 +77,13 @@ class PortfolioManagerAnalyst:
         if not self.historical_data:
             raise ValueError("Historical data is empty. Fetch data first.")
 
-        returns = pd.DataFrame(self.historical_data).pct_change().dropna()
-        weights = np.array(list(self.portfolio.values()))
-        mean_returns = returns.mean()
-        cov_matrix = returns.cov()
+        with self.span("compute", step="metrics"):
+            mean_returns, cov_matrix = self._return_statistics()
+            weights = np.array(list(self.portfolio.values()))
 
-        portfolio_return = np.dot(weights, mean_returns)
-        portfolio_volatility = np.sqrt(np.dot(weights.T, np.dot(cov_matrix, weights)))
-        sharpe_ratio = portfolio_return / portfolio_volatility if portfolio_volatility != 0 else np.nan
+            portfolio_return = np.dot(weights, mean_returns)
+            portfolio_volatility = np.sqrt(np.dot(weights.T, np.dot(cov_matrix, weights)))
+            sharpe_ratio = portfolio_return / portfolio_volatility if portfolio_volatility != 0 else np.nan
 
         return {
             "portfolio_return": portfolio_return,
@@ -54,45 +91,227 @@ class PortfolioManagerAnalyst:
             "sharpe_ratio": sharpe_ratio,
         }
 
-    def visualize_portfolio_performance(self):
+    def optimize(self, objective: str = "max_sharpe", target_return: Optional[float] = None,
+                 long_only: bool = True, max_weight: float = 1.0, risk_free_rate: float = 0.0) -> Dict[str, Any]:
         """
-        Visualize portfolio performance.
+        Find minimum-variance, maximum-Sharpe or target-return weights for the portfolio's tickers.
+        Returns and volatility are annualized; `target_return` is an annualized return.
+        """
+        if objective not in ("min_variance", "max_sharpe", "target_return"):
+            raise ValueError(f"Unknown objective: {objective}")
+        if objective == "target_return" and target_return is None:
+            raise ValueError("The target_return objective needs a target return.")
+
+        with self.span("compute", step=objective):
+            optimizer = self._optimizer(long_only, max_weight, risk_free_rate)
+            if objective == "min_variance":
+                weights = optimizer.min_variance()
+            elif objective == "max_sharpe":
+                weights = optimizer.max_sharpe()
+            else:
+                weights = optimizer.target_return(target_return)
+
+        return {
+            "weights": dict(zip(self.portfolio.keys(), np.round(weights, 6).tolist())),
+            **optimizer.evaluate(weights),
+        }
+
+    def efficient_frontier(self, points: int = 20, long_only: bool = True, max_weight: float = 1.0,
+                           risk_free_rate: float = 0.0) -> pd.DataFrame:
+        """
+        Trace the efficient frontier as one row per point: annualized return, volatility and weights.
+        """
+        with self.span("compute", step="efficient_frontier"):
+            frontier = self._optimizer(long_only, max_weight, risk_free_rate).efficient_frontier(points)
+        weights = pd.DataFrame(frontier["weights"], columns=list(self.portfolio.keys()))
+        return pd.concat(
+            [pd.DataFrame({"return": frontier["returns"], "volatility": frontier["volatility"]}), weights], axis=1
+        )
+
+    def monte_carlo_portfolios(self, samples: int = 1_000_000, long_only: bool = True, max_weight: float = 1.0,
+                               risk_free_rate: float = 0.0, seed: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Evaluate `samples` random weight vectors in batched matrix products and report the best
+        Sharpe and lowest volatility portfolios found.
+        """
+        with self.span("compute", step="monte_carlo"):
+            optimizer = self._optimizer(long_only, max_weight, risk_free_rate)
+            result = optimizer.monte_carlo(samples, seed=seed)
+        tickers = list(self.portfolio.keys())
+        return {
+            "evaluated": result["evaluated"],
+            "max_sharpe": {"weights": dict(zip(tickers, np.round(result["max_sharpe"], 6).tolist())),
+                           **optimizer.evaluate(result["max_sharpe"])},
+            "min_variance": {"weights": dict(zip(tickers, np.round(result["min_variance"], 6).tolist())),
+                             **optimizer.evaluate(result["min_variance"])},
+        }
+
+    def risk_report(self, confidences: Sequence[float] = risk.DEFAULT_CONFIDENCES,
+                    horizons: Sequence[int] = risk.DEFAULT_HORIZONS, paths: int = 100_000,
+                    seed: Optional[int] = None, processes: Optional[int] = None,
+                    scenarios: Optional[Dict[str, Dict[str, float]]] = None, propagate: bool = True) -> Dict[str, Any]:
+        """
+        Historical, parametric and Monte Carlo VaR/CVaR at every confidence level and horizon (in
+        trading days), drawdown statistics of the rebalanced portfolio and, given `scenarios`, the
+        portfolio return under each set of shocks (see risk.stress_test). `paths` = 0 skips Monte Carlo.
         """
         if not self.historical_data:
             raise ValueError("Historical data is empty. Fetch data first.")
+        if any(not 0 < c < 1 for c in confidences) or any(int(h) < 1 for h in horizons):
+            raise ValueError("Confidence levels must be in (0, 1) and horizons at least 1 day.")
+        horizons = [int(h) for h in horizons]
+        tickers = list(self.portfolio.keys())
+        weights = np.array(list(self.portfolio.values()))
 
-        portfolio_values = pd.DataFrame(self.historical_data).dot(list(self.portfolio.values()))
-        normalized_values = portfolio_values / portfolio_values.iloc[0]  # Normalize to start at 1.0
+        with self.span("compute", step="risk"):
+            mean_returns, cov_matrix = self._return_statistics()
+            index, prices = aligned_prices(self.historical_data, tickers, self.dtype, self.memory_limit_mb)
+            returns = weighted_returns(prices, index, weights, self.memory_limit_mb)
+            var = risk.historical_var(returns.to_numpy(), confidences, horizons)
+            var += risk.parametric_var(float(weights @ mean_returns),
+                                       float(np.sqrt(weights @ cov_matrix.to_numpy() @ weights)), confidences, horizons)
+        if paths:
+            with self.span("compute", step="risk_monte_carlo"):
+                var += risk.monte_carlo_var(mean_returns.to_numpy(), cov_matrix.to_numpy(), weights, confidences,
+                                            horizons, paths, seed=seed, processes=processes)
 
-        plt.figure(figsize=(10, 6))
-        plt.plot(normalized_values, label="Portfolio")
-        plt.title("Portfolio Performance")
-        plt.xlabel("Date")
-        plt.ylabel("Normalized Value")
-        plt.legend()
-        plt.grid()
-        plt.show()
+        report: Dict[str, Any] = {"var": var, "drawdown": risk.drawdown_stats(returns)}
+        if scenarios:
+            report["scenarios"] = risk.stress_test(cov_matrix.to_numpy(), tickers, weights, scenarios, propagate)
+        return report
 
-    def visualize_correlation_matrix(self):
+    def rolling_metrics(self, windows: Sequence[int] = rolling.DEFAULT_WINDOWS, benchmark: Optional[str] = None,
+                        risk_free_rate: float = 0.0) -> rolling.RollingResult:
+        """
+        Rolling annualized return, volatility and Sharpe ratio of the rebalanced portfolio over each
+        window (in trading days), and its beta against the `benchmark` ticker when given.
+        """
+        if not self.historical_data:
+            raise ValueError("Historical data is empty. Fetch data first.")
+        tickers = list(self.portfolio.keys())
+        weights = np.array(list(self.portfolio.values()))
+        with self.span("compute", step="rolling_metrics"):
+            index, prices = aligned_prices(self.historical_data, tickers, self.dtype, self.memory_limit_mb)
+            returns = weighted_returns(prices, index, weights, self.memory_limit_mb)
+            benchmark_returns = self._benchmark_returns(benchmark) if benchmark else None
+            return rolling.rolling_metrics(returns, [int(w) for w in windows], benchmark_returns, risk_free_rate)
+
+    def _benchmark_returns(self, ticker: str) -> pd.Series:
+        ticker = ticker.strip().upper()
+        held = {t.strip().upper(): prices for t, prices in self.historical_data.items()}
+        prices = held[ticker] if ticker in held else self.price_cache.history(ticker, period=self.timeframe)["Close"]
+        if prices.empty:
+            raise ValueError(f"No data found for benchmark {ticker}")
+        return prices.astype(np.float64).pct_change()
+
+    def rolling_correlations(self, window: int = 60, step: int = 1,
+                             path: Optional[str] = None) -> Tuple[pd.DatetimeIndex, np.ndarray]:
+        """
+        Correlation matrices of the tickers' daily returns over every `window` trading days, one every
+        `step` days, as the dates each window ends on and a (windows x tickers x tickers) array in the
+        agent's dtype. With `path` the array is a memory-mapped .npy file written there as it fills.
+        """
+        if not self.historical_data:
+            raise ValueError("Historical data is empty. Fetch data first.")
+        tickers = list(self.portfolio.keys())
+        with self.span("compute", step="rolling_correlations"):
+            index, prices = aligned_prices(self.historical_data, tickers, self.dtype, self.memory_limit_mb)
+            positions, blocks = [], []
+            for rows, block in iter_return_blocks(prices, block_rows(len(tickers), self.memory_limit_mb)):
+                positions.append(rows)
+                blocks.append(block)
+            dates = index[np.concatenate(positions)] if positions else index[:0]
+            returns = np.concatenate(blocks) if blocks else np.empty((0, len(tickers)))
+            out = None
+            if path:
+                shape = (rolling.window_count(len(returns), window, max(step, 1)), len(tickers), len(tickers))
+                out = np.lib.format.open_memmap(path, mode="w+", dtype=self.dtype, shape=shape)
+            ends, matrices = rolling.rolling_correlation(returns, window, step, dtype=self.dtype, out=out)
+        return dates[ends], matrices
+
+    def _optimizer(self, long_only: bool, max_weight: float, risk_free_rate: float):
+        # scipy is only needed for optimization, so don't load it for plain portfolio analysis.
+        from src.analytics.optimizer import PortfolioOptimizer
+
+        mean_returns, cov_matrix = self._return_statistics()
+        return PortfolioOptimizer(mean_returns.to_numpy(), cov_matrix.to_numpy(), risk_free_rate=risk_free_rate,
+                                  long_only=long_only, max_weight=max_weight)
+
+    def _return_statistics(self):
+        """Daily mean returns and covariance of the portfolio's tickers, in portfolio order."""
+        if not self.historical_data:
+            raise ValueError("Historical data is empty. Fetch data first.")
+        tickers = list(self.portfolio.keys())
+        if self.bounded:
+            moments = self._streamed_moments()
+            return pd.Series(moments.mean, index=tickers), pd.DataFrame(moments.covariance(), index=tickers, columns=tickers)
+        returns = pd.DataFrame(self.historical_data)[tickers].pct_change().dropna()
+        return returns.mean(), returns.cov()
+
+    @property
+    def bounded(self) -> bool:
+        """Whether statistics are streamed over date blocks (memory limit or float32 prices)."""
+        return self.memory_limit_mb is not None or self.dtype != np.float64
+
+    def correlation_matrix(self) -> pd.DataFrame:
+        """Correlation of the tickers' daily returns over the dates on which all of them traded."""
+        if not self.historical_data:
+            raise ValueError("Historical data is empty. Fetch data first.")
+        if self.bounded:
+            tickers = list(self.portfolio.keys())
+            return pd.DataFrame(self._streamed_moments().correlation(), index=tickers, columns=tickers)
+        return pd.DataFrame(self.historical_data).pct_change().dropna().corr()
+
+    def _streamed_moments(self) -> OnlineCovariance:
+        # One pass over the prices serves the metrics, the optimizer and the correlation chart.
+        if self._moments is None:
+            _, prices = aligned_prices(self.historical_data, list(self.portfolio.keys()), self.dtype,
+                                       self.memory_limit_mb)
+            self._moments = return_moments(prices, self.memory_limit_mb)
+        return self._moments
+
+    def visualize_portfolio_performance(self) -> List[str]:
+        """
+        Visualize portfolio performance.
+        """
+        name, data, filename = self.chart_jobs()[0]
+        return self.renderer.render(name, data, filename)
+
+    def visualize_correlation_matrix(self) -> List[str]:
         """
         Visualize the correlation matrix of the portfolio's assets.
         """
+        name, data, filename = self.chart_jobs()[1]
+        return self.renderer.render(name, data, filename)
+
+    def chart_jobs(self, prefix: str = "portfolio") -> List[ChartJob]:
+        """
+        Chart specs for the performance and correlation charts, so reports covering many portfolios
+        can hand them all to ChartRenderer.render_many at once.
+        """
         if not self.historical_data:
             raise ValueError("Historical data is empty. Fetch data first.")
 
-        returns = pd.DataFrame(self.historical_data).pct_change().dropna()
-        correlation_matrix = returns.corr()
+        if self.bounded:
+            index, prices = aligned_prices(self.historical_data, list(self.portfolio.keys()), self.dtype,
+                                           self.memory_limit_mb)
+            portfolio_values = pd.Series(prices @ np.array(list(self.portfolio.values()), dtype=self.dtype), index=index)
+        else:
+            portfolio_values = pd.DataFrame(self.historical_data).dot(list(self.portfolio.values()))
+        normalized_values = portfolio_values / portfolio_values.iloc[0]  # Normalize to start at 1.0
+        correlation_matrix = self.correlation_matrix()
 
-        plt.figure(figsize=(10, 8))
-        sns.heatmap(correlation_matrix, annot=True, cmap="coolwarm", fmt=".2f")
-        plt.title("Correlation Matrix")
-        plt.show()
+        return [
+            ("portfolio_performance", {"values": normalized_values}, f"{prefix}_performance"),
+            ("correlation_matrix", {"correlation_matrix": correlation_matrix}, f"{prefix}_correlation"),
+        ]
 
     def get_status(self) -> Dict[str, Any]:
         """
         Get the current status of the Portfolio Manager Analyst.
         """
         return {
+            **super().get_status(),
             "portfolio": self.portfolio,
             "timeframe": self.timeframe,
         }
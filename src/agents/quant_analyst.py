@@ -1,31 +1,240 @@
 import pandas as pd
 import numpy as np
-import yfinance as yf
-from typing import Dict, List, Any
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+from src.analytics import panel
+from src.analytics.backtest import RunningPerformance, backtest_grid, positions, strategy_signal
+from src.analytics.pairs import scan_pairs
+from src.analytics.streaming import SignalRule, StreamMonitor, StreamingMomentum, StreamingZScore, bar_close
 from src.base.base_agent import BaseAgent  # Absolute import path 
+from src.core.bar_store import DEFAULT_CHUNK_DAYS, get_bar_store
+from src.core.bulk_fetch import BulkFetchResult, fetch_many, iter_fetch
+from src.core.price_cache import get_price_cache
+from src.core.providers import bars_per_year
+from src.core.settings import DEFAULT_WORKERS
+from src.models.trading_signals import SignalType
 
 class QuantAnalyst(BaseAgent):
     def __init__(self, config_path: str):
         super().__init__("QuantAnalyst", config_path)
         self.config = self.config.get("quant_analysis", {})
+        self.price_cache = get_price_cache()
+        self.bar_store = get_bar_store()
+        self.max_workers = DEFAULT_WORKERS
 
     def analyze(self, strategy: str, tickers: list, timeframe: str) -> dict:
         """
         Perform quantitative analysis based on the strategy.
         """
-        results = {}
-        for ticker in tickers:
-            ticker = ticker.strip().upper()  # Ensure ticker is a string and uppercase
-            data = self.fetch_data(ticker, timeframe)
+        if strategy not in ("mean_reversion", "momentum", "pairs_trading"):
+            raise ValueError(f"Unknown strategy: {strategy}")
+
+        with self.stage("fetch"):
+            fetched = fetch_many(tickers, period=timeframe, max_workers=self.max_workers, cache=self.price_cache)
+        return self.analyze_fetched(strategy, fetched)
+
+    def analyze_fetched(self, strategy: str, fetched: BulkFetchResult) -> Dict[str, Any]:
+        """
+        Run a strategy over an existing fetch, e.g. one shared with other agents. Tickers that failed
+        to download are reported as {"error": message}.
+        """
+        if strategy not in ("mean_reversion", "momentum", "pairs_trading"):
+            raise ValueError(f"Unknown strategy: {strategy}")
+
+        results: Dict[str, Any] = {ticker: {"error": message} for ticker, message in fetched.failures.items()}
+        with self.stage(strategy):
+            if strategy == "pairs_trading":
+                # Pairs are a property of the whole universe, so scan it once instead of once per ticker.
+                with self.span("compute", strategy=strategy):
+                    pairs = self.scan_pairs(fetched.panel("Close"))
+                for pair in pairs:
+                    results[f"{pair['ticker_1']}/{pair['ticker_2']}"] = pair
+                return results
+
+            for ticker, data in fetched.frames.items():
+                results[ticker] = self._run_strategy(strategy, ticker, data)
+        return results
+
+    def iter_analyze(self, strategy: str, tickers: List[str], timeframe: str = "1y") -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Streaming `analyze`: yields (ticker, result) as each ticker's download and strategy finish,
+        without holding the universe's prices in memory. Failed tickers yield {"error": message}.
+        Pairs need the whole universe at once, so pairs_trading yields its pairs after a full fetch.
+        """
+        if strategy == "pairs_trading":
+            yield from self.analyze(strategy, tickers, timeframe).items()
+            return
+        if strategy not in ("mean_reversion", "momentum"):
+            raise ValueError(f"Unknown strategy: {strategy}")
+
+        with self.stage(strategy):
+            for ticker, data, error in iter_fetch(tickers, period=timeframe, max_workers=self.max_workers,
+                                                  cache=self.price_cache):
+                if error is not None:
+                    yield ticker, {"error": error}
+                    continue
+                try:
+                    yield ticker, self._run_strategy(strategy, ticker, data)
+                except Exception as e:
+                    yield ticker, {"error": str(e)}
+
+    def _run_strategy(self, strategy: str, ticker: str, data: pd.DataFrame) -> Dict[str, Any]:
+        with self.span("compute", ticker, strategy=strategy):
             if strategy == "mean_reversion":
-                results[ticker] = self.mean_reversion_strategy(data)
-            elif strategy == "momentum":
-                results[ticker] = self.momentum_strategy(data)
-            elif strategy == "pairs_trading":
-                results[ticker] = self.pairs_trading_strategy(tickers)
+                return self.mean_reversion_strategy(data)
+            return self.momentum_strategy(data)
+
+    def backtest(self, strategy: str, tickers: List[str], timeframe: str = "10y",
+                 windows: Optional[List[int]] = None, thresholds: Optional[List[float]] = None,
+                 cost_bps: float = 0.0, processes: Optional[int] = None) -> pd.DataFrame:
+        """
+        Fetch the tickers once and backtest a grid of window and threshold parameters for the mean
+        reversion or momentum strategy over all of them. Defaults sweep around the live strategies'
+        windows (20 for mean reversion, 10 for momentum).
+        """
+        fetched = fetch_many(tickers, period=timeframe, max_workers=self.max_workers, cache=self.price_cache)
+        for ticker, message in fetched.failures.items():
+            self.logger.warning(f"Skipping {ticker} in backtest: {message}")
+        if not fetched.frames:
+            raise ValueError(f"No data available for tickers: {tickers}")
+
+        if windows is None:
+            windows = [5, 10, 20, 40, 60] if strategy == "mean_reversion" else [5, 10, 20, 60, 120]
+        if thresholds is None:
+            thresholds = [1.0, 1.5, 2.0, 2.5] if strategy == "mean_reversion" else [0.0, 0.02, 0.05, 0.1]
+        with self.span("compute", strategy=f"backtest_{strategy}"):
+            return backtest_grid(fetched.panel("Close"), strategy, windows, thresholds,
+                                 cost_bps=cost_bps, processes=processes)
+
+    def analyze_intraday(self, strategy: str, ticker: str, interval: str = "1m", start: Optional[str] = None,
+                         end: Optional[str] = None, window: Optional[int] = None, threshold: Optional[float] = None,
+                         cost_bps: float = 0.0, chunk_days: int = DEFAULT_CHUNK_DAYS) -> Dict[str, Any]:
+        """
+        Run the mean reversion or momentum strategy over a ticker's stored intraday bars (see
+        MarketDataAnalyst.ingest_intraday) a chunk of trading days at a time. Returns the strategy's
+        values at the last bar, as `analyze` reports them, and the backtest statistics of trading its
+        signal over every bar (see backtest.positions), with the Sharpe ratio annualized for the
+        interval. `window` is the z-score window (default 20) or momentum periods (default 10);
+        `threshold` the z-score (default 2) or rate of change (default 0) that opens a position.
+        """
+        if strategy not in ("mean_reversion", "momentum"):
+            raise ValueError(f"Intraday analysis does not support strategy: {strategy}")
+        if window is None:
+            window = 20 if strategy == "mean_reversion" else 10
+        if threshold is None:
+            threshold = 2.0 if strategy == "mean_reversion" else 0.0
+
+        tracker = RunningPerformance(cost_bps / 10_000, bars_per_year(interval))
+        thresholds = np.array([threshold])
+        tail = np.empty((0, 1))
+        first = last = None
+        for chunk in self.bar_store.iter_chunks(ticker, interval, chunk_days, start, end):
+            with self.span("compute", ticker, strategy=f"intraday_{strategy}"):
+                # The last `window` closes of earlier chunks come along so windows and returns
+                # straddling the boundary see the same bars as a single pass would.
+                values = np.vstack([tail, chunk["Close"].to_numpy(dtype=float)[:, None]])
+                carried = len(tail)
+                signal = strategy_signal(strategy, values, window)[carried:]
+                with np.errstate(divide="ignore", invalid="ignore"):
+                    returns = np.nan_to_num(values / panel.shift(values) - 1)[carried:, 0]
+                tracker.update(positions(strategy, signal, thresholds)[0, :, 0], returns)
+                tail = values[-window:]
+            first = chunk.index[0] if first is None else first
+            last = chunk.index[-1]
+
+        if strategy == "mean_reversion":
+            latest = {
+                "current_z_score": float(panel.zscore(values, window)[-1, 0]),
+                "rolling_mean": float(panel.rolling_mean(values, window)[-1, 0]),
+                "rolling_std": float(panel.rolling_std(values, window)[-1, 0]),
+            }
+        else:
+            latest = {"momentum": float(panel.momentum(values, window)[-1, 0]), "current_price": float(values[-1, 0])}
+        return {
+            **latest,
+            **tracker.result(),
+            "bars": tracker.bars,
+            "start": first,
+            "end": last,
+            "window": window,
+            "threshold": threshold,
+        }
+
+    def scan_pairs(self, prices: pd.DataFrame, top_k: Optional[int] = None,
+                   min_correlation: Optional[float] = None, **options) -> List[Dict[str, Any]]:
+        """
+        Screen every pair in a dates x tickers Close panel by return correlation, test the survivors
+        for cointegration and return the top-k pairs ranked by ADF statistic.
+        """
+        ranked = scan_pairs(
+            prices,
+            min_correlation=self.config.get("pairs_min_correlation", 0.7) if min_correlation is None else min_correlation,
+            top_k=self.config.get("pairs_top_k", 20) if top_k is None else top_k,
+            max_workers=self.max_workers,
+            **options,
+        )
+        return [
+            {key: value.item() if hasattr(value, "item") else value for key, value in record.items()}
+            for record in ranked.to_dict("records")
+        ]
+
+    def analyze_panel(self, strategy: str, prices: pd.DataFrame, window: int = 20, periods: int = 10) -> Dict[str, Dict[str, Any]]:
+        """
+        Run the mean reversion or momentum strategy over every column of a dates x tickers Close panel
+        at once, reading each ticker at its last priced date.
+        """
+        if strategy not in ("mean_reversion", "momentum"):
+            raise ValueError(f"Panel analysis does not support strategy: {strategy}")
+
+        with self.span("compute", strategy=strategy):
+            values = prices.to_numpy(dtype=float)
+            rows = panel.last_valid_rows(values)
+            columns = np.arange(values.shape[1])
+
+            if strategy == "mean_reversion":
+                fields = {
+                    "current_z_score": panel.zscore(values, window),
+                    "rolling_mean": panel.rolling_mean(values, window),
+                    "rolling_std": panel.rolling_std(values, window),
+                }
             else:
-                raise ValueError(f"Unknown strategy: {strategy}")
-        return results
+                fields = {"momentum": panel.momentum(values, periods), "current_price": values}
+            latest = {name: field[rows, columns] for name, field in fields.items()}
+        return {
+            ticker: {name: float(latest[name][i]) for name in fields}
+            for i, ticker in enumerate(prices.columns) if rows[i] >= 0
+        }
+
+    def stream(self, ticker: str, bars: Iterable[Any], history: Optional[pd.DataFrame] = None,
+               window: int = 20, periods: int = 10, z_threshold: float = 2.0) -> Iterator[Dict[str, Any]]:
+        """
+        Seed the mean reversion z-score and momentum from history once, then update them in O(1) per
+        incoming bar. Yields the latest values for each bar along with any z-score or momentum signals,
+        which are also recorded in `self.signals`.
+        """
+        if history is None:
+            history = self.fetch_data(ticker)
+
+        monitor = StreamMonitor(
+            {"z_score": StreamingZScore(window), "momentum": StreamingMomentum(periods)},
+            [
+                SignalRule(lambda v: v["z_score"], -z_threshold, z_threshold,
+                           SignalType.ZSCORE_OVERSOLD, SignalType.ZSCORE_OVERBOUGHT),
+                SignalRule(lambda v: v["momentum"], 0, 0, SignalType.MOMENTUM_BEARISH, SignalType.MOMENTUM_BULLISH),
+            ],
+        )
+        monitor.seed(history["Close"].to_numpy(dtype=float))
+
+        for bar in bars:
+            timestamp, close = bar_close(bar)
+            with self.span("compute", ticker):
+                values, _ = monitor.update(close)
+            yield {
+                "ticker": ticker,
+                "timestamp": timestamp,
+                "close": close,
+                **values,
+                "signals": self._record_triggered(ticker, monitor, timestamp),
+            }
 
     def mean_reversion_strategy(self, data: pd.DataFrame) -> Dict[str, Any]:
         """
@@ -51,7 +260,8 @@ class QuantAnalyst(BaseAgent):
         Fetch historical data for the given ticker.
         """
         try:
-            data = yf.Ticker(ticker).history(period=timeframe)
+            with self.span("fetch", ticker):
+                data = self.price_cache.history(ticker, period=timeframe)
             if data.empty:
                 raise ValueError(f"No data available for ticker: {ticker}")
             return data
@@ -65,23 +275,25 @@ class QuantAnalyst(BaseAgent):
         if data.empty:
             raise ValueError("No data available for the given ticker.")
 
-        data["Momentum"] = data["Close"].diff(periods=10)
-        momentum = data["Momentum"].iloc[-1]
+        # Don't add a column to `data`: the frame may be shared with other agents.
+        momentum = data["Close"].diff(periods=10).iloc[-1]
 
         return {
             "momentum": momentum,
             "current_price": data["Close"].iloc[-1],
         }
 
-    def pairs_trading_strategy(self, tickers: List[str]) -> Dict[str, Any]:
+    def pairs_trading_strategy(self, tickers: List[str], data: Optional[Dict[str, pd.DataFrame]] = None) -> Dict[str, Any]:
         """
         Pairs trading strategy: Analyze correlation and cointegration of two tickers.
+        Frames already fetched for the tickers can be passed in `data` to avoid downloading them again.
         """
         if len(tickers) < 2:
             raise ValueError("Pairs trading requires at least two tickers.")
-        
-        data_1 = self.fetch_data(tickers[0])
-        data_2 = self.fetch_data(tickers[1])
+
+        data = data or {}
+        data_1 = data[tickers[0]] if tickers[0] in data else self.fetch_data(tickers[0])
+        data_2 = data[tickers[1]] if tickers[1] in data else self.fetch_data(tickers[1])
 
         if data_1.empty or data_2.empty:
             raise ValueError(f"No data available for tickers: {tickers}")
@@ -102,4 +314,4 @@ class QuantAnalyst(BaseAgent):
         """
         Get the current status of the Quant Analyst.
         """
-        return {"config": self.config}
+        return {**super().get_status(), "config": self.config}
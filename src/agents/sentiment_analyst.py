@@ -1,33 +1,48 @@
-import matplotlib.pyplot as plt
-from pytrends.request import TrendReq
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
 import pandas as pd # Ensure pandas is properly imported 
+from src.analytics import leadlag
+from src.base.base_agent import BaseAgent
+from src.core.bulk_fetch import BulkFetchResult, fetch_many
+from src.core.settings import DEFAULT_WORKERS
+from src.core.rendering import ChartRenderer
+from src.core.trends import TrendsScheduler
 
-class SentimentAnalyst:
+class SentimentAnalyst(BaseAgent):
     def __init__(self, config_path: str):
-        self.config_path = config_path
-        self.pytrends = TrendReq(hl="en-US", tz=360)
+        super().__init__("SentimentAnalyst", config_path)
         self.trending_keywords: List[str] = []
+        self.renderer = ChartRenderer()
+        self.trends = TrendsScheduler()
 
-    def get_trending_keywords(self, keywords: List[str], timeframe: str = "now 7-d", region: str = "") -> Dict[str, Any]:
+    @property
+    def pytrends(self):
+        """Google Trends session, created on first use so constructing the agent stays cheap."""
+        return self.trends.client
+
+    def get_trending_keywords(self, keywords: List[str], timeframe: str = "now 7-d", region: str = "",
+                              visualize: bool = True, anchor: Optional[str] = None) -> Dict[str, Any]:
         """
         Fetch interest trends for given keywords using Google Trends.
+        More than five keywords are fetched in batches sharing `anchor` (default: the first keyword)
+        and rescaled onto one scale. Set `visualize` to False to only fetch the data.
         """
         if not keywords:
             raise ValueError("Keywords list is empty.")
-        
-        self.pytrends.build_payload(keywords, timeframe=timeframe, geo=region)
-        data = self.pytrends.interest_over_time()
+
+        with self.stage("trends"):
+            data = self.trends.interest_over_time(keywords, timeframe=timeframe, geo=region, anchor=anchor)
 
         if data.empty:
             raise ValueError("No data found for the given keywords.")
         
         # Extract the trend data
-        trends = {keyword: data[keyword].tolist() for keyword in keywords}
+        with self.span("compute", step="trends"):
+            keywords = list(data.columns)
+            trends = {keyword: data[keyword].tolist() for keyword in keywords}
         self.trending_keywords = trends
         
-        # Visualize the trends using matplotlib
-        self.visualize_trends(data, keywords)
+        if visualize:
+            self.visualize_trends(data, keywords)
 
         return trends
 
@@ -35,26 +50,66 @@ class SentimentAnalyst:
         """
         Fetch related queries for a given keyword.
         """
-        self.pytrends.build_payload([keyword])
-        queries = self.pytrends.related_queries()
-        return queries.get(keyword, {})
+        return self.trends.related_queries([keyword]).get(keyword, {})
+
+    def get_related_queries_many(self, keywords: List[str], timeframe: str = "today 5-y",
+                                 region: str = "") -> Dict[str, Dict[str, Any]]:
+        """
+        Fetch related queries for many keywords, five per request.
+        """
+        return self.trends.related_queries(keywords, timeframe=timeframe, geo=region)
+
+    def lead_lag(self, keywords: List[str], tickers: List[str], timeframe: str = "today 5-y", region: str = "",
+                 anchor: Optional[str] = None, max_lag: int = 8, top: int = 20, min_lag: int = 0,
+                 difference: bool = True, method: str = "auto", fetched: Optional[BulkFetchResult] = None,
+                 max_workers: int = DEFAULT_WORKERS) -> Dict[str, Any]:
+        """
+        Lead/lag between each keyword's search interest and each ticker's returns over the Trends
+        timeframe, at lags of up to `max_lag` Trends periods (weeks for "today 5-y"). Returns the `top`
+        pairs by strength at their best lag (see leadlag.strongest), the periods compared and the
+        tickers left out. Prices come from `fetched` when given, otherwise from the price cache.
+        """
+        if not keywords or not tickers:
+            raise ValueError("Lead/lag needs at least one keyword and one ticker.")
+        with self.stage("trends"):
+            interest = self.trends.interest_over_time(keywords, timeframe=timeframe, geo=region, anchor=anchor)
+        if interest.empty:
+            raise ValueError("No data found for the given keywords.")
+        if fetched is None:
+            from src.core.price_cache import get_price_cache
+
+            period, interval = leadlag.price_window(timeframe)
+            with self.stage("fetch"):
+                fetched = fetch_many(tickers, period=period, interval=interval, max_workers=max_workers,
+                                     cache=get_price_cache())
+
+        with self.span("compute", step="lead_lag"):
+            closes = pd.DataFrame({ticker: frame["Close"] for ticker, frame in fetched.frames.items()})
+            signal, returns, dropped = leadlag.align(interest, closes, difference=difference)
+            skipped = {**fetched.failures, **dropped}
+            if returns.shape[1] == 0:
+                raise ValueError(f"No ticker has prices over the Trends dates: {skipped}")
+            if len(returns) <= max_lag + 2:
+                raise ValueError(f"Only {len(returns)} aligned periods; need more than {max_lag + 2} for lags up to {max_lag}")
+            correlation = leadlag.lagged_correlation(signal.to_numpy(), returns.to_numpy(), max_lag, method)
+            pairs = leadlag.strongest(correlation, list(signal.columns), list(returns.columns), max_lag,
+                                      len(returns), top, min_lag)
+        return {
+            "pairs": pairs,
+            "periods": len(returns),
+            "start": returns.index[0],
+            "end": returns.index[-1],
+            "skipped": skipped,
+        }
 
-    def visualize_trends(self, data: pd.DataFrame, keywords: List[str]):
+    def visualize_trends(self, data: pd.DataFrame, keywords: List[str]) -> List[str]:
         """
         Visualize the trends of the keywords over time.
         """
-        plt.figure(figsize=(10, 6))
-        
-        # Plotting each keyword's trend
-        for keyword in keywords:
-            plt.plot(data.index, data[keyword], label=keyword)
-
-        plt.title("Google Trends for Keywords")
-        plt.xlabel("Date")
-        plt.ylabel("Interest over time")
-        plt.legend(title="Keywords")
-        plt.xticks(rotation=45)
-        plt.tight_layout()
-
-        # Show the plot
-        plt.show()
+        return self.renderer.render("trends", {"data": data, "keywords": keywords}, "trends_" + "_".join(keywords))
+
+    def get_status(self) -> Dict[str, Any]:
+        """
+        Get the current status of the Sentiment Analyst.
+        """
+        return {**super().get_status(), "keywords": list(self.trending_keywords), "trends": self.trends.stats()}
@@ -0,0 +1,199 @@
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Sequence
+
+from src.analytics import panel
+from src.analytics.indicators import TRADING_DAYS
+
+STRATEGIES = ("mean_reversion", "momentum")
+METRICS = ["total_return", "sharpe", "max_drawdown", "turnover", "exposure"]
+
+# Upper bound on (thresholds x dates x tickers) elements held at once while sweeping one window.
+MAX_BLOCK_ELEMENTS = 8_000_000
+
+
+def strategy_signal(strategy: str, values: np.ndarray, window: int) -> np.ndarray:
+    """
+    The raw signal each strategy thresholds, per date and ticker: the rolling z-score of price for
+    mean reversion, the `window`-bar rate of change for momentum.
+    """
+    if strategy == "mean_reversion":
+        return panel.zscore(values, window)
+    if strategy == "momentum":
+        return panel.rate_of_change(values, window)
+    raise ValueError(f"Unknown strategy: {strategy}")
+
+
+def positions(strategy: str, signal: np.ndarray, thresholds: np.ndarray) -> np.ndarray:
+    """
+    Broadcast a (dates, tickers) signal against a vector of thresholds into (thresholds, dates, tickers)
+    positions of -1, 0 or +1. Mean reversion fades the move (short when z > threshold); momentum
+    follows it (long when the rate of change > threshold).
+    """
+    signal = np.nan_to_num(signal)[None, :, :]
+    limits = thresholds[:, None, None]
+    position = (signal > limits).astype(np.int8) - (signal < -limits).astype(np.int8)
+    return -position if strategy == "mean_reversion" else position
+
+
+def performance(position: np.ndarray, returns: np.ndarray, cost: float = 0.0,
+                annualization: float = TRADING_DAYS, valid: Optional[np.ndarray] = None) -> Dict[str, np.ndarray]:
+    """
+    PnL statistics for (..., dates, tickers) positions against (dates, tickers) returns. Positions are
+    taken at the close and earn the next bar's return; `cost` is charged per unit of position traded.
+    `valid` marks the (dates, tickers) bars that have a return; statistics are taken over those bars
+    only, so a ticker listed partway through the panel isn't averaged over bars before it existed.
+    By default every bar counts.
+
+    Per-bar PnL is held in float32 to halve memory traffic on large sweeps; sums are accumulated in
+    float64.
+    """
+    bars = position.shape[-2] if valid is None else np.count_nonzero(valid, axis=0)
+    held = np.zeros_like(position)
+    held[..., 1:, :] = position[..., :-1, :]
+    traded = np.abs(np.diff(position, axis=-2, prepend=np.int8(0)))
+    if valid is not None:
+        held *= valid
+        traded *= valid
+    pnl = held * returns.astype(np.float32)
+    if cost:
+        pnl -= np.float32(cost) * traded
+
+    total = pnl.sum(axis=-2, dtype=np.float64)
+    total_sq = np.square(pnl).sum(axis=-2, dtype=np.float64)
+    equity = np.cumsum(pnl, axis=-2)
+    drawdown = np.maximum.accumulate(np.maximum(equity, 0.0), axis=-2) - equity
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean = total / bars
+        std = np.sqrt(np.maximum(total_sq - total * mean, 0.0) / (np.asarray(bars) - 1))
+        sharpe = np.where((std > 0) & (np.asarray(bars) > 1), mean / std * np.sqrt(annualization), np.nan)
+        return {
+            "total_return": total,
+            "sharpe": sharpe,
+            "max_drawdown": drawdown.max(axis=-2).astype(np.float64),
+            "turnover": traded.sum(axis=-2) / bars,
+            "exposure": np.count_nonzero(held, axis=-2) / bars,
+        }
+
+
+class RunningPerformance:
+    """
+    `performance` of one ticker's positions fed a chunk of bars at a time, e.g. days of minute bars
+    too many to hold at once. The position held into each chunk, the PnL sums and the equity peak
+    carry over, so the statistics match a single pass over every bar (equity is kept in float64).
+    """
+
+    def __init__(self, cost: float = 0.0, annualization: float = TRADING_DAYS):
+        self.cost = cost
+        self.annualization = annualization
+        self.bars = 0
+        self.position = np.int8(0)
+        self.total = self.total_sq = 0.0
+        self.equity = self.peak = self.max_drawdown = 0.0
+        self.traded = self.exposed = 0
+
+    def update(self, position: np.ndarray, returns: np.ndarray):
+        """Add a chunk of -1/0/+1 positions and the matching bar returns."""
+        if not len(position):
+            return
+        position = np.asarray(position, dtype=np.int8)
+        held = np.empty_like(position)
+        held[0] = self.position
+        held[1:] = position[:-1]
+        traded = np.abs(np.diff(position, prepend=self.position))
+        pnl = held * np.asarray(returns, dtype=np.float32)
+        if self.cost:
+            pnl -= np.float32(self.cost) * traded
+
+        equity = self.equity + np.cumsum(pnl, dtype=np.float64)
+        peak = np.maximum(np.maximum.accumulate(np.maximum(equity, 0.0)), self.peak)
+        self.max_drawdown = max(self.max_drawdown, float((peak - equity).max()))
+        self.peak, self.equity = float(peak[-1]), float(equity[-1])
+        self.total += float(pnl.sum(dtype=np.float64))
+        self.total_sq += float(np.square(pnl).sum(dtype=np.float64))
+        self.traded += int(traded.sum())
+        self.exposed += int(np.count_nonzero(held))
+        self.position = position[-1]
+        self.bars += len(position)
+
+    def result(self) -> Dict[str, float]:
+        """The METRICS so far, as `performance` reports them."""
+        if self.bars < 2:
+            return {metric: float("nan") for metric in METRICS}
+        mean = self.total / self.bars
+        std = np.sqrt(max(self.total_sq - self.total * mean, 0.0) / (self.bars - 1))
+        return {
+            "total_return": self.total,
+            "sharpe": float(mean / std * np.sqrt(self.annualization)) if std > 0 else float("nan"),
+            "max_drawdown": self.max_drawdown,
+            "turnover": self.traded / self.bars,
+            "exposure": self.exposed / self.bars,
+        }
+
+
+def _sweep_window(strategy: str, values: np.ndarray, returns: np.ndarray, valid: np.ndarray, window: int,
+                  thresholds: np.ndarray, cost: float, annualization: float) -> Dict[str, np.ndarray]:
+    signal = strategy_signal(strategy, values, window)
+    block = max(1, MAX_BLOCK_ELEMENTS // max(1, signal.size))
+    parts = [
+        performance(positions(strategy, signal, thresholds[start:start + block]), returns, cost, annualization,
+                    valid)
+        for start in range(0, len(thresholds), block)
+    ]
+    return {metric: np.concatenate([part[metric] for part in parts]) for metric in METRICS}
+
+
+def backtest_grid(prices: pd.DataFrame, strategy: str, windows: Sequence[int], thresholds: Sequence[float],
+                  cost_bps: float = 0.0, annualization: float = TRADING_DAYS,
+                  processes: Optional[int] = None) -> pd.DataFrame:
+    """
+    Backtest every (window, threshold) combination of a strategy over every ticker of a dates x tickers
+    Close panel. Thresholds are broadcast in one array pass per window; with `processes` > 1 the
+    windows are spread over a process pool.
+
+    Returns one row per (window, threshold, ticker) with total return, annualized Sharpe, maximum
+    drawdown, average turnover per bar and the fraction of bars with a position, each over the bars
+    that ticker has a return on.
+    """
+    if strategy not in STRATEGIES:
+        raise ValueError(f"Unknown strategy: {strategy}")
+
+    values = prices.to_numpy(dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        returns = values / panel.shift(values) - 1
+    # Each ticker's statistics cover only the bars it has a return on (priced then and the bar before).
+    valid = np.isfinite(returns)
+    returns = np.where(valid, returns, 0.0)
+    thresholds = np.asarray(thresholds, dtype=float)
+    windows = [int(window) for window in windows]
+    cost = cost_bps / 10_000
+    args = [(strategy, values, returns, valid, window, thresholds, cost, annualization) for window in windows]
+
+    if processes and processes > 1 and len(windows) > 1:
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            swept = list(executor.map(_sweep_window, *zip(*args)))
+    else:
+        swept = [_sweep_window(*arg) for arg in args]
+
+    index = pd.MultiIndex.from_product(
+        [windows, thresholds, list(prices.columns)], names=["window", "threshold", "ticker"]
+    )
+    return pd.DataFrame(
+        {metric: np.concatenate([result[metric].ravel() for result in swept]) for metric in METRICS},
+        index=index,
+    )
+
+
+def best_parameters(results: pd.DataFrame, metric: str = "sharpe") -> pd.DataFrame:
+    """The (window, threshold) row with the highest `metric` for each ticker."""
+    ranked = results.reset_index().dropna(subset=[metric])
+    return ranked.loc[ranked.groupby("ticker")[metric].idxmax()].set_index("ticker")
+
+
+def parse_grid(spec: str, cast=float) -> List:
+    """Parse "10,20,50" or a "start:stop:step" range (stop inclusive) into a list of values."""
+    if ":" in spec:
+        start, stop, step = (float(part) for part in spec.split(":"))
+        return [cast(value) for value in np.arange(start, stop + step / 2, step)]
+    return [cast(part) for part in spec.split(",") if part.strip()]
@@ -0,0 +1,202 @@
+import numpy as np
+import pandas as pd
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+TRADING_DAYS = 252
+
+
+def _window_sum(values: np.ndarray, window: int) -> np.ndarray:
+    """Trailing sum over `window` observations of a NaN-free array, NaN until the window is full."""
+    out = np.full(values.shape, np.nan)
+    if window <= 0 or len(values) < window:
+        return out
+    csum = np.cumsum(np.insert(values, 0, 0.0))
+    out[window - 1:] = csum[window:] - csum[:-window]
+    return out
+
+
+def _full_windows(values: np.ndarray, window: int) -> np.ndarray:
+    return _window_sum((~np.isnan(values)).astype(float), window) == window
+
+
+def rolling_mean(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    Trailing mean over `window` observations, NaN unless the whole window holds values (pandas
+    semantics): a gap only blanks the windows that contain it.
+    """
+    out = _window_sum(np.nan_to_num(values), window) / window
+    out[~_full_windows(values, window)] = np.nan
+    return out
+
+
+def rolling_std(values: np.ndarray, window: int, ddof: int = 1) -> np.ndarray:
+    """Trailing sample standard deviation over `window` observations, NaN unless the whole window holds values."""
+    if window <= ddof:
+        return np.full(values.shape, np.nan)
+    # Centre on the overall mean first so the sum-of-squares difference doesn't lose precision.
+    with np.errstate(invalid="ignore"):
+        centred = np.nan_to_num(values - np.nanmean(values)) if len(values) else values
+    total = _window_sum(centred, window)
+    total_sq = _window_sum(centred ** 2, window)
+    var = (total_sq - total ** 2 / window) / (window - ddof)
+    out = np.sqrt(np.maximum(var, 0.0))
+    out[~_full_windows(values, window)] = np.nan
+    return out
+
+
+class PriceContext:
+    """
+    Intermediate series shared between indicators, each derived at most once per price frame.
+    """
+
+    def __init__(self, data: pd.DataFrame):
+        self.index = data.index
+        self.close = data["Close"].to_numpy(dtype=float)
+        self._cache: Dict[str, np.ndarray] = {}
+
+    def derived(self, name: str, build: Callable[[], np.ndarray]) -> np.ndarray:
+        if name not in self._cache:
+            self._cache[name] = build()
+        return self._cache[name]
+
+    @property
+    def delta(self) -> np.ndarray:
+        return self.derived("delta", lambda: np.diff(self.close, prepend=np.nan))
+
+    @property
+    def log_returns(self) -> np.ndarray:
+        return self.derived("log_returns", lambda: np.log(self.close / np.insert(self.close[:-1], 0, np.nan)))
+
+
+INDICATORS: Dict[str, Callable[[PriceContext, Dict[str, Any]], Dict[str, np.ndarray]]] = {}
+LOOKBACKS: Dict[str, Callable[[Dict[str, Any]], int]] = {}
+
+
+def register_indicator(name: str, lookback: Optional[Callable[[Dict[str, Any]], int]] = None):
+    """
+    Register an indicator function `fn(context, params) -> {column: series}` with the engine.
+    `lookback(params)` is how many bars before a row its value depends on; indicators that declare
+    one can be computed over chunks of bars.
+    """
+    def decorator(fn):
+        INDICATORS[name] = fn
+        if lookback is not None:
+            LOOKBACKS[name] = lookback
+        return fn
+    return decorator
+
+
+@register_indicator("moving_averages", lambda params: max(params["short_window"], params["long_window"]) - 1)
+def _moving_averages(ctx: PriceContext, params: Dict[str, Any]) -> Dict[str, np.ndarray]:
+    return {
+        "ma_short": rolling_mean(ctx.close, params["short_window"]),
+        "ma_long": rolling_mean(ctx.close, params["long_window"]),
+    }
+
+
+@register_indicator("rsi", lambda params: params["rsi_period"])
+def _rsi(ctx: PriceContext, params: Dict[str, Any]) -> Dict[str, np.ndarray]:
+    period = params["rsi_period"]
+    delta = ctx.delta
+    gain = rolling_mean(np.where(delta > 0, delta, 0.0), period)
+    loss = rolling_mean(np.where(delta < 0, -delta, 0.0), period)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rsi = 100 - (100 / (1 + gain / loss))
+    return {"rsi": rsi}
+
+
+@register_indicator("volatility", lambda params: params["volatility_period"])
+def _volatility(ctx: PriceContext, params: Dict[str, Any]) -> Dict[str, np.ndarray]:
+    period = params["volatility_period"]
+    returns = ctx.log_returns
+    vol = np.full(returns.shape, np.nan)
+    vol[1:] = rolling_std(returns[1:], period) * np.sqrt(params["annualization"])
+    return {"volatility": vol}
+
+
+class IndicatorResult:
+    """
+    Indicator series for one price frame, with the latest value of each column.
+    """
+
+    def __init__(self, ticker: str, series: pd.DataFrame):
+        self.ticker = ticker
+        self.series = series
+        self.latest: Dict[str, float] = {
+            column: float(series[column].iloc[-1]) for column in series.columns
+        } if len(series) else {}
+
+    def __getitem__(self, column: str) -> float:
+        return self.latest[column]
+
+    @property
+    def moving_averages(self) -> Dict[str, float]:
+        return {"short": self.latest["ma_short"], "long": self.latest["ma_long"]}
+
+    @property
+    def rsi(self) -> float:
+        return self.latest["rsi"]
+
+    @property
+    def volatility(self) -> float:
+        return self.latest["volatility"]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"ticker": self.ticker, **self.latest}
+
+
+class IndicatorEngine:
+    """
+    Computes a requested set of indicators from one price frame, sharing intermediates between them.
+    """
+
+    DEFAULT_PARAMS = {
+        "short_window": 20,
+        "long_window": 50,
+        "rsi_period": 14,
+        "volatility_period": 20,
+        "annualization": TRADING_DAYS,
+    }
+
+    def __init__(self, **params):
+        self.params = {**self.DEFAULT_PARAMS, **params}
+
+    def compute(self, data: pd.DataFrame, indicators: Optional[Iterable[str]] = None,
+                ticker: str = "", **overrides) -> IndicatorResult:
+        """Compute `indicators` (all registered ones by default) over the Close column of `data`."""
+        names: List[str] = list(indicators) if indicators is not None else list(INDICATORS)
+        unknown = [name for name in names if name not in INDICATORS]
+        if unknown:
+            raise ValueError(f"Unknown indicators: {unknown}")
+
+        params = {**self.params, **overrides}
+        ctx = PriceContext(data)
+        columns: Dict[str, np.ndarray] = {}
+        for name in names:
+            columns.update(INDICATORS[name](ctx, params))
+        return IndicatorResult(ticker, pd.DataFrame(columns, index=ctx.index))
+
+    def lookback(self, indicators: Optional[Iterable[str]] = None, **overrides) -> int:
+        """Bars of history the indicators need before a row, i.e. how much each chunk carries over."""
+        names: List[str] = list(indicators) if indicators is not None else list(INDICATORS)
+        missing = [name for name in names if name not in LOOKBACKS]
+        if missing:
+            raise ValueError(f"Indicators without a registered lookback can't be chunked: {missing}")
+        params = {**self.params, **overrides}
+        return max((LOOKBACKS[name](params) for name in names), default=0)
+
+    def compute_chunks(self, chunks: Iterable[pd.DataFrame], indicators: Optional[Iterable[str]] = None,
+                       ticker: str = "", **overrides) -> Iterator[IndicatorResult]:
+        """
+        `compute` over consecutive chunks of one price series, e.g. days of minute bars, yielding
+        one result per chunk. Each chunk is computed with the last `lookback` bars of the previous
+        ones prepended, so windows straddling a chunk boundary match computing the whole series.
+        """
+        names = list(indicators) if indicators is not None else None
+        carry = self.lookback(names, **overrides)
+        tail = None
+        for chunk in chunks:
+            data = chunk if tail is None else pd.concat([tail, chunk])
+            result = self.compute(data, names, ticker=ticker, **overrides)
+            yield IndicatorResult(ticker, result.series.iloc[len(data) - len(chunk):])
+            tail = data.iloc[max(len(data) - carry, 0):] if carry else None
@@ -0,0 +1,203 @@
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Lead/lag between search interest and returns: the Pearson correlation of every keyword series with
+# every ticker's returns shifted by each lag, for all pairs at once. The sums of products at every lag
+# come from FFT cross-spectra or per-lag matrix products, batched over blocks of keywords, and the
+# per-lag means and variances from prefix sums, so the result matches correlating each overlap
+# directly (pandas' x.corr(y.shift(-lag))).
+#
+# Lag convention: at lag k > 0 interest leads returns (interest at t against returns at t + k); at
+# k < 0 returns lead interest.
+
+BLOCK_BYTES = 128 * 1024 * 1024  # Memory for one block of keywords' intermediate results
+# Relative cost of one FFT-path unit (size * log2 size) against one direct-path unit (rows * lags) per
+# pair, measured with NumPy's FFT against BLAS; the FFT only pays off for lag windows close to T.
+FFT_COST = 10.0
+
+
+def _fft_size(length: int) -> int:
+    """Smallest power of two that holds a linear (non-wrapping) correlation of two `length` series."""
+    return 1 << int(np.ceil(np.log2(max(2 * length - 1, 1))))
+
+
+def _overlap_sums(values: np.ndarray, lags: np.ndarray, leading: bool) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Sum and sum of squares of each column over the rows that take part at every lag: rows
+    [0, T - k) of the leading side and [k, T) of the lagging side for k >= 0, and the reverse for k < 0.
+    """
+    rows = values.shape[0]
+    prefix = np.vstack([np.zeros((1, values.shape[1])), np.cumsum(values, axis=0)])
+    prefix_sq = np.vstack([np.zeros((1, values.shape[1])), np.cumsum(values * values, axis=0)])
+    if leading:
+        start, stop = np.maximum(-lags, 0), rows - np.maximum(lags, 0)
+    else:
+        start, stop = np.maximum(lags, 0), rows + np.minimum(lags, 0)
+    return prefix[stop] - prefix[start], prefix_sq[stop] - prefix_sq[start]
+
+
+def lagged_correlation(x: np.ndarray, y: np.ndarray, max_lag: int, method: str = "auto",
+                       block_bytes: int = BLOCK_BYTES) -> np.ndarray:
+    """
+    Pearson correlation of every column of `x` (T x K, e.g. interest changes) with every column of
+    `y` (T x M, e.g. returns) at lags -max_lag..max_lag, as a (K x M x lags) float32 array. Rows must
+    be aligned and free of NaNs. Columns with no variance over an overlap give NaN.
+
+    The sums of products come from single-precision FFT cross-spectra ("fft", cost independent of
+    the number of lags) or one matrix product per lag ("direct", cheaper for short lag windows);
+    "auto" picks whichever is estimated to be faster. Work is done in blocks of keywords sized to
+    `block_bytes`.
+    """
+    if method not in ("auto", "fft", "direct"):
+        raise ValueError(f"Unknown method {method!r}; use auto, fft or direct")
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    rows = x.shape[0]
+    if y.shape[0] != rows:
+        raise ValueError(f"x and y must have the same rows, got {x.shape[0]} and {y.shape[0]}")
+    if not 0 <= max_lag < rows - 2:
+        raise ValueError(f"max_lag must be between 0 and {rows - 3} for {rows} observations, got {max_lag}")
+    # Standardizing leaves the correlations unchanged and keeps the sums well scaled.
+    x = (x - x.mean(axis=0)) / np.where(x.std(axis=0) > 0, x.std(axis=0), 1.0)
+    y = (y - y.mean(axis=0)) / np.where(y.std(axis=0) > 0, y.std(axis=0), 1.0)
+
+    lags = np.arange(-max_lag, max_lag + 1)
+    counts = (rows - np.abs(lags)).astype(np.float64)
+    sum_x, sq_x = _overlap_sums(x, lags, leading=True)  # (lags x K)
+    sum_y, sq_y = _overlap_sums(y, lags, leading=False)  # (lags x M)
+    spread_x = np.sqrt(np.maximum(sq_x - sum_x ** 2 / counts[:, None], 0.0))
+    spread_y = np.sqrt(np.maximum(sq_y - sum_y ** 2 / counts[:, None], 0.0))
+
+    size = _fft_size(rows)
+    if method == "auto":
+        method = "fft" if FFT_COST * size * np.log2(size) < rows * len(lags) else "direct"
+    keywords, tickers = x.shape[1], y.shape[1]
+    if method == "fft":
+        spectrum_x = np.conj(np.fft.rfft(x.T, n=size, axis=1)).astype(np.complex64)  # (K x F)
+        spectrum_y = np.fft.rfft(y.T, n=size, axis=1).astype(np.complex64)  # (M x F)
+        # Lag k sits at position k of the circular correlation and -k at size - k.
+        positions = np.where(lags >= 0, lags, size + lags)
+        per_keyword = tickers * (spectrum_y.shape[1] * 8 + size * 4)  # A cross-spectrum and its inverse
+    else:
+        per_keyword = tickers * len(lags) * 8
+
+    out = np.empty((keywords, tickers, len(lags)), dtype=np.float32)
+    block = max(1, int(block_bytes // per_keyword))
+    for start in range(0, keywords, block):
+        stop = min(start + block, keywords)
+        if method == "fft":
+            cross = spectrum_x[start:stop, None, :] * spectrum_y[None, :, :]  # (block x M x F)
+            products = np.fft.irfft(cross, n=size, axis=-1)[..., positions]  # (block x M x lags)
+            products = np.moveaxis(products, -1, 0)
+        else:
+            products = np.empty((len(lags), stop - start, tickers))
+            for i, lag in enumerate(lags):
+                lead = x[max(-lag, 0):rows - max(lag, 0), start:stop]
+                products[i] = lead.T @ y[max(lag, 0):rows + min(lag, 0)]
+        covariance = products - sum_x[:, start:stop, None] * sum_y[:, None, :] / counts[:, None, None]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            correlation = covariance / (spread_x[:, start:stop, None] * spread_y[:, None, :])
+        out[start:stop] = np.moveaxis(correlation, 0, -1)
+    return out
+
+
+def strongest(correlation: np.ndarray, keywords: List[str], tickers: List[str], max_lag: int, rows: int,
+              top: int = 20, min_lag: int = 0) -> List[Dict[str, Any]]:
+    """
+    The `top` keyword/ticker pairs with the strongest relationship at any lag with |lag| >= `min_lag`,
+    one record per pair at its best lag. Pairs are ranked by the Fisher z-score of the correlation,
+    atanh(r) * sqrt(n - 3), so long overlaps outrank equally strong short ones.
+    """
+    lags = np.arange(-max_lag, max_lag + 1)
+    counts = rows - np.abs(lags)
+    allowed = np.abs(lags) >= min_lag
+    if not allowed.any():
+        raise ValueError(f"min_lag {min_lag} is beyond max_lag {max_lag}")
+    with np.errstate(divide="ignore", invalid="ignore"):
+        scores = np.abs(np.arctanh(np.clip(correlation.astype(np.float64), -0.999999, 0.999999)))
+        scores *= np.sqrt(np.maximum(counts - 3, 0))
+    scores[..., ~allowed] = -np.inf
+    scores = np.nan_to_num(scores, nan=-np.inf)
+    best = np.argmax(scores, axis=-1)  # (K x M)
+    best_score = np.take_along_axis(scores, best[..., None], axis=-1)[..., 0]
+
+    flat = best_score.ravel()
+    finite = np.flatnonzero(np.isfinite(flat))
+    order = finite[np.argsort(-flat[finite], kind="stable")[:top]]
+    zero = max_lag
+    records = []
+    for position in order:
+        k, m = np.unravel_index(position, best_score.shape)
+        lag = int(lags[best[k, m]])
+        records.append({
+            "keyword": keywords[k],
+            "ticker": tickers[m],
+            "lag": lag,
+            "leader": "keyword" if lag > 0 else "ticker" if lag < 0 else "neither",
+            "correlation": float(correlation[k, m, best[k, m]]),
+            "z_score": float(np.sign(correlation[k, m, best[k, m]]) * flat[position]),
+            "observations": int(counts[best[k, m]]),
+            "contemporaneous": float(correlation[k, m, zero]),
+        })
+    return records
+
+
+def align(interest: pd.DataFrame, closes: pd.DataFrame, difference: bool = True,
+          min_coverage: float = 0.5) -> Tuple[pd.DataFrame, pd.DataFrame, Dict[str, str]]:
+    """
+    Put interest and prices on the interest series' dates: each ticker's return over every interest
+    period (last close on or before one date to the next), against the change in interest over the
+    same period (or its level with `difference=False`). Tickers priced on less than `min_coverage` of
+    the dates are dropped and reported; the remaining rows must be complete for every series.
+    """
+    index = pd.DatetimeIndex(interest.index)
+    if index.tz is not None:
+        index = index.tz_convert("UTC").tz_localize(None)
+    prices = closes.copy()
+    if isinstance(prices.index, pd.DatetimeIndex) and prices.index.tz is not None:
+        prices.index = prices.index.tz_convert("UTC").tz_localize(None)
+    prices = prices.sort_index()
+    # The close in force at each interest date, not one from a later bar.
+    at_dates = prices.reindex(prices.index.union(index)).ffill().reindex(index)
+    at_dates[index < prices.index.min()] = np.nan
+    returns = at_dates.pct_change(fill_method=None)
+    signal = interest.astype(float).set_axis(index)
+    signal = signal.diff() if difference else signal
+
+    coverage = returns.notna().mean()
+    dropped = {ticker: f"prices cover only {share:.0%} of the interest dates"
+               for ticker, share in coverage.items() if share < min_coverage}
+    returns = returns.drop(columns=list(dropped))
+    complete = signal.notna().all(axis=1) & returns.notna().all(axis=1)
+    return signal[complete], returns[complete], dropped
+
+
+_TRENDS_UNITS = {"y": "y", "m": "mo", "d": "d"}
+
+
+def price_window(timeframe: str, now: Optional[pd.Timestamp] = None) -> Tuple[str, str]:
+    """
+    The (period, interval) of prices covering a Google Trends timeframe: "today 5-y" -> ("5y", "1d"),
+    "today 3-m" -> ("3mo", "1d"), "now 7-d" -> ("7d", "1h"), "all" -> ("max", "1d"), and
+    "YYYY-MM-DD YYYY-MM-DD" -> enough days back to reach the start date.
+    """
+    timeframe = timeframe.strip()
+    if timeframe == "all":
+        return "max", "1d"
+    match = re.fullmatch(r"(today|now) (\d+)-([ymdH])", timeframe)
+    if match:
+        kind, count, unit = match.groups()
+        if unit == "H":
+            return "1d", "5m"
+        if kind == "now":
+            return f"{count}d", "1h"
+        return f"{count}{_TRENDS_UNITS[unit]}", "1d"
+    dates = timeframe.split()
+    if len(dates) == 2:
+        now = now if now is not None else pd.Timestamp.now()
+        days = (now.normalize() - pd.Timestamp(dates[0])).days + 7
+        return f"{max(days, 1)}d", "1d"
+    raise ValueError(f"Unsupported Trends timeframe: {timeframe!r}")
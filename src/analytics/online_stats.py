@@ -0,0 +1,139 @@
+import os
+import tempfile
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Mean and covariance of daily returns over date blocks, for universes whose full float64 returns
+# frame (and pandas' copies of it) would not fit in memory. Only the n x n co-moment matrix and one
+# block of rows are held at a time; prices themselves can live in a memory-mapped file.
+
+MB = 1024 * 1024
+
+
+class OnlineCovariance:
+    """
+    Running mean and co-moment of the rows seen so far, updated a block of rows at a time with the
+    block form of Welford's update: M2 += (B - mean_old)^T (B - mean_new). Accumulates in float64
+    whatever the block dtype.
+    """
+
+    def __init__(self, n_columns: int):
+        self.count = 0
+        self.mean = np.zeros(n_columns)
+        self.comoment = np.zeros((n_columns, n_columns))
+        self._product = np.empty((n_columns, n_columns))
+
+    def update(self, block: np.ndarray):
+        """Add a (rows x columns) block. Rows holding a NaN must already have been removed."""
+        rows = block.shape[0]
+        if rows == 0:
+            return
+        block = np.asarray(block, dtype=np.float64)
+        total = self.count + rows
+        before = block - self.mean
+        new_mean = self.mean + before.sum(axis=0) / total
+        np.matmul(before.T, block - new_mean, out=self._product)
+        self.comoment += self._product
+        self.mean = new_mean
+        self.count = total
+
+    def covariance(self, ddof: int = 1) -> np.ndarray:
+        if self.count <= ddof:
+            return np.full(self.comoment.shape, np.nan)
+        # The block update is exact but not symmetric in floating point; average out the rounding.
+        cov = self.comoment + self.comoment.T
+        cov /= 2 * (self.count - ddof)
+        return cov
+
+    def correlation(self) -> np.ndarray:
+        corr = self.covariance()
+        std = np.sqrt(np.diag(corr).copy())
+        with np.errstate(divide="ignore", invalid="ignore"):
+            corr /= std[:, None]
+            corr /= std[None, :]
+        np.fill_diagonal(corr, 1.0)
+        corr[np.isnan(std), :] = np.nan
+        corr[:, np.isnan(std)] = np.nan
+        return corr
+
+
+def accumulator_bytes(n_columns: int) -> int:
+    """Memory the co-moment matrix, its block product and the returned covariance take."""
+    return 3 * n_columns * n_columns * 8
+
+
+def block_rows(n_columns: int, memory_limit_mb: Optional[float], default: int = 256) -> int:
+    """
+    Rows per block so one block's float64 working copies (about four of them) fit in whatever the
+    memory limit leaves after the accumulators.
+    """
+    if not memory_limit_mb:
+        return default
+    spare = memory_limit_mb * MB - accumulator_bytes(n_columns)
+    if spare <= 0:
+        raise ValueError(
+            f"A memory limit of {memory_limit_mb} MB is too small for {n_columns} assets: their covariance "
+            f"alone needs {accumulator_bytes(n_columns) / MB:.0f} MB"
+        )
+    return max(2, int(spare // (4 * 8 * max(n_columns, 1))))
+
+
+def iter_return_blocks(prices: np.ndarray, rows: int) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+    """
+    Simple returns of a (dates x assets) price array, `rows` dates at a time, keeping only dates on
+    which every asset has a return (pandas' pct_change().dropna()). Yields the kept row positions
+    and their returns.
+    """
+    for start in range(1, prices.shape[0], rows):
+        stop = min(start + rows, prices.shape[0])
+        window = np.asarray(prices[start - 1:stop], dtype=np.float64)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            returns = window[1:] / window[:-1] - 1
+        keep = ~np.isnan(returns).any(axis=1)
+        yield start + np.flatnonzero(keep), returns[keep]
+
+
+def return_moments(prices: np.ndarray, memory_limit_mb: Optional[float] = None) -> OnlineCovariance:
+    """Stream a (dates x assets) price array through OnlineCovariance in memory-bounded date blocks."""
+    moments = OnlineCovariance(prices.shape[1])
+    for _, block in iter_return_blocks(prices, block_rows(prices.shape[1], memory_limit_mb)):
+        moments.update(block)
+    return moments
+
+
+def weighted_returns(prices: np.ndarray, index: pd.DatetimeIndex, weights: np.ndarray,
+                     memory_limit_mb: Optional[float] = None) -> pd.Series:
+    """Daily returns of a portfolio rebalanced to `weights`, on the dates every asset has a return."""
+    positions, returns = [], []
+    for rows, block in iter_return_blocks(prices, block_rows(prices.shape[1], memory_limit_mb)):
+        positions.append(rows)
+        returns.append(block @ weights)
+    if not positions:
+        return pd.Series([], index=index[:0], dtype=float)
+    return pd.Series(np.concatenate(returns), index=index[np.concatenate(positions)])
+
+
+def aligned_prices(series: Dict[str, pd.Series], columns: List[str], dtype=np.float64,
+                   memory_limit_mb: Optional[float] = None) -> Tuple[pd.DatetimeIndex, np.ndarray]:
+    """
+    Align per-ticker price series on the union of their dates into one (dates x tickers) array of
+    `dtype`, NaN where a ticker has no price. When the array would take more than half the memory
+    limit it is backed by a temporary file (np.memmap) instead of RAM.
+    """
+    index = pd.DatetimeIndex([])
+    for ticker in columns:
+        index = index.union(series[ticker].index)
+    shape = (len(index), len(columns))
+    size = shape[0] * shape[1] * np.dtype(dtype).itemsize
+    if memory_limit_mb and size > memory_limit_mb * MB / 2:
+        file = tempfile.NamedTemporaryFile(prefix="zenith-prices-", suffix=".dat", delete=False)
+        file.close()
+        values = np.memmap(file.name, dtype=dtype, mode="w+", shape=shape)
+        os.unlink(file.name)  # The mapping keeps the data reachable; the file goes once it is released.
+    else:
+        values = np.empty(shape, dtype=dtype)
+    for j, ticker in enumerate(columns):
+        values[:, j] = series[ticker].reindex(index).to_numpy(dtype=dtype, na_value=np.nan)
+    return index, values
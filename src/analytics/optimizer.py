@@ -0,0 +1,125 @@
+import numpy as np
+from scipy.optimize import minimize
+from typing import Any, Dict, Optional
+
+from src.analytics.indicators import TRADING_DAYS
+
+OBJECTIVES = ("min_variance", "max_sharpe", "target_return")
+
+
+class PortfolioOptimizer:
+    """
+    Mean-variance optimizer over annualized expected returns and covariance.
+
+    Weights always sum to 1. `long_only` bounds each weight below at 0 (otherwise at -max_weight)
+    and `max_weight` caps each weight's absolute size.
+    """
+
+    def __init__(self, mean_returns: np.ndarray, cov_matrix: np.ndarray, risk_free_rate: float = 0.0,
+                 long_only: bool = True, max_weight: float = 1.0, annualization: float = TRADING_DAYS):
+        self.mean = np.asarray(mean_returns, dtype=float) * annualization
+        self.cov = np.asarray(cov_matrix, dtype=float) * annualization
+        self.risk_free_rate = risk_free_rate
+        self.long_only = long_only
+        self.max_weight = max_weight
+        n = len(self.mean)
+        if max_weight * n < 1:
+            raise ValueError(f"A weight cap of {max_weight} cannot be met by {n} assets summing to 1.")
+        self.bounds = [(0.0 if long_only else -max_weight, max_weight)] * n
+
+    def evaluate(self, weights: np.ndarray) -> Dict[str, float]:
+        portfolio_return = float(weights @ self.mean)
+        portfolio_volatility = float(np.sqrt(weights @ self.cov @ weights))
+        sharpe = (portfolio_return - self.risk_free_rate) / portfolio_volatility if portfolio_volatility else np.nan
+        return {"return": portfolio_return, "volatility": portfolio_volatility, "sharpe_ratio": sharpe}
+
+    def min_variance(self) -> np.ndarray:
+        return self._solve(lambda w: w @ self.cov @ w, lambda w: 2 * self.cov @ w)
+
+    def max_sharpe(self) -> np.ndarray:
+        def negative_sharpe(w):
+            return -(w @ self.mean - self.risk_free_rate) / np.sqrt(w @ self.cov @ w)
+        return self._solve(negative_sharpe)
+
+    def target_return(self, target: float) -> np.ndarray:
+        """Minimum-variance weights whose annualized expected return equals `target`."""
+        constraint = {"type": "eq", "fun": lambda w: w @ self.mean - target, "jac": lambda w: self.mean}
+        return self._solve(lambda w: w @ self.cov @ w, lambda w: 2 * self.cov @ w, [constraint])
+
+    def efficient_frontier(self, points: int = 20) -> Dict[str, np.ndarray]:
+        """
+        Trace the frontier from the minimum-variance portfolio up to the highest return reachable
+        under the weight constraints.
+        """
+        low = self.min_variance() @ self.mean
+        high = self._solve(lambda w: -(w @ self.mean), lambda w: -self.mean) @ self.mean
+        targets = np.linspace(low, high, points)
+        weights = np.array([self.target_return(target) for target in targets])
+        volatility = np.sqrt(np.einsum("pi,ij,pj->p", weights, self.cov, weights))
+        return {"returns": weights @ self.mean, "volatility": volatility, "weights": weights}
+
+    def monte_carlo(self, samples: int = 1_000_000, batch_size: int = 100_000,
+                    seed: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Evaluate random weight vectors in batches, one matrix product per batch, keeping the best
+        Sharpe and lowest volatility candidates. Long-only weights are drawn from a flat Dirichlet;
+        otherwise normalized Gaussian draws are used. Draws breaking the weight cap are discarded.
+        """
+        rng = np.random.default_rng(seed)
+        n = len(self.mean)
+        best: Dict[str, Any] = {"max_sharpe": (-np.inf, None), "min_variance": (np.inf, None)}
+        evaluated = 0
+        cloud_returns, cloud_volatility = [], []
+
+        for start in range(0, samples, batch_size):
+            size = min(batch_size, samples - start)
+            if self.long_only:
+                weights = rng.dirichlet(np.ones(n), size)
+            else:
+                weights = rng.standard_normal((size, n))
+                weights /= weights.sum(axis=1, keepdims=True)
+            weights = weights[(np.abs(weights) <= self.max_weight).all(axis=1)]
+            if not len(weights):
+                continue
+
+            returns = weights @ self.mean
+            variance = np.einsum("bi,bi->b", weights @ self.cov, weights)
+            volatility = np.sqrt(variance)
+            sharpe = (returns - self.risk_free_rate) / volatility
+            evaluated += len(weights)
+
+            i = int(np.argmax(sharpe))
+            if sharpe[i] > best["max_sharpe"][0]:
+                best["max_sharpe"] = (sharpe[i], weights[i])
+            i = int(np.argmin(variance))
+            if variance[i] < best["min_variance"][0]:
+                best["min_variance"] = (variance[i], weights[i])
+            # Keep a thin sample of the cloud for plotting rather than every draw.
+            cloud_returns.append(returns[:1000])
+            cloud_volatility.append(volatility[:1000])
+
+        if not evaluated:
+            raise ValueError("No random portfolio satisfied the weight constraints.")
+        return {
+            "evaluated": evaluated,
+            "max_sharpe": best["max_sharpe"][1],
+            "min_variance": best["min_variance"][1],
+            "sample_returns": np.concatenate(cloud_returns),
+            "sample_volatility": np.concatenate(cloud_volatility),
+        }
+
+    def _solve(self, objective, jac=None, constraints=None) -> np.ndarray:
+        n = len(self.mean)
+        budget = {"type": "eq", "fun": lambda w: w.sum() - 1, "jac": lambda w: np.ones(n)}
+        result = minimize(
+            objective,
+            np.full(n, 1 / n),
+            jac=jac,
+            method="SLSQP",
+            bounds=self.bounds,
+            constraints=[budget] + (constraints or []),
+            options={"maxiter": 500, "ftol": 1e-12},
+        )
+        if not result.success:
+            raise ValueError(f"Portfolio optimization failed: {result.message}")
+        return result.x
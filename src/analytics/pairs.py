@@ -0,0 +1,128 @@
+import numpy as np
+import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+# Asymptotic Engle-Granger critical values for two variables with a constant (MacKinnon, 2010).
+EG_CRITICAL_VALUES = {0.01: -3.90, 0.05: -3.34, 0.10: -3.04}
+
+PAIR_COLUMNS = [
+    "ticker_1", "ticker_2", "correlation", "hedge_ratio", "adf_stat", "cointegrated",
+    "half_life", "spread_zscore",
+]
+
+
+def prepare_log_prices(prices: pd.DataFrame, lookback: Optional[int] = None,
+                       max_gap: int = 5) -> Tuple[pd.DataFrame, List[str]]:
+    """
+    Trim to the trailing `lookback` rows, forward-fill gaps of up to `max_gap` bars (holiday
+    mismatches between exchanges) and drop tickers that still have missing prices, so every
+    remaining pair shares the same dates. Returns the log prices and the dropped tickers.
+    """
+    if lookback:
+        prices = prices.iloc[-lookback:]
+    filled = prices.ffill(limit=max_gap)
+    complete = filled.columns[filled.notna().all() & (filled > 0).all()]
+    dropped = [ticker for ticker in prices.columns if ticker not in complete]
+    return np.log(filled[complete]), dropped
+
+
+def correlation_candidates(returns: np.ndarray, min_correlation: float,
+                           max_candidates: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Compute the full return correlation matrix with one matrix product and keep the upper-triangle
+    pairs at or above `min_correlation`, strongest first. Returns (rows, cols, correlations).
+    """
+    centred = returns - returns.mean(axis=0)
+    scale = np.sqrt((centred ** 2).sum(axis=0))
+    scale[scale == 0] = np.nan
+    standardized = centred / scale
+    corr = standardized.T @ standardized
+
+    rows, cols = np.triu_indices(corr.shape[0], k=1)
+    values = corr[rows, cols]
+    keep = values >= min_correlation
+    rows, cols, values = rows[keep], cols[keep], values[keep]
+    order = np.argsort(-values, kind="stable")
+    if max_candidates is not None:
+        order = order[:max_candidates]
+    return rows[order], cols[order], values[order]
+
+
+def engle_granger(y: np.ndarray, x: np.ndarray, lags: int = 1) -> Dict[str, np.ndarray]:
+    """
+    Engle-Granger test for a batch of pairs. `y` and `x` are (pairs, dates) log-price arrays.
+
+    Fits y = a + b * x by OLS for every pair, then runs an augmented Dickey-Fuller regression
+    (`lags` lagged differences, no constant) on the residual spread with batched normal equations.
+    """
+    yc = y - y.mean(axis=1, keepdims=True)
+    xc = x - x.mean(axis=1, keepdims=True)
+    hedge_ratio = (xc * yc).sum(axis=1) / (xc ** 2).sum(axis=1)
+    spread = yc - hedge_ratio[:, None] * xc
+
+    diff = np.diff(spread, axis=1)
+    target = diff[:, lags:]
+    regressors = [spread[:, lags:-1]] + [diff[:, lags - i:-i] for i in range(1, lags + 1)]
+    design = np.stack(regressors, axis=1)  # (pairs, 1 + lags, observations)
+
+    xtx = design @ design.transpose(0, 2, 1)
+    xty = (design @ target[:, :, None])[:, :, 0]
+    xtx_inv = np.linalg.inv(xtx)
+    coef = (xtx_inv @ xty[:, :, None])[:, :, 0]
+    resid = target - (coef[:, None, :] @ design)[:, 0, :]
+    dof = target.shape[1] - design.shape[1]
+    sigma2 = (resid ** 2).sum(axis=1) / dof
+    gamma = coef[:, 0]
+    adf_stat = gamma / np.sqrt(sigma2 * xtx_inv[:, 0, 0])
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        half_life = np.where(gamma < 0, -np.log(2) / np.log1p(gamma), np.inf)
+    spread_std = spread.std(axis=1, ddof=1)
+    spread_zscore = spread[:, -1] / spread_std
+    return {
+        "hedge_ratio": hedge_ratio,
+        "adf_stat": adf_stat,
+        "half_life": half_life,
+        "spread_zscore": spread_zscore,
+    }
+
+
+def scan_pairs(prices: pd.DataFrame, min_correlation: float = 0.7, top_k: int = 20,
+               significance: float = 0.05, lags: int = 1, lookback: Optional[int] = None,
+               max_candidates: Optional[int] = 50000, chunk_size: int = 2000,
+               max_workers: int = 4) -> pd.DataFrame:
+    """
+    Rank the most promising pairs in a dates x tickers Close panel.
+
+    Correlation of log returns prunes the universe down to candidate pairs, which are then tested for
+    cointegration in chunks on a thread pool (the batched NumPy kernels release the GIL). Pairs are
+    ranked by their ADF statistic, most negative (most strongly mean-reverting) first.
+    """
+    if significance not in EG_CRITICAL_VALUES:
+        raise ValueError(f"Significance must be one of {sorted(EG_CRITICAL_VALUES)}")
+
+    log_prices, _ = prepare_log_prices(prices, lookback)
+    if log_prices.shape[1] < 2 or log_prices.shape[0] < lags + 3:
+        return pd.DataFrame(columns=PAIR_COLUMNS)
+
+    values = log_prices.to_numpy(dtype=float)
+    rows, cols, correlations = correlation_candidates(np.diff(values, axis=0), min_correlation, max_candidates)
+    if len(rows) == 0:
+        return pd.DataFrame(columns=PAIR_COLUMNS)
+
+    series = values.T
+    chunks = [slice(start, start + chunk_size) for start in range(0, len(rows), chunk_size)]
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        tested = list(executor.map(lambda c: engle_granger(series[rows[c]], series[cols[c]], lags), chunks))
+    stats = {key: np.concatenate([chunk[key] for chunk in tested]) for key in tested[0]}
+
+    tickers = np.asarray(log_prices.columns)
+    result = pd.DataFrame({
+        "ticker_1": tickers[rows],
+        "ticker_2": tickers[cols],
+        "correlation": correlations,
+        **stats,
+    })
+    result["cointegrated"] = result["adf_stat"] < EG_CRITICAL_VALUES[significance]
+    return result.sort_values("adf_stat", kind="stable").head(top_k)[PAIR_COLUMNS].reset_index(drop=True)
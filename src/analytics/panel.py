@@ -0,0 +1,194 @@
+import numpy as np
+import pandas as pd
+from typing import Dict, Iterable, Optional
+
+from src.analytics.indicators import TRADING_DAYS
+
+# Indicator functions over a 2-D (dates x tickers) float array. A NaN marks a date on which a ticker
+# has no price (not yet listed, delisted or missing), and any window touching a NaN yields NaN, which
+# matches pandas' rolling semantics on each column separately.
+
+
+def _window_sum(values: np.ndarray, window: int) -> np.ndarray:
+    """Trailing sum over `window` rows, with the first window - 1 rows left as NaN."""
+    out = np.full(values.shape, np.nan)
+    if window <= 0 or values.shape[0] < window:
+        return out
+    csum = np.cumsum(np.concatenate([np.zeros((1,) + values.shape[1:]), values]), axis=0)
+    out[window - 1:] = csum[window:] - csum[:-window]
+    return out
+
+
+def _full_windows(values: np.ndarray, window: int) -> np.ndarray:
+    return _window_sum((~np.isnan(values)).astype(float), window) == window
+
+
+def rolling_mean(values: np.ndarray, window: int) -> np.ndarray:
+    """Column-wise trailing mean; NaN unless the whole window holds prices."""
+    out = _window_sum(np.nan_to_num(values), window) / window
+    out[~_full_windows(values, window)] = np.nan
+    return out
+
+
+def rolling_std(values: np.ndarray, window: int, ddof: int = 1) -> np.ndarray:
+    """Column-wise trailing sample standard deviation; NaN unless the whole window holds prices."""
+    if window <= ddof:
+        return np.full(values.shape, np.nan)
+    with np.errstate(invalid="ignore"):
+        # Centre each column first so the sum-of-squares difference doesn't lose precision.
+        centred = np.nan_to_num(values - np.nanmean(values, axis=0))
+    total = _window_sum(centred, window)
+    total_sq = _window_sum(centred ** 2, window)
+    var = (total_sq - total ** 2 / window) / (window - ddof)
+    out = np.sqrt(np.maximum(var, 0.0))
+    out[~_full_windows(values, window)] = np.nan
+    return out
+
+
+def shift(values: np.ndarray, periods: int = 1) -> np.ndarray:
+    """Shift rows down by `periods`, filling the top with NaN."""
+    out = np.full(values.shape, np.nan)
+    if periods < values.shape[0]:
+        out[periods:] = values[:values.shape[0] - periods]
+    return out
+
+
+def log_returns(values: np.ndarray) -> np.ndarray:
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.log(values / shift(values))
+
+
+def volatility(values: np.ndarray, window: int, annualization: float = TRADING_DAYS) -> np.ndarray:
+    """Annualized rolling standard deviation of log returns."""
+    return rolling_std(log_returns(values), window) * np.sqrt(annualization)
+
+
+def zscore(values: np.ndarray, window: int) -> np.ndarray:
+    """Distance of each price from its rolling mean, in rolling standard deviations."""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return (values - rolling_mean(values, window)) / rolling_std(values, window)
+
+
+def momentum(values: np.ndarray, periods: int = 10) -> np.ndarray:
+    """Absolute price change over `periods` rows."""
+    return values - shift(values, periods)
+
+
+def rate_of_change(values: np.ndarray, periods: int = 10) -> np.ndarray:
+    """Fractional price change over `periods` rows."""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return values / shift(values, periods) - 1
+
+
+def _gains_losses(values: np.ndarray, zero_first_move: bool):
+    delta = values - shift(values)
+    if zero_first_move:
+        # A ticker's first bar has no previous close; pandas' SMA RSI counts it as a zero move.
+        delta[np.isnan(delta) & ~np.isnan(values)] = 0.0
+    missing = np.isnan(delta)
+    gains = np.where(delta > 0, delta, 0.0)
+    losses = np.where(delta < 0, -delta, 0.0)
+    gains[missing] = np.nan
+    losses[missing] = np.nan
+    return gains, losses
+
+
+def rsi(values: np.ndarray, period: int = 14, method: str = "sma") -> np.ndarray:
+    """
+    Relative strength index per column, from simple ("sma") or Wilder-smoothed ("wilder") average
+    gains and losses.
+    """
+    gains, losses = _gains_losses(values, zero_first_move=method == "sma")
+    if method == "sma":
+        avg_gain = rolling_mean(gains, period)
+        avg_loss = rolling_mean(losses, period)
+    elif method == "wilder":
+        avg_gain, avg_loss = _wilder(gains, losses, period)
+    else:
+        raise ValueError(f"Unknown RSI method: {method}")
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return 100 - (100 / (1 + avg_gain / avg_loss))
+
+
+def _wilder(gains: np.ndarray, losses: np.ndarray, period: int):
+    """
+    Wilder smoothing, seeded per column with the simple average of its first `period` moves so each
+    ticker starts from its own listing date. Missing rows carry the previous average forward.
+    """
+    rows, cols = gains.shape
+    avg_gain = np.full(gains.shape, np.nan)
+    avg_loss = np.full(gains.shape, np.nan)
+    sum_gain = np.zeros(cols)
+    sum_loss = np.zeros(cols)
+    count = np.zeros(cols, dtype=int)
+    state_gain = np.full(cols, np.nan)
+    state_loss = np.full(cols, np.nan)
+    for row in range(rows):
+        valid = ~np.isnan(gains[row])
+        seeding = valid & (count < period)
+        sum_gain[seeding] += gains[row, seeding]
+        sum_loss[seeding] += losses[row, seeding]
+        count[seeding] += 1
+        seeded = seeding & (count == period)
+        state_gain[seeded] = sum_gain[seeded] / period
+        state_loss[seeded] = sum_loss[seeded] / period
+        smoothing = valid & ~seeding
+        state_gain[smoothing] = (state_gain[smoothing] * (period - 1) + gains[row, smoothing]) / period
+        state_loss[smoothing] = (state_loss[smoothing] * (period - 1) + losses[row, smoothing]) / period
+        ready = valid & (count >= period)
+        avg_gain[row, ready] = state_gain[ready]
+        avg_loss[row, ready] = state_loss[ready]
+    return avg_gain, avg_loss
+
+
+def last_valid_rows(values: np.ndarray) -> np.ndarray:
+    """Row index of the last non-NaN value in every column, or -1 for all-NaN columns."""
+    valid = ~np.isnan(values)
+    rows = values.shape[0] - 1 - np.argmax(valid[::-1], axis=0)
+    rows[~valid.any(axis=0)] = -1
+    return rows
+
+
+PANEL_INDICATORS = ("ma_short", "ma_long", "rsi", "volatility", "zscore", "momentum", "rate_of_change")
+
+
+def compute_panel(prices: pd.DataFrame, indicators: Optional[Iterable[str]] = None,
+                  short_window: int = 20, long_window: int = 50, rsi_period: int = 14,
+                  rsi_method: str = "sma", volatility_period: int = 20, zscore_window: int = 20,
+                  momentum_period: int = 10, annualization: float = TRADING_DAYS) -> Dict[str, pd.DataFrame]:
+    """
+    Compute indicators over a dates x tickers price frame in one shot, returning one frame per indicator.
+    """
+    names = list(indicators) if indicators is not None else list(PANEL_INDICATORS)
+    unknown = [name for name in names if name not in PANEL_INDICATORS]
+    if unknown:
+        raise ValueError(f"Unknown indicators: {unknown}")
+
+    values = prices.to_numpy(dtype=float)
+    builders = {
+        "ma_short": lambda: rolling_mean(values, short_window),
+        "ma_long": lambda: rolling_mean(values, long_window),
+        "rsi": lambda: rsi(values, rsi_period, rsi_method),
+        "volatility": lambda: volatility(values, volatility_period, annualization),
+        "zscore": lambda: zscore(values, zscore_window),
+        "momentum": lambda: momentum(values, momentum_period),
+        "rate_of_change": lambda: rate_of_change(values, momentum_period),
+    }
+    return {
+        name: pd.DataFrame(builders[name](), index=prices.index, columns=prices.columns) for name in names
+    }
+
+
+def latest(panel: Dict[str, pd.DataFrame], prices: pd.DataFrame) -> pd.DataFrame:
+    """
+    Collapse per-indicator panels into a tickers x indicators frame, read at each ticker's last priced
+    date so tickers whose history ends early still report their final values.
+    """
+    rows = last_valid_rows(prices.to_numpy(dtype=float))
+    columns = np.arange(len(prices.columns))
+    out = {}
+    for name, frame in panel.items():
+        values = frame.to_numpy(dtype=float)[rows, columns]
+        values[rows < 0] = np.nan
+        out[name] = values
+    return pd.DataFrame(out, index=prices.columns)
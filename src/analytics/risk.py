@@ -0,0 +1,206 @@
+from concurrent.futures import ProcessPoolExecutor
+from statistics import NormalDist
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Value at Risk and Conditional VaR (expected shortfall) of a portfolio. Both are reported as positive
+# fractions of portfolio value lost over a horizon in trading days: VaR is the loss exceeded with
+# probability 1 - confidence, CVaR the average loss beyond it.
+
+DEFAULT_CONFIDENCES = (0.95, 0.99)
+DEFAULT_HORIZONS = (1, 10)
+PATHS_PER_CHUNK = 50_000  # Paths simulated per block; results don't depend on how chunks are spread over processes
+
+
+def tail_losses(returns: np.ndarray, confidences: Sequence[float]) -> Tuple[np.ndarray, np.ndarray]:
+    """VaR and CVaR at each confidence level of a sample of returns (positive numbers are losses)."""
+    losses = -np.asarray(returns, dtype=np.float64)
+    losses = losses[~np.isnan(losses)]
+    if not len(losses):
+        nan = np.full(len(confidences), np.nan)
+        return nan, nan
+    var = np.quantile(losses, confidences)
+    cvar = np.array([losses[losses >= v].mean() for v in var])
+    return var, cvar
+
+
+def horizon_returns(returns: np.ndarray, horizon: int) -> np.ndarray:
+    """Compounded returns over every overlapping `horizon`-day window of a daily return series."""
+    growth = np.concatenate([[0.0], np.cumsum(np.log1p(np.asarray(returns, dtype=np.float64)))])
+    if len(growth) <= horizon:
+        return np.array([])
+    return np.expm1(growth[horizon:] - growth[:-horizon])
+
+
+def _records(method: str, confidences: Sequence[float], horizon: int, var: np.ndarray,
+             cvar: np.ndarray) -> List[Dict[str, Any]]:
+    return [{"method": method, "confidence": c, "horizon": horizon, "var": float(v), "cvar": float(cv)}
+            for c, v, cv in zip(confidences, var, cvar)]
+
+
+def historical_var(returns: np.ndarray, confidences: Sequence[float] = DEFAULT_CONFIDENCES,
+                   horizons: Sequence[int] = DEFAULT_HORIZONS) -> List[Dict[str, Any]]:
+    """VaR/CVaR from the empirical distribution of overlapping historical horizon returns."""
+    records = []
+    for horizon in horizons:
+        records += _records("historical", confidences, horizon,
+                            *tail_losses(horizon_returns(returns, horizon), confidences))
+    return records
+
+
+def parametric_var(mean: float, volatility: float, confidences: Sequence[float] = DEFAULT_CONFIDENCES,
+                   horizons: Sequence[int] = DEFAULT_HORIZONS) -> List[Dict[str, Any]]:
+    """
+    Normal (variance-covariance) VaR/CVaR from the daily mean and volatility of portfolio returns,
+    scaled to each horizon by h and sqrt(h).
+    """
+    normal = NormalDist()
+    records = []
+    for horizon in horizons:
+        mu, sigma = mean * horizon, volatility * np.sqrt(horizon)
+        z = np.array([normal.inv_cdf(1 - c) for c in confidences])
+        density = np.array([normal.pdf(value) for value in z])
+        var = -(mu + z * sigma)
+        cvar = -(mu - sigma * density / (1 - np.asarray(confidences)))
+        records += _records("parametric", confidences, horizon, var, cvar)
+    return records
+
+
+def cholesky(cov: np.ndarray) -> np.ndarray:
+    """Lower Cholesky factor, nudging the diagonal when the sample covariance is only semi-definite."""
+    cov = np.asarray(cov, dtype=np.float64)
+    jitter = 0.0
+    scale = max(float(np.mean(np.diag(cov))), np.finfo(float).tiny)
+    for _ in range(8):
+        try:
+            return np.linalg.cholesky(cov + jitter * np.eye(len(cov)))
+        except np.linalg.LinAlgError:
+            jitter = scale * 1e-10 if jitter == 0 else jitter * 10
+    raise ValueError("Covariance matrix is not positive semi-definite.")
+
+
+def _simulate_chunk(drift: np.ndarray, factor: np.ndarray, weights: np.ndarray, horizons: Sequence[int],
+                    paths: int, seed: np.random.SeedSequence) -> np.ndarray:
+    """Portfolio returns of `paths` simulated paths at each horizon, as a (paths x horizons) array."""
+    rng = np.random.default_rng(seed)
+    half = (paths + 1) // 2
+    shocks = rng.standard_normal((half, len(drift)), dtype=np.float32)
+    # Antithetic pairs: each draw is also used negated, halving the draws and the Cholesky products.
+    # One product per block then serves every horizon.
+    correlated = shocks @ factor.T
+    growth = np.empty_like(correlated)
+    out = np.empty((2 * half, len(horizons)))
+    for k, horizon in enumerate(horizons):
+        for sign, rows in ((1, slice(0, half)), (-1, slice(half, 2 * half))):
+            np.multiply(correlated, np.float32(sign * np.sqrt(horizon)), out=growth)
+            growth += drift * np.float32(horizon)
+            np.exp(growth, out=growth)
+            out[rows, k] = growth @ weights - weights.sum()
+    return out[:paths]
+
+
+def simulate_returns(mean: np.ndarray, cov: np.ndarray, weights: np.ndarray,
+                     horizons: Sequence[int] = DEFAULT_HORIZONS, paths: int = 100_000,
+                     seed: Optional[int] = None, processes: Optional[int] = None) -> np.ndarray:
+    """
+    Simulate buy-and-hold portfolio returns over each horizon: asset log returns are drawn as
+    multivariate normal with the given daily covariance and a drift matching the daily mean simple
+    returns, via the Cholesky factor of `cov`, in float32 blocks of PATHS_PER_CHUNK paths made of
+    antithetic pairs. With `processes` > 1 the blocks are spread over a process pool; each block has
+    its own seed, so the result for a given seed is the same however many processes run it.
+    """
+    cov = np.asarray(cov, dtype=np.float64)
+    drift = (np.asarray(mean, dtype=np.float64) - np.diag(cov) / 2).astype(np.float32)
+    factor = cholesky(cov).astype(np.float32)
+    weights = np.asarray(weights, dtype=np.float32)
+    sizes = [min(PATHS_PER_CHUNK, paths - start) for start in range(0, paths, PATHS_PER_CHUNK)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    args = [(drift, factor, weights, list(horizons), size, chunk_seed) for size, chunk_seed in zip(sizes, seeds)]
+
+    if processes and processes > 1 and len(sizes) > 1:
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            chunks = list(executor.map(_simulate_chunk, *zip(*args)))
+    else:
+        chunks = [_simulate_chunk(*arg) for arg in args]
+    return np.concatenate(chunks) if chunks else np.empty((0, len(horizons)))
+
+
+def monte_carlo_var(mean: np.ndarray, cov: np.ndarray, weights: np.ndarray,
+                    confidences: Sequence[float] = DEFAULT_CONFIDENCES, horizons: Sequence[int] = DEFAULT_HORIZONS,
+                    paths: int = 100_000, seed: Optional[int] = None,
+                    processes: Optional[int] = None) -> List[Dict[str, Any]]:
+    """VaR/CVaR of simulated buy-and-hold portfolio returns (see `simulate_returns`)."""
+    simulated = simulate_returns(mean, cov, weights, horizons, paths, seed=seed, processes=processes)
+    records = []
+    for k, horizon in enumerate(horizons):
+        records += _records("monte_carlo", confidences, horizon, *tail_losses(simulated[:, k], confidences))
+    return records
+
+
+def drawdown_stats(returns: pd.Series) -> Dict[str, Any]:
+    """
+    Drawdowns of the value of $1 compounded at the daily portfolio returns: the deepest one with
+    its peak, trough and recovery dates, the longest time spent below a previous peak, and the
+    drawdown at the last date.
+    """
+    if returns.empty:
+        raise ValueError("No returns to compute drawdowns from.")
+    value = np.cumprod(1 + returns.to_numpy(dtype=np.float64))
+    peak = np.maximum.accumulate(np.maximum(value, 1.0))
+    drawdown = value / peak - 1
+    trough = int(np.argmin(drawdown))
+    start = int(np.argmax(value[:trough + 1])) if value[:trough + 1].max() >= 1 else -1
+    recovered = np.flatnonzero(value[trough:] >= peak[trough])
+    index = returns.index
+
+    # Longest run of consecutive days below the running peak.
+    underwater = np.r_[False, drawdown < 0, False]
+    edges = np.flatnonzero(np.diff(underwater.astype(np.int8)))
+    longest = int((edges[1::2] - edges[::2]).max()) if len(edges) else 0
+
+    return {
+        "max_drawdown": float(-drawdown[trough]),
+        "peak": index[start].isoformat() if start >= 0 else None,
+        "trough": index[trough].isoformat(),
+        "recovery": index[trough + recovered[0]].isoformat() if len(recovered) else None,
+        "longest_drawdown_days": longest,
+        "current_drawdown": float(-drawdown[-1]),
+        "average_drawdown": float(-drawdown[drawdown < 0].mean()) if (drawdown < 0).any() else 0.0,
+    }
+
+
+def stress_test(cov: np.ndarray, tickers: List[str], weights: np.ndarray, scenarios: Dict[str, Dict[str, float]],
+                propagate: bool = True) -> Dict[str, Dict[str, Any]]:
+    """
+    Portfolio return under user-defined shocks, e.g. {"tech selloff": {"AAPL": -0.2, "MSFT": -0.15}}.
+    A "*" entry shocks every ticker not named. With `propagate`, tickers a scenario leaves unshocked
+    move by their expected return given the shocked ones (cov_us cov_ss^-1 shocks); otherwise by 0.
+    """
+    cov = np.asarray(cov, dtype=np.float64)
+    positions = {ticker.strip().upper(): i for i, ticker in enumerate(tickers)}
+    results = {}
+    for name, shocks in scenarios.items():
+        unknown = [ticker for ticker in shocks if ticker != "*" and ticker.strip().upper() not in positions]
+        if unknown:
+            raise ValueError(f"Scenario {name!r} shocks tickers outside the portfolio: {unknown}")
+        applied = np.full(len(tickers), float(shocks.get("*", np.nan)))
+        for ticker, shock in shocks.items():
+            if ticker != "*":
+                applied[positions[ticker.strip().upper()]] = float(shock)
+        shocked = ~np.isnan(applied)
+        if not shocked.any():
+            raise ValueError(f"Scenario {name!r} has no shocks.")
+        if (~shocked).any():
+            if propagate:
+                inner = cov[np.ix_(shocked, shocked)]
+                beta = cov[np.ix_(~shocked, shocked)] @ np.linalg.pinv(inner)
+                applied[~shocked] = beta @ applied[shocked]
+            else:
+                applied[~shocked] = 0.0
+        results[name] = {
+            "portfolio_return": float(applied @ weights),
+            "shocks": dict(zip(tickers, np.round(applied, 6).tolist())),
+        }
+    return results
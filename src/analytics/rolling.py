@@ -0,0 +1,160 @@
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.analytics.indicators import TRADING_DAYS
+from src.analytics.panel import _full_windows, _window_sum
+
+# Rolling portfolio statistics updated as the window slides rather than recomputed per window: sums
+# over each window come from cumulative sums, and the rolling co-moment matrix gains the rows entering
+# the window and loses the rows leaving it, so each step costs O(assets^2) whatever the window length.
+
+METRICS = ("return", "volatility", "sharpe", "beta")
+DEFAULT_WINDOWS = (60, 120, 252)
+RESYNC_ROWS = 252  # Rows of rank updates between exact recomputations, to bound floating-point drift
+
+
+class RollingResult:
+    """
+    Rolling statistics as one (windows x dates x names) array, NaN until a window has filled.
+    """
+
+    def __init__(self, values: np.ndarray, dates: pd.DatetimeIndex, windows: Sequence[int], names: Sequence[str]):
+        self.values = values
+        self.dates = dates
+        self.windows = list(windows)
+        self.names = list(names)
+
+    def frame(self, window: int) -> pd.DataFrame:
+        """The dates x names table for one window length."""
+        return pd.DataFrame(self.values[self.windows.index(window)], index=self.dates, columns=self.names)
+
+    def latest(self) -> Dict[int, Dict[str, float]]:
+        """The last value of every statistic for each window."""
+        if not len(self.dates):
+            return {window: {} for window in self.windows}
+        return {window: dict(zip(self.names, self.values[i, -1].tolist())) for i, window in enumerate(self.windows)}
+
+    def records(self):
+        """
+        One {"date": ..., "60d": {<name>: value}, ...} record per date, from the first date the shortest
+        window has filled, for streaming output.
+        """
+        start = min(self.windows) - 1 if self.windows else len(self.dates)
+        for t in range(start, len(self.dates)):
+            record = {"date": self.dates[t]}
+            for i, window in enumerate(self.windows):
+                record[f"{window}d"] = dict(zip(self.names, self.values[i, t].tolist()))
+            yield record
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"windows": self.windows, "names": self.names, "latest": self.latest()}
+
+
+def _window_moments(x: np.ndarray, y: np.ndarray, window: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Windowed mean of x and y, sample variance of x and covariance of x with y, via cumulative sums;
+    NaN unless the whole window holds both x and y.
+    """
+    full = _full_windows(x, window) & _full_windows(y, window)
+    with np.errstate(invalid="ignore"):
+        # Centre first so the sum-of-products differences don't lose precision; zero the gaps so one
+        # NaN only blanks the windows that contain it.
+        mx, my = np.nanmean(np.where(np.isnan(y), np.nan, x)), np.nanmean(np.where(np.isnan(x), np.nan, y))
+    x, y = np.nan_to_num(x - mx), np.nan_to_num(y - my)
+    sx, sy = _window_sum(x, window), _window_sum(y, window)
+    sxx, sxy = _window_sum(x * x, window), _window_sum(x * y, window)
+    var = np.maximum((sxx - sx * sx / window) / (window - 1), 0.0)
+    cov = (sxy - sx * sy / window) / (window - 1)
+    moments = sx / window + mx, sy / window + my, var, cov
+    for moment in moments:
+        moment[~full] = np.nan
+    return moments
+
+
+def rolling_metrics(returns: pd.Series, windows: Sequence[int] = DEFAULT_WINDOWS,
+                    benchmark: Optional[pd.Series] = None, risk_free_rate: float = 0.0,
+                    annualization: float = TRADING_DAYS) -> RollingResult:
+    """
+    Rolling annualized return, volatility and Sharpe ratio of daily portfolio returns for each window
+    length, and the beta against `benchmark` returns (aligned on the same dates) when given. A window
+    touching a NaN, e.g. a date the benchmark didn't trade, yields NaN.
+    """
+    p = returns.to_numpy(dtype=np.float64)
+    b = benchmark.reindex(returns.index).to_numpy(dtype=np.float64) if benchmark is not None else np.full(len(p), np.nan)
+    values = np.full((len(windows), len(p), len(METRICS)), np.nan)
+    excess = risk_free_rate / annualization
+    for i, window in enumerate(windows):
+        if window < 2:
+            raise ValueError(f"Rolling windows need at least 2 returns, got {window}")
+        mean, _, var, _ = _window_moments(p, p, window)
+        std = np.sqrt(var)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            values[i, :, 0] = mean * annualization
+            values[i, :, 1] = std * np.sqrt(annualization)
+            values[i, :, 2] = (mean - excess) / std * np.sqrt(annualization)
+            if benchmark is not None:
+                _, _, bench_var, covariance = _window_moments(b, p, window)
+                values[i, :, 3] = covariance / bench_var
+    return RollingResult(values, returns.index, windows, METRICS)
+
+
+def window_count(rows: int, window: int, step: int = 1) -> int:
+    """How many `window`-row windows `rolling_correlation` emits over `rows` rows, one every `step`."""
+    return max(0, (rows - window) // step + 1)
+
+
+def rolling_correlation(returns: np.ndarray, window: int, step: int = 1, dtype=np.float32,
+                        out: Optional[np.ndarray] = None, resync: int = RESYNC_ROWS) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Correlation matrix of a (dates x assets) array of returns (no NaNs) over every `window` rows,
+    emitted every `step` rows up to the last. Returns the row position each window ends on and a (windows x assets x
+    assets) array of `dtype`; pass `out` (e.g. a memory-mapped .npy from np.lib.format.open_memmap)
+    to write straight to disk.
+
+    The window's mean and co-moment matrix are kept and updated with the rows entering and leaving
+    it in one rank-(2 `step` + 2) product per window, and recomputed exactly every `resync` rows.
+    """
+    rows, n = returns.shape
+    if window < 2 or rows < window:
+        raise ValueError(f"Need at least {max(window, 2)} rows of returns for a {window}-row window, got {rows}")
+    if step < 1:
+        raise ValueError("step must be at least 1")
+    ends = np.arange(rows, window - 1, -step)[::-1]  # Aligned so the last window ends on the last row
+    if out is None:
+        out = np.empty((len(ends), n, n), dtype=dtype)
+    elif out.shape != (len(ends), n, n):
+        raise ValueError(f"out must have shape {(len(ends), n, n)}, got {out.shape}")
+
+    x = np.asarray(returns, dtype=np.float64)
+    x = x - x.mean(axis=0)
+    mean = comoment = None
+    last = since = 0
+    update = np.empty((n, n))
+    for k, end in enumerate(ends):
+        if comoment is None or end - last >= window or since + end - last > resync:
+            block = x[end - window:end]
+            mean = block.mean(axis=0)
+            centred = block - mean
+            comoment, since = centred.T @ centred, 0
+        elif end > last:
+            # Sliding a fixed-size window: C' = C + E^T E - L^T L - w (m' m'^T - m m^T) for the rows
+            # entering (E) and leaving (L) and the window mean before (m) and after (m'), as one product.
+            entering, leaving = x[last:end], x[last - window:end - window]
+            new_mean = mean + (entering.sum(axis=0) - leaving.sum(axis=0)) / window
+            left = np.vstack([entering, leaving, mean, new_mean])
+            right = np.vstack([entering, -leaving, window * mean, -window * new_mean])
+            np.matmul(left.T, right, out=update)
+            comoment += update
+            mean = new_mean
+            since += end - last
+        last = end
+
+        scale = np.sqrt(np.maximum(np.diag(comoment), 0.0))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            scale = np.where(scale > 0, 1 / scale, np.nan)
+        np.multiply(comoment, scale[:, None], out=update)
+        np.multiply(update, scale[None, :], out=out[k], casting="same_kind")
+    return ends - 1, out
+
@@ -0,0 +1,154 @@
+import ast
+import hashlib
+import json
+import os
+import time
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.analytics import panel
+from src.models.trading_signals import SignalType
+
+# Indicator screening: each ticker's latest indicator values and the signal conditions they meet, as
+# one tickers x columns table. Filters and top-k rankings are whole-column operations on the table,
+# and tables are saved per universe and date so repeated screens with new filters skip the prices.
+
+DEFAULT_SCREEN_DIR = os.path.join(os.path.expanduser("~"), ".cache", "zenith", "screens")
+DEFAULT_MAX_AGE = 30 * 24 * 60 * 60  # Seconds a saved table is kept on disk
+
+DEFAULT_THRESHOLDS = {"rsi_low": 30.0, "rsi_high": 70.0, "high_volatility": 0.4, "z_threshold": 2.0}
+
+# The syntax a screen expression may use. DataFrame.eval would also resolve attributes, calls and
+# @-references to Python objects, which a daemon client must not reach.
+EXPRESSION_NODES = (
+    ast.Expression, ast.BoolOp, ast.And, ast.Or, ast.UnaryOp, ast.Not, ast.USub, ast.UAdd, ast.Invert,
+    ast.BinOp, ast.Add, ast.Sub, ast.Mult, ast.Div, ast.FloorDiv, ast.Mod, ast.Pow, ast.BitAnd, ast.BitOr,
+    ast.Compare, ast.Eq, ast.NotEq, ast.Lt, ast.LtE, ast.Gt, ast.GtE, ast.Name, ast.Load, ast.Constant,
+)
+
+
+def signal_conditions(table: pd.DataFrame, thresholds: Dict[str, float]) -> Dict[SignalType, np.ndarray]:
+    """
+    The condition behind each signal the market and quant agents raise, evaluated on every row. A
+    ticker is flagged while the condition holds, not only on the bar where it starts.
+    """
+    with np.errstate(invalid="ignore"):
+        return {
+            SignalType.MA_CROSSOVER_BULLISH: (table["ma_short"] > table["ma_long"]).to_numpy(),
+            SignalType.MA_CROSSOVER_BEARISH: (table["ma_short"] < table["ma_long"]).to_numpy(),
+            SignalType.RSI_OVERSOLD: (table["rsi"] < thresholds["rsi_low"]).to_numpy(),
+            SignalType.RSI_OVERBOUGHT: (table["rsi"] > thresholds["rsi_high"]).to_numpy(),
+            SignalType.HIGH_VOLATILITY: (table["volatility"] > thresholds["high_volatility"]).to_numpy(),
+            SignalType.ZSCORE_OVERSOLD: (table["zscore"] < -thresholds["z_threshold"]).to_numpy(),
+            SignalType.ZSCORE_OVERBOUGHT: (table["zscore"] > thresholds["z_threshold"]).to_numpy(),
+            SignalType.MOMENTUM_BULLISH: (table["momentum"] > 0).to_numpy(),
+            SignalType.MOMENTUM_BEARISH: (table["momentum"] < 0).to_numpy(),
+        }
+
+
+def build_table(prices: pd.DataFrame, params: Optional[Dict[str, Any]] = None,
+                thresholds: Optional[Dict[str, float]] = None) -> pd.DataFrame:
+    """
+    Indicator table of a dates x tickers Close panel: one row per ticker with its last priced date,
+    close, every panel indicator (computed with `params`, see panel.compute_panel) and a boolean
+    column per signal condition, named after the SignalType value (e.g. "rsi_oversold").
+    """
+    thresholds = {**DEFAULT_THRESHOLDS, **(thresholds or {})}
+    computed = panel.compute_panel(prices, panel.PANEL_INDICATORS, **(params or {}))
+    table = panel.latest(computed, prices)
+    rows = panel.last_valid_rows(prices.to_numpy(dtype=float))
+    priced = rows >= 0
+    table.insert(0, "date", pd.Series(prices.index[np.maximum(rows, 0)], index=table.index).where(priced))
+    table.insert(1, "close", np.where(priced, prices.to_numpy(dtype=float)[np.maximum(rows, 0), np.arange(len(rows))], np.nan))
+    for signal_type, condition in signal_conditions(table, thresholds).items():
+        table[signal_type.value] = condition
+    table.index.name = "ticker"
+    return table
+
+
+def check_expression(where: str, columns) -> None:
+    """
+    Raise ValueError unless `where` only uses the given column names, numeric and boolean constants,
+    comparisons, and/or/not and arithmetic.
+    """
+    try:
+        tree = ast.parse(where, mode="eval")
+    except SyntaxError as e:
+        raise ValueError(f"Invalid screen expression {where!r}: {e.msg}") from e
+    allowed = set(columns)
+    for node in ast.walk(tree):
+        if not isinstance(node, EXPRESSION_NODES):
+            raise ValueError(f"Screen expressions can't use {type(node).__name__} nodes: {where!r}")
+        if isinstance(node, ast.Name) and node.id not in allowed:
+            raise ValueError(f"Unknown column {node.id!r} in {where!r}; choose from {list(columns)}")
+        if isinstance(node, ast.Constant) and not isinstance(node.value, (bool, int, float)):
+            raise ValueError(f"Screen expressions only take numbers and true/false, got {node.value!r}")
+
+
+def screen(table: pd.DataFrame, where: Optional[str] = None, rank_by: Optional[str] = None,
+           top: Optional[int] = None, ascending: bool = False) -> pd.DataFrame:
+    """
+    Rows of an indicator table matching `where`, a column expression such as
+    "rsi < 30 and volatility > 0.4" or "rsi_oversold and not high_volatility", evaluated over whole
+    columns (DataFrame.eval) once `check_expression` has accepted it. With `rank_by` the matches are ordered by that column (largest first
+    unless `ascending`) and `top` keeps the first k; rows where the ranking column is NaN are dropped.
+    """
+    result = table
+    if where:
+        check_expression(where, table.columns)
+        try:
+            mask = table.eval(where)
+        except Exception as e:
+            raise ValueError(f"Invalid screen expression {where!r}: {e}") from e
+        if not isinstance(mask, pd.Series) or mask.dtype != bool:
+            raise ValueError(f"Screen expression {where!r} must evaluate to true/false per ticker")
+        result = table[mask.to_numpy()]
+    if rank_by:
+        if rank_by not in table.columns:
+            raise ValueError(f"Unknown column {rank_by!r}; choose from {list(table.columns)}")
+        ranked = result[rank_by].dropna().astype(float)
+        if top:
+            ranked = ranked.nsmallest(top) if ascending else ranked.nlargest(top)
+        else:
+            ranked = ranked.sort_values(ascending=ascending, kind="stable")
+        result = result.loc[ranked.index]
+    elif top:
+        result = result.head(top)
+    return result
+
+
+def table_path(directory: str, tickers: List[str], period: str, interval: str, params: Dict[str, Any],
+               date: str) -> str:
+    """Where the table for this universe, timeframe, indicator parameters and date is saved."""
+    universe = sorted({ticker.strip().upper() for ticker in tickers})
+    digest = hashlib.sha1(json.dumps([universe, period, interval, params], sort_keys=True).encode()).hexdigest()
+    return os.path.join(directory, f"{date}-{period}-{interval}-{digest[:16]}.parquet")
+
+
+def load_table(path: str, max_age: Optional[float] = None) -> Optional[pd.DataFrame]:
+    """A saved table, or None when there is none or it is older than `max_age` seconds."""
+    try:
+        if max_age is not None and time.time() - os.path.getmtime(path) > max_age:
+            return None
+        return pd.read_parquet(path)
+    except OSError:
+        return None
+
+
+def save_table(table: pd.DataFrame, path: str, max_age: float = DEFAULT_MAX_AGE):
+    """Save a table (atomically) and remove saved tables older than `max_age` seconds."""
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    partial = f"{path}.{os.getpid()}.tmp"
+    table.to_parquet(partial)
+    os.replace(partial, path)
+    cutoff = time.time() - max_age
+    for name in os.listdir(directory):
+        old = os.path.join(directory, name)
+        try:
+            if name.endswith(".parquet") and os.path.getmtime(old) < cutoff:
+                os.remove(old)
+        except OSError:
+            pass
@@ -0,0 +1,231 @@
+import math
+from collections import deque
+from numbers import Real
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from src.analytics.indicators import TRADING_DAYS
+from src.models.trading_signals import SignalType
+
+
+class RollingWindow:
+    """
+    Fixed-size window with a running sum and sum of squares, so mean and variance update in O(1).
+    The sums are rebuilt from the window every `window` pushes to stop floating-point drift.
+    """
+
+    def __init__(self, window: int):
+        if window <= 0:
+            raise ValueError("Window must be positive.")
+        self.window = window
+        self.values: deque = deque(maxlen=window)
+        self.total = 0.0
+        self.total_sq = 0.0
+        self._pushes = 0
+
+    def push(self, value: float):
+        if len(self.values) == self.window:
+            old = self.values[0]
+            self.total -= old
+            self.total_sq -= old * old
+        self.values.append(value)
+        self.total += value
+        self.total_sq += value * value
+        self._pushes += 1
+        if self._pushes % self.window == 0:
+            self.total = math.fsum(self.values)
+            self.total_sq = math.fsum(v * v for v in self.values)
+
+    @property
+    def full(self) -> bool:
+        return len(self.values) == self.window
+
+    def mean(self) -> float:
+        return self.total / self.window if self.full else math.nan
+
+    def std(self, ddof: int = 1) -> float:
+        if not self.full or self.window <= ddof:
+            return math.nan
+        var = (self.total_sq - self.total * self.total / self.window) / (self.window - ddof)
+        return math.sqrt(max(var, 0.0))
+
+
+class StreamingIndicator:
+    """
+    Base class for indicators that are seeded once from history and then updated one close at a time.
+    """
+
+    value: float = math.nan
+
+    def seed(self, closes: Iterable[float]) -> float:
+        for close in closes:
+            self.update(close)
+        return self.value
+
+    def update(self, close: float) -> float:
+        raise NotImplementedError
+
+
+class StreamingSMA(StreamingIndicator):
+    def __init__(self, window: int):
+        self.window = RollingWindow(window)
+
+    def update(self, close: float) -> float:
+        self.window.push(close)
+        self.value = self.window.mean()
+        return self.value
+
+
+class StreamingRSI(StreamingIndicator):
+    """
+    RSI from simple ("sma", as in MarketDataAnalyst.analyze_rsi) or Wilder-smoothed average gains and losses.
+    """
+
+    def __init__(self, period: int = 14, method: str = "sma"):
+        if method not in ("sma", "wilder"):
+            raise ValueError(f"Unknown RSI method: {method}")
+        self.period = period
+        self.method = method
+        self.gains = RollingWindow(period)
+        self.losses = RollingWindow(period)
+        self.avg_gain = math.nan
+        self.avg_loss = math.nan
+        self.previous: Optional[float] = None
+
+    def update(self, close: float) -> float:
+        delta = 0.0 if self.previous is None else close - self.previous
+        first = self.previous is None
+        self.previous = close
+        gain, loss = max(delta, 0.0), max(-delta, 0.0)
+
+        if self.method == "sma":
+            self.gains.push(gain)
+            self.losses.push(loss)
+            self.avg_gain, self.avg_loss = self.gains.mean(), self.losses.mean()
+        elif first:
+            return self.value
+        elif not self.gains.full:
+            self.gains.push(gain)
+            self.losses.push(loss)
+            self.avg_gain, self.avg_loss = self.gains.mean(), self.losses.mean()
+        else:
+            self.avg_gain = (self.avg_gain * (self.period - 1) + gain) / self.period
+            self.avg_loss = (self.avg_loss * (self.period - 1) + loss) / self.period
+
+        if math.isnan(self.avg_gain):
+            self.value = math.nan
+        elif self.avg_loss == 0:
+            self.value = 100.0 if self.avg_gain > 0 else math.nan
+        else:
+            self.value = 100 - 100 / (1 + self.avg_gain / self.avg_loss)
+        return self.value
+
+
+class StreamingVolatility(StreamingIndicator):
+    """Annualized rolling standard deviation of log returns."""
+
+    def __init__(self, period: int = 20, annualization: float = TRADING_DAYS):
+        self.returns = RollingWindow(period)
+        self.scale = math.sqrt(annualization)
+        self.previous: Optional[float] = None
+
+    def update(self, close: float) -> float:
+        if self.previous is not None:
+            self.returns.push(math.log(close / self.previous))
+            self.value = self.returns.std() * self.scale
+        self.previous = close
+        return self.value
+
+
+class StreamingZScore(StreamingIndicator):
+    """Distance of the latest close from its rolling mean, in rolling standard deviations."""
+
+    def __init__(self, window: int = 20):
+        self.window = RollingWindow(window)
+        self.mean = math.nan
+        self.std = math.nan
+
+    def update(self, close: float) -> float:
+        self.window.push(close)
+        self.mean, self.std = self.window.mean(), self.window.std()
+        self.value = (close - self.mean) / self.std if self.std else math.nan
+        return self.value
+
+
+class StreamingMomentum(StreamingIndicator):
+    """Absolute price change over the last `periods` closes."""
+
+    def __init__(self, periods: int = 10):
+        self.closes: deque = deque(maxlen=periods + 1)
+
+    def update(self, close: float) -> float:
+        self.closes.append(close)
+        self.value = close - self.closes[0] if len(self.closes) == self.closes.maxlen else math.nan
+        return self.value
+
+
+def bar_close(bar: Any) -> Tuple[Any, float]:
+    """
+    Split a bar into (timestamp, close). Accepts a bare close, a (timestamp, close) pair, or a
+    mapping/Series with a "Close" field (its `name` or "timestamp" field is used as the timestamp).
+    """
+    if isinstance(bar, Real):
+        return None, float(bar)
+    if isinstance(bar, tuple) and len(bar) == 2:
+        return bar[0], float(bar[1])
+    timestamp = getattr(bar, "name", None)
+    if hasattr(bar, "get") and bar.get("timestamp") is not None:
+        timestamp = bar.get("timestamp")
+    return timestamp, float(bar["Close"])
+
+
+class SignalRule:
+    """
+    Emits `below` when a watched value moves under `low` and `above` when it moves over `high`, once
+    per entry rather than on every bar. With low == high == 0 this detects sign changes, e.g. a short
+    MA crossing a long MA.
+    """
+
+    def __init__(self, source: Callable[[Dict[str, float]], float], low: float, high: float,
+                 below: Optional[SignalType] = None, above: Optional[SignalType] = None):
+        self.source = source
+        self.low = low
+        self.high = high
+        self.below = below
+        self.above = above
+        self.state: Optional[int] = None
+        self.value = math.nan  # The watched value at the last check
+
+    def check(self, values: Dict[str, float]) -> Optional[SignalType]:
+        value = self.value = self.source(values)
+        if math.isnan(value):
+            return None
+        state = -1 if value < self.low else 1 if value > self.high else 0
+        previous, self.state = self.state, state
+        if previous is None or state == previous:
+            return None
+        return self.below if state == -1 else self.above if state == 1 else None
+
+
+class StreamMonitor:
+    """
+    A named set of streaming indicators plus the signal rules evaluated after every close.
+    """
+
+    def __init__(self, indicators: Dict[str, StreamingIndicator], rules: List[SignalRule]):
+        self.indicators = indicators
+        self.rules = rules
+        self.triggered: List[Tuple[SignalType, float]] = []
+
+    def seed(self, closes: Iterable[float]) -> Dict[str, float]:
+        """Warm up from history; rules track state but signals raised while seeding are dropped."""
+        values: Dict[str, float] = {name: indicator.value for name, indicator in self.indicators.items()}
+        for close in closes:
+            values, _ = self.update(close)
+        return values
+
+    def update(self, close: float) -> Tuple[Dict[str, float], List[SignalType]]:
+        values = {name: indicator.update(close) for name, indicator in self.indicators.items()}
+        fired = [(rule.check(values), rule) for rule in self.rules]
+        # The watched value behind each signal, e.g. the RSI reading for an RSI signal.
+        self.triggered = [(signal, rule.value) for signal, rule in fired if signal is not None]
+        return values, [signal for signal, _ in self.triggered]
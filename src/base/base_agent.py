@@ -1,7 +1,13 @@
 # src/agents/base_agent.py
 import logging
-from typing import Dict, Any
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, List
 import pandas as pd  # Ensure pandas is properly imported 
+from src.core.profiling import METRICS
+from src.models.signal_store import SignalRow, SignalStore, to_ns
+from src.models.trading_signals import SignalType
 
 class BaseAgent:
     def __init__(self, name: str, config_path: str):
@@ -9,6 +15,10 @@ class BaseAgent:
         self.config_path = config_path
         self.state = "initialized"
         self.last_update = None
+        self.stages: Dict[str, Dict[str, Any]] = {}
+        self.signals = SignalStore(max_rows=1_000_000)
+        self._running = 0
+        self._stage_lock = threading.Lock()
         self.config = self.load_config()
         
         # Set up logging
@@ -29,18 +39,68 @@ class BaseAgent:
                 return False
         return True
 
-    def create_signal(self, signal_type: str, data: Dict[str, Any]) -> Dict[str, Any]:
-        """Create a structured signal."""
-        return {
-            "type": signal_type,
-            "data": data,
-            "timestamp": pd.Timestamp.now()
-        }
+    def record_signal(self, ticker: str, signal_type: SignalType, value: float, timestamp: Any = None):
+        """Append a signal to the agent's columnar signal store (timestamp defaults to now)."""
+        self.signals.append(ticker, signal_type, value, timestamp)
+        return self.signals.latest(1)[0]
+
+    def _record_triggered(self, ticker: str, monitor: Any, timestamp: Any = None) -> List[SignalRow]:
+        """Store the signals a StreamMonitor raised on its last update and return row views of them."""
+        if not monitor.triggered:
+            return []
+        signal_types, values = zip(*monitor.triggered)
+        self.signals.extend([ticker] * len(signal_types), signal_types, values, to_ns(timestamp))
+        return list(self.signals.latest(len(signal_types)))
+
+    @contextmanager
+    def stage(self, name: str):
+        """
+        Record one step of work (fetching, computing, ...) under `name`: its state and how long it took.
+        Stages may run concurrently from different threads; the agent is "running" while any is.
+        """
+        record = {"state": "running", "started": pd.Timestamp.now(), "seconds": None}
+        with self._stage_lock:
+            self.stages[name] = record
+            self._running += 1
+            self.state = "running"
+        start = time.perf_counter()
+        try:
+            yield record
+            record["state"] = "done"
+        except Exception as e:
+            record["state"] = "failed"
+            record["error"] = str(e)
+            METRICS.increment("stage_failures_total", agent=self.name, stage=name)
+            raise
+        finally:
+            record["seconds"] = round(time.perf_counter() - start, 6)
+            METRICS.observe("stage_seconds", record["seconds"], agent=self.name, stage=name)
+            with self._stage_lock:
+                self._running -= 1
+                failed = any(stage["state"] == "failed" for stage in self.stages.values())
+                if not self._running:
+                    self.state = "failed" if failed else "ready"
+                self.last_update = pd.Timestamp.now()
+
+    def span(self, kind: str, ticker: Any = None, **labels: Any):
+        """
+        Time a fetch, compute, render or output step of this agent, optionally for one ticker, in the
+        shared metrics registry. A no-op unless profiling is enabled.
+        """
+        return METRICS.span(kind, ticker, agent=self.name, **labels)
+
+    def run_stage(self, name: str, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """Call `fn` inside a recorded stage; handy for handing a stage to an executor."""
+        with self.stage(name):
+            return fn(*args, **kwargs)
 
     def get_status(self) -> Dict[str, Any]:
-        """Get the status of the agent."""
+        """Get the status of the agent, including the state and duration of each stage it has run."""
+        with self._stage_lock:
+            stages = {name: dict(record) for name, record in self.stages.items()}
         return {
             "name": self.name,
             "state": self.state,
-            "last_update": self.last_update
+            "last_update": self.last_update,
+            "stages": stages,
         }
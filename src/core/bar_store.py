@@ -0,0 +1,164 @@
+import os
+import shutil
+import threading
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.core.bulk_fetch import iter_fetch
+from src.core.price_cache import PriceCache, check_series
+from src.core.providers import MARKET_TZ, get_provider, interval_minutes
+from src.core.settings import DEFAULT_CHUNK_DAYS, DEFAULT_WORKERS
+
+DEFAULT_BAR_DIR = os.path.join(os.path.expanduser("~"), ".cache", "zenith", "bars")
+
+# One fixed-width record per bar: UTC nanoseconds since the epoch, then OHLCV.
+BAR_DTYPE = np.dtype([("time", "<i8"), ("open", "<f8"), ("high", "<f8"), ("low", "<f8"),
+                      ("close", "<f8"), ("volume", "<f8")])
+COLUMNS = {"open": "Open", "high": "High", "low": "Low", "close": "Close", "volume": "Volume"}
+
+
+def to_bars(frame: pd.DataFrame) -> np.ndarray:
+    """Pack an OHLCV frame with a DatetimeIndex into a BAR_DTYPE array."""
+    index = frame.index if frame.index.tz is not None else frame.index.tz_localize(MARKET_TZ)
+    bars = np.empty(len(frame), dtype=BAR_DTYPE)
+    bars["time"] = index.tz_convert("UTC").as_unit("ns").asi8
+    for field, column in COLUMNS.items():
+        bars[field] = frame[column].to_numpy(dtype=np.float64) if column in frame else np.nan
+    return bars
+
+
+def to_frame(bars: np.ndarray) -> pd.DataFrame:
+    """An OHLCV frame indexed in exchange time, like the price cache returns, from a BAR_DTYPE array."""
+    index = pd.DatetimeIndex(bars["time"].astype("datetime64[ns]")).tz_localize("UTC").tz_convert(MARKET_TZ)
+    return pd.DataFrame({column: bars[field] for field, column in COLUMNS.items()}, index=index)
+
+
+class BarStore:
+    """
+    On-disk intraday bars as typed arrays, one .npy file per ticker, interval and trading day.
+
+    Days are read back memory-mapped, so a year of minute bars across a large universe is paged in
+    by the OS as computations walk it in chunks of days rather than loaded into pandas at once. A
+    stored day's file is only rewritten while it may still be incomplete (the last stored day
+    onwards); days before it that were never stored are backfilled.
+    """
+
+    def __init__(self, root: Optional[str] = None):
+        self.root = root or os.environ.get("ZENITH_BAR_DIR", DEFAULT_BAR_DIR)
+
+    def _dir(self, ticker: str, interval: str) -> str:
+        if interval_minutes(interval) is None:
+            raise ValueError(f"The bar store holds intraday intervals, got {interval}; use the price cache for daily bars")
+        return os.path.join(self.root, interval, check_series(ticker, interval))
+
+    def write(self, ticker: str, interval: str, frame: pd.DataFrame) -> int:
+        """Store the bars of an OHLCV frame by trading day; returns how many days were written."""
+        directory = self._dir(ticker, interval)
+        if frame.empty:
+            return 0
+        frame = frame[~frame.index.duplicated(keep="last")].sort_index()
+        bars = to_bars(frame)
+        index = frame.index if frame.index.tz is not None else frame.index.tz_localize(MARKET_TZ)
+        days = index.tz_convert(MARKET_TZ).strftime("%Y-%m-%d").to_numpy()
+        stored = self.days(ticker, interval)
+        complete = set(stored[:-1])
+        edges = np.flatnonzero(np.r_[True, days[1:] != days[:-1], True])
+
+        os.makedirs(directory, exist_ok=True)
+        written = 0
+        for start, stop in zip(edges[:-1], edges[1:]):
+            day = days[start]
+            if day in complete:
+                continue  # Complete days are never rewritten
+            path = os.path.join(directory, f"{day}.npy")
+            partial = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp.npy"
+            np.save(partial, bars[start:stop])
+            os.replace(partial, path)
+            written += 1
+        return written
+
+    def days(self, ticker: str, interval: str, start: Optional[str] = None, end: Optional[str] = None) -> List[str]:
+        """Stored trading days (YYYY-MM-DD) of a ticker between `start` and `end` inclusive, in order."""
+        try:
+            names = os.listdir(self._dir(ticker, interval))
+        except FileNotFoundError:
+            return []
+        days = sorted(name[:-len(".npy")] for name in names if name.endswith(".npy") and ".tmp" not in name)
+        return [day for day in days if (start is None or day >= start) and (end is None or day <= end)]
+
+    def load_day(self, ticker: str, interval: str, day: str) -> np.ndarray:
+        """One day of bars, memory-mapped read-only."""
+        path = os.path.join(self._dir(ticker, interval), f"{day}.npy")
+        # Every file holds a 1-D BAR_DTYPE array written by `write`, so skip np.load's header parsing
+        # (most of the cost of opening a day) and map the data after it directly.
+        with open(path, "rb") as file:
+            prefix = file.read(12)
+        if prefix[:6] != b"\x93NUMPY":
+            raise ValueError(f"Not a bar file: {path}")
+        offset = 10 + int.from_bytes(prefix[8:10], "little") if prefix[6] == 1 else 12 + int.from_bytes(prefix[8:12], "little")
+        count = (os.path.getsize(path) - offset) // BAR_DTYPE.itemsize
+        return np.memmap(path, dtype=BAR_DTYPE, mode="r", offset=offset, shape=(count,))
+
+    def iter_chunks(self, ticker: str, interval: str, chunk_days: int = DEFAULT_CHUNK_DAYS,
+                    start: Optional[str] = None, end: Optional[str] = None) -> Iterator[pd.DataFrame]:
+        """
+        The stored bars between `start` and `end` as OHLCV frames of `chunk_days` trading days each, in
+        order. Only one chunk is materialized at a time.
+        """
+        if chunk_days < 1:
+            raise ValueError("chunk_days must be at least 1")
+        days = self.days(ticker, interval, start, end)
+        if not days:
+            raise ValueError(f"No {interval} bars stored for {ticker}")
+        for first in range(0, len(days), chunk_days):
+            yield to_frame(np.concatenate([self.load_day(ticker, interval, day) for day in days[first:first + chunk_days]]))
+
+    def stats(self) -> Dict[str, Any]:
+        series = days = size = 0
+        for directory, _, names in os.walk(self.root):
+            files = [name for name in names if name.endswith(".npy")]
+            if files:
+                series += 1
+                days += len(files)
+                size += sum(os.path.getsize(os.path.join(directory, name)) for name in files)
+        return {"series": series, "days": days, "mb": round(size / 1024 ** 2, 2)}
+
+    def clear(self):
+        """Remove every stored bar."""
+        shutil.rmtree(self.root, ignore_errors=True)
+
+
+def ingest(store: BarStore, tickers: List[str], period: str = "5d", interval: str = "1m",
+           max_workers: int = DEFAULT_WORKERS,
+           cache: Optional[PriceCache] = None) -> Iterator[Tuple[str, Optional[int], Optional[str]]]:
+    """
+    Download `period` of `interval` bars for every ticker through the price cache and add them to the
+    store, yielding (ticker, days written, None) or (ticker, None, error) as each one lands.
+    """
+    if interval_minutes(interval) is None:
+        raise ValueError(f"The bar store holds intraday intervals, got {interval}")
+    for ticker, data, error in iter_fetch(tickers, period=period, interval=interval, max_workers=max_workers,
+                                          cache=cache):
+        if error is not None:
+            yield ticker, None, error
+            continue
+        try:
+            yield ticker, store.write(ticker, interval, data), None
+        except OSError as e:
+            yield ticker, None, str(e)
+
+
+_default_store: Optional[BarStore] = None
+
+
+def get_bar_store() -> BarStore:
+    """Return the process-wide bar store shared by all agents."""
+    global _default_store
+    if _default_store is None:
+        # Keep generated bars apart from live ones, like the price cache does.
+        root = os.environ.get("ZENITH_BAR_DIR", DEFAULT_BAR_DIR)
+        provider = get_provider()
+        _default_store = BarStore(root if provider.live else f"{root}-{provider.name}")
+    return _default_store
@@ -0,0 +1,114 @@
+import logging
+import random
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import pandas as pd
+
+from src.core.price_cache import PriceCache, get_price_cache
+from src.core.profiling import span
+from src.core.settings import DEFAULT_WORKERS
+
+logger = logging.getLogger("Zenith")
+
+
+class BulkFetchResult:
+    """
+    Frames downloaded by `fetch_many`, keyed by ticker, plus the error message of every ticker that failed.
+    """
+
+    def __init__(self, frames: Dict[str, pd.DataFrame], failures: Dict[str, str]):
+        self.frames = frames
+        self.failures = failures
+
+    def panel(self, field: str = "Close") -> pd.DataFrame:
+        """Align one field of every fetched ticker into a dates x tickers frame (NaN where a ticker has no bar)."""
+        if not self.frames:
+            return pd.DataFrame()
+        return pd.concat({ticker: frame[field] for ticker, frame in self.frames.items()}, axis=1).sort_index()
+
+    def __contains__(self, ticker: str) -> bool:
+        return ticker in self.frames
+
+    def __getitem__(self, ticker: str) -> pd.DataFrame:
+        return self.frames[ticker]
+
+
+def _fetch_with_retry(cache: PriceCache, ticker: str, period: str, interval: str,
+                      retries: int, backoff: float) -> pd.DataFrame:
+    for attempt in range(retries + 1):
+        try:
+            with span("fetch", ticker):
+                return cache.history(ticker, period=period, interval=interval)
+        except Exception:
+            if attempt == retries:
+                raise
+            # Exponential backoff with jitter so throttled workers don't retry in lockstep.
+            time.sleep(backoff * (2 ** attempt) * (1 + random.random()))
+
+
+def fetch_many(tickers: Iterable[str], period: str = "1y", interval: str = "1d",
+               max_workers: int = DEFAULT_WORKERS, retries: int = 2, backoff: float = 0.5,
+               cache: Optional[PriceCache] = None) -> BulkFetchResult:
+    """
+    Download many tickers concurrently through the price cache using a bounded thread pool.
+
+    Each ticker is retried with exponential backoff; tickers that still fail are reported in
+    `BulkFetchResult.failures` instead of aborting the whole batch.
+    """
+    cache = cache or get_price_cache()
+    unique: List[str] = list(dict.fromkeys(ticker.strip().upper() for ticker in tickers if ticker.strip()))
+    frames: Dict[str, pd.DataFrame] = {}
+    failures: Dict[str, str] = {}
+
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        futures = {
+            executor.submit(_fetch_with_retry, cache, ticker, period, interval, retries, backoff): ticker
+            for ticker in unique
+        }
+        for future in as_completed(futures):
+            ticker = futures[future]
+            try:
+                frames[ticker] = future.result()
+            except Exception as e:
+                failures[ticker] = str(e)
+                logger.warning(f"Failed to fetch {ticker}: {e}")
+
+    # Keep the caller's ticker order rather than completion order.
+    ordered = {ticker: frames[ticker] for ticker in unique if ticker in frames}
+    return BulkFetchResult(ordered, failures)
+
+
+def iter_fetch(tickers: Iterable[str], period: str = "1y", interval: str = "1d",
+               max_workers: int = DEFAULT_WORKERS, retries: int = 2, backoff: float = 0.5,
+               cache: Optional[PriceCache] = None) -> Iterator[Tuple[str, Optional[pd.DataFrame], Optional[str]]]:
+    """
+    Like `fetch_many`, but yields (ticker, frame, None) or (ticker, None, error) as each download
+    completes. At most twice `max_workers` downloads are in flight, so memory stays flat however
+    large the universe, as long as the caller lets go of each frame once processed.
+    """
+    cache = cache or get_price_cache()
+    pending = iter(dict.fromkeys(ticker.strip().upper() for ticker in tickers if ticker.strip()))
+    window = 2 * max(1, max_workers)
+
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        futures = {}
+
+        def submit():
+            for ticker in pending:
+                futures[executor.submit(_fetch_with_retry, cache, ticker, period, interval, retries, backoff)] = ticker
+                if len(futures) >= window:
+                    return
+
+        submit()
+        while futures:
+            done, _ = wait(futures, return_when=FIRST_COMPLETED)
+            for future in done:
+                ticker = futures.pop(future)
+                try:
+                    yield ticker, future.result(), None
+                except Exception as e:
+                    logger.warning(f"Failed to fetch {ticker}: {e}")
+                    yield ticker, None, str(e)
+            submit()
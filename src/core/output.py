@@ -0,0 +1,288 @@
+import csv
+import json
+import logging
+import math
+import os
+import sys
+from typing import Any, Dict, IO, Iterable, List, Optional, Sequence, Union
+
+logger = logging.getLogger("Zenith")
+
+# File extension -> output format. "-" writes NDJSON to stdout.
+FORMATS = {".ndjson": "ndjson", ".jsonl": "ndjson", ".json": "json", ".csv": "csv", ".parquet": "parquet"}
+
+SCHEMA_ROWS = 64  # Records buffered to settle the CSV/Parquet columns before the first write
+ROW_GROUP_SIZE = 1024  # Records per Parquet row group; bounds memory for any universe size
+# Columns CSV/Parquet always carry, whether or not the first records have them: a ticker that fails
+# after the columns are settled still gets its error written.
+KNOWN_COLUMNS = ("error",)
+
+
+def to_builtin(value: Any) -> Any:
+    """
+    Convert agent results to plain JSON-safe Python: NumPy scalars and arrays, pandas timestamps,
+    Series and frames become ints, floats, strings, lists and dicts, and NaN/inf/NaT become None.
+    """
+    if isinstance(value, dict):
+        return {str(key): to_builtin(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple, set)):
+        return [to_builtin(item) for item in value]
+    if isinstance(value, (str, bool, int)) or value is None:
+        return value
+    if isinstance(value, float):
+        return value if math.isfinite(value) else None
+    # Duck-typed so the thin client can write output without importing NumPy or pandas.
+    if hasattr(value, "to_dict"):
+        return to_builtin(value.to_dict("records") if hasattr(value, "columns") else value.to_dict())
+    if hasattr(value, "isoformat"):
+        text = value.isoformat()
+        return None if text == "NaT" else text
+    if hasattr(value, "tolist"):
+        return to_builtin(value.tolist())
+    return str(value)
+
+
+def dumps(value: Any, **kwargs) -> str:
+    """json.dumps for agent results (see `to_builtin`); always valid JSON, never NaN."""
+    return json.dumps(to_builtin(value), allow_nan=False, **kwargs)
+
+
+def flatten(record: Dict[str, Any], prefix: str = "") -> Dict[str, Any]:
+    """Nested dicts to dotted column names, e.g. {"ma": {"short": 1}} -> {"ma.short": 1}, for flat formats."""
+    flat: Dict[str, Any] = {}
+    for key, value in record.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(flatten(value, f"{name}."))
+        elif isinstance(value, list):
+            flat[name] = json.dumps(value)
+        else:
+            flat[name] = value
+    return flat
+
+
+class RecordWriter:
+    """
+    Writes result records one at a time as they are produced. Use as a context manager: the file is
+    closed (and Parquet's footer written) even when the run fails part-way, so everything written so
+    far stays readable.
+    """
+
+    def __init__(self, file: IO, close_file: bool = True):
+        self.file = file
+        self.close_file = close_file
+        self.count = 0
+
+    def write(self, record: Dict[str, Any]):
+        self._write(to_builtin(record))
+        self.count += 1
+
+    def write_many(self, records: Iterable[Dict[str, Any]]):
+        for record in records:
+            self.write(record)
+
+    def close(self):
+        if self.file is None:
+            return
+        if self.close_file:
+            self.file.close()
+        else:
+            self.file.flush()
+
+    def _write(self, record: Dict[str, Any]):
+        raise NotImplementedError
+
+    def __enter__(self) -> "RecordWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+
+class NDJSONWriter(RecordWriter):
+    """One JSON object per line, flushed as soon as it is written."""
+
+    def _write(self, record: Dict[str, Any]):
+        self.file.write(json.dumps(record, allow_nan=False) + "\n")
+        self.file.flush()
+
+
+class JSONWriter(RecordWriter):
+    """
+    A single JSON object keyed by each record's `key` field, e.g. {"AAPL": {...}, "MSFT": {...}}.
+    A tuple of fields keys by their values joined with "/", e.g. ("keyword", "ticker") gives
+    "iphone/AAPL", and leaves the fields in the record. Entries are streamed as they arrive and the
+    object is closed on exit; a key seen twice raises ValueError rather than losing a record.
+    """
+
+    def __init__(self, file: IO, key: Union[str, Sequence[str]] = "ticker", close_file: bool = True):
+        super().__init__(file, close_file)
+        self.key = key
+        self._names: set = set()
+        self.file.write("{")
+
+    def _write(self, record: Dict[str, Any]):
+        if isinstance(self.key, str):
+            record = dict(record)
+            name = str(record.pop(self.key, self.count))
+        else:
+            name = "/".join(str(record[field]) for field in self.key if record.get(field) is not None) or str(self.count)
+        if name in self._names:
+            raise ValueError(f"Duplicate .json key {name!r}; write .ndjson, .csv or .parquet to keep every record")
+        self._names.add(name)
+        separator = "," if self.count else ""
+        self.file.write(f"{separator}\n    {json.dumps(name)}: {json.dumps(record, allow_nan=False)}")
+        self.file.flush()
+
+    def close(self):
+        self.file.write("\n}\n")
+        super().close()
+
+
+class TabularWriter(RecordWriter):
+    """
+    Base for flat formats. Columns are settled from the first `schema_rows` records (in first-seen
+    order), followed by any `known_columns` they did not have; columns that first appear after that
+    are dropped with a warning.
+    """
+
+    def __init__(self, file: IO, close_file: bool = True, schema_rows: int = SCHEMA_ROWS,
+                 known_columns: Sequence[str] = KNOWN_COLUMNS):
+        super().__init__(file, close_file)
+        self.schema_rows = schema_rows
+        self.known_columns = list(known_columns)
+        self.columns: Optional[List[str]] = None
+        self._pending: List[Dict[str, Any]] = []
+        self._dropped: set = set()
+
+    def _write(self, record: Dict[str, Any]):
+        record = flatten(record)
+        if self.columns is None:
+            self._pending.append(record)
+            if len(self._pending) >= self.schema_rows:
+                self._settle()
+            return
+        self._check(record)
+        self._rows([record])
+
+    def close(self):
+        if self.columns is None and self._pending:
+            self._settle()
+        self._finish()
+        super().close()
+
+    def _settle(self):
+        seen = [column for record in self._pending for column in record]
+        self.columns = list(dict.fromkeys(seen + self.known_columns))
+        self._start()
+        pending, self._pending = self._pending, []
+        self._rows(pending)
+
+    def _check(self, record: Dict[str, Any]):
+        unknown = set(record).difference(self.columns).difference(self._dropped)
+        if unknown:
+            self._dropped.update(unknown)
+            logger.warning(f"Dropping columns not present in the first {self.schema_rows} records: {sorted(unknown)}")
+
+    def _start(self):
+        pass
+
+    def _rows(self, records: List[Dict[str, Any]]):
+        raise NotImplementedError
+
+    def _finish(self):
+        pass
+
+
+class CSVWriter(TabularWriter):
+    """CSV with a header row; nested results are flattened to dotted column names."""
+
+    def _start(self):
+        self.writer = csv.DictWriter(self.file, fieldnames=self.columns, extrasaction="ignore", restval="")
+        self.writer.writeheader()
+
+    def _rows(self, records: List[Dict[str, Any]]):
+        self.writer.writerows(records)
+        self.file.flush()
+
+
+class ParquetWriter(TabularWriter):
+    """
+    Parquet written one row group at a time. Column types come from the first records: integers are
+    widened to floats (a later record may hold a fraction) and a column that was empty or missing
+    there is stored as strings.
+    """
+
+    def __init__(self, path: str, row_group_size: int = ROW_GROUP_SIZE, schema_rows: int = SCHEMA_ROWS,
+                 known_columns: Sequence[str] = KNOWN_COLUMNS):
+        super().__init__(None, close_file=False, schema_rows=schema_rows, known_columns=known_columns)
+        self.path = path
+        self.row_group_size = row_group_size
+        self.writer = None
+        self._group: List[Dict[str, Any]] = []
+
+    def _start(self):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        inferred = pa.Table.from_pylist(self._pending).schema
+        fields = [inferred.field(column) if column in inferred.names else pa.field(column, pa.null())
+                  for column in self.columns]
+        self.schema = pa.schema([
+            pa.field(f.name, pa.string()) if pa.types.is_null(f.type)
+            else pa.field(f.name, pa.float64()) if pa.types.is_integer(f.type) else f
+            for f in fields
+        ])
+        self._strings = [f.name for f in self.schema if pa.types.is_string(f.type)]
+        self.writer = pq.ParquetWriter(self.path, self.schema)
+
+    def _rows(self, records: List[Dict[str, Any]]):
+        for record in records:
+            for column in self._strings:
+                if record.get(column) is not None and not isinstance(record[column], str):
+                    record[column] = str(record[column])
+            self._group.append(record)
+            if len(self._group) >= self.row_group_size:
+                self._flush()
+
+    def _flush(self):
+        import pyarrow as pa
+
+        if self._group:
+            self.writer.write_table(pa.Table.from_pylist(self._group, schema=self.schema))
+            self._group = []
+
+    def _finish(self):
+        if self.writer is not None:
+            self._flush()
+            self.writer.close()
+
+
+def output_format(path: str) -> str:
+    if path == "-":
+        return "ndjson"
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in FORMATS:
+        raise ValueError(f"Unsupported output format {extension or path!r}; use one of {sorted(FORMATS)} or - for stdout")
+    return FORMATS[extension]
+
+
+def open_writer(path: str, key: Union[str, Sequence[str]] = "ticker") -> RecordWriter:
+    """
+    A record writer for `path`, chosen by its extension: .ndjson/.jsonl, .json, .csv or .parquet.
+    "-" streams NDJSON to stdout. `key` names the field (or fields) .json output is keyed by.
+    """
+    fmt = output_format(path)
+    if path == "-":
+        return NDJSONWriter(sys.stdout, close_file=False)
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    if fmt == "parquet":
+        return ParquetWriter(path)
+    file = open(path, "w", newline="" if fmt == "csv" else None)
+    if fmt == "csv":
+        return CSVWriter(file)
+    if fmt == "json":
+        return JSONWriter(file, key=key)
+    return NDJSONWriter(file)
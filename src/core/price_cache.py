@@ -0,0 +1,336 @@
+import json
+import logging
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Optional, Set
+
+try:
+    import fcntl
+except ImportError:  # Windows: only the in-process lock guards the index
+    fcntl = None
+
+import pandas as pd
+
+from src.core.profiling import METRICS
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "zenith", "prices")
+DEFAULT_TTL = 6 * 60 * 60  # Seconds before a cached series is topped up again
+DEFAULT_MAX_AGE = 30 * 24 * 60 * 60  # Seconds an unused series is kept on disk
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+ACCESS_FLUSH_SECONDS = 60  # How long cache hits may go without their access times being saved
+
+# Tickers and intervals end up in file paths (and come from daemon clients), so only symbols and the
+# intervals yfinance serves are accepted.
+TICKER_PATTERN = re.compile(r"^[A-Z0-9.^=-]{1,15}$")
+INTERVALS = ("1m", "2m", "5m", "15m", "30m", "60m", "90m", "1h", "1d", "5d", "1wk", "1mo", "3mo")
+
+logger = logging.getLogger("Zenith")
+
+
+def period_start(period: str, now: Optional[pd.Timestamp] = None) -> Optional[pd.Timestamp]:
+    """
+    Translate a yfinance period string ("5d", "6mo", "1y", "ytd", "max") into a UTC start timestamp.
+    Returns None for "max".
+    """
+    now = now if now is not None else pd.Timestamp.now(tz="UTC")
+    if period == "max":
+        return None
+    if period == "ytd":
+        return pd.Timestamp(year=now.year, month=1, day=1, tz="UTC")
+    units = {"mo": "months", "y": "years", "wk": "weeks", "d": "days", "h": "hours", "m": "minutes"}
+    for suffix in ("mo", "wk", "y", "d", "h", "m"):
+        if period.endswith(suffix) and period[: -len(suffix)].isdigit():
+            return now - pd.DateOffset(**{units[suffix]: int(period[: -len(suffix)])})
+    raise ValueError(f"Unsupported period: {period}")
+
+
+def check_series(ticker: str, interval: str) -> str:
+    """The normalized (stripped, upper-case) ticker; ValueError for a malformed ticker or unknown interval."""
+    normalized = ticker.strip().upper()
+    if not TICKER_PATTERN.match(normalized) or normalized.strip(".") == "":
+        raise ValueError(f"Invalid ticker {ticker!r}")
+    if interval not in INTERVALS:
+        raise ValueError(f"Unsupported interval {interval!r}; choose from {', '.join(INTERVALS)}")
+    return normalized
+
+
+class PriceCache:
+    """
+    On-disk OHLCV store keyed by ticker and interval.
+
+    Each series lives in its own Parquet file. A small JSON index tracks when a series was last
+    refreshed and accessed, how far back it reaches and how large it is on disk, which drives
+    incremental top-ups, TTL-based eviction and the size cap. Several processes (the daemon and a
+    local CLI) can share a cache: the index is merged with the one on disk under a file lock
+    whenever it is saved, which happens when entries are written or evicted, not on every hit.
+    """
+
+    INDEX_FILE = "index.json"
+
+    def __init__(self, cache_dir: Optional[str] = None, ttl: float = DEFAULT_TTL,
+                 max_age: float = DEFAULT_MAX_AGE, max_bytes: int = DEFAULT_MAX_BYTES,
+                 fetcher: Optional[Callable[..., pd.DataFrame]] = None):
+        self.cache_dir = cache_dir or os.environ.get("ZENITH_CACHE_DIR", DEFAULT_CACHE_DIR)
+        self.ttl = ttl
+        self.max_age = max_age
+        self.max_bytes = max_bytes
+        if fetcher is None:
+            from src.core.providers import get_provider
+
+            fetcher = get_provider().history
+        self.fetcher = fetcher
+        self.hits = 0
+        self.misses = 0
+        self.top_ups = 0
+        self.evictions = 0
+        self._lock = threading.RLock()
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self._stamp = self._index_stamp()  # What the index file looked like when last read or saved
+        self._index: Dict[str, Dict[str, Any]] = self._load_index()
+        self._written: Set[str] = set()  # Keys written or evicted since the index was last saved
+        self._removed: Set[str] = set()
+        self._saved = time.time()
+
+    def history(self, ticker: str, period: str = "1y", interval: str = "1d") -> pd.DataFrame:
+        """
+        Return bars for ticker/interval covering the requested period.
+
+        Fresh entries are served straight from disk. Stale entries are topped up with only the bars
+        newer than the last cached timestamp. Entries that don't reach back far enough are refetched.
+        """
+        ticker = check_series(ticker, interval)
+        key = self._key(ticker, interval)
+        start = period_start(period)
+        now = time.time()
+
+        with self._lock:
+            entry = self._index.get(key)
+            cached = self._read(key) if entry else None
+
+        covers = cached is not None and self._covers(entry, start)
+        if covers and now - entry["refreshed"] < self.ttl:
+            self._count("hits")
+            frame = cached
+        elif covers:
+            self._count("top_ups")
+            try:
+                fresh = self.fetcher(ticker, interval, start=cached.index[-1])
+            except Exception as e:
+                logger.warning(f"Top-up failed for {ticker}, serving cached bars: {e}")
+                fresh = cached.iloc[:0]
+            frame = self._merge(cached, fresh)
+            self._write(key, frame, entry["covers_from"])
+            self._commit()
+        else:
+            self._count("misses")
+            frame = self.fetcher(ticker, interval, period=period)
+            if frame.empty:
+                raise ValueError(f"Failed to fetch data for ticker: {ticker}")
+            if cached is not None:
+                frame = self._merge(cached, frame)
+            self._write(key, frame, "max" if start is None else start.isoformat())
+            self._commit()
+
+        with self._lock:
+            if key in self._index:
+                self._index[key]["accessed"] = now
+            # Hits only move access times, which eviction can afford to see a little late.
+            if now - self._saved > ACCESS_FLUSH_SECONDS:
+                self._save_index()
+
+        return self._since(frame, start)
+
+    def stats(self) -> Dict[str, Any]:
+        """Report hit/miss counters and disk usage."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "top_ups": self.top_ups,
+                "evictions": self.evictions,
+                "entries": len(self._index),
+                "bytes": sum(entry["bytes"] for entry in self._index.values()),
+            }
+
+    def evict(self) -> int:
+        """
+        Drop series unused for longer than max_age, then least recently used ones above max_bytes.
+        Returns how many were dropped; the index is only saved when something was.
+        """
+        with self._lock:
+            removed = self._evict()
+            if removed:
+                self._save_index()
+            return removed
+
+    def _evict(self) -> int:
+        with self._lock:
+            now = time.time()
+            removed = 0
+            for key in [k for k, e in self._index.items() if now - e["accessed"] > self.max_age]:
+                self._remove(key)
+                removed += 1
+            total = sum(entry["bytes"] for entry in self._index.values())
+            for key in sorted(self._index, key=lambda k: self._index[k]["accessed"]):
+                if total <= self.max_bytes:
+                    break
+                total -= self._index[key]["bytes"]
+                self._remove(key)
+                removed += 1
+            return removed
+
+    def _commit(self):
+        """After a write: evict what no longer fits and save the index."""
+        with self._lock:
+            self._evict()
+            self._save_index()
+
+    def clear(self):
+        """Remove every cached series, including those other processes added."""
+        with self._lock:
+            for key in set(self._index) | set(self._load_index()):
+                self._remove(key)
+            self._save_index()
+
+    def _count(self, counter: str):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+        METRICS.increment("price_cache_requests_total", result=counter)
+
+    def _covers(self, entry: Dict[str, Any], start: Optional[pd.Timestamp]) -> bool:
+        if entry["covers_from"] == "max":
+            return True
+        return start is not None and pd.Timestamp(entry["covers_from"]) <= start
+
+    @staticmethod
+    def _since(frame: pd.DataFrame, start: Optional[pd.Timestamp]) -> pd.DataFrame:
+        if start is None:
+            return frame
+        start = start.tz_convert(frame.index.tz) if frame.index.tz is not None else start.tz_localize(None)
+        return frame[frame.index >= start]
+
+    @staticmethod
+    def _merge(cached: pd.DataFrame, fresh: pd.DataFrame) -> pd.DataFrame:
+        if fresh.empty:
+            return cached
+        # The last cached bar may have been partial, so the freshly downloaded copy wins.
+        frame = pd.concat([cached, fresh])
+        return frame[~frame.index.duplicated(keep="last")].sort_index()
+
+    def _key(self, ticker: str, interval: str) -> str:
+        return f"{interval}/{ticker}"
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key + ".parquet")
+
+    def _read(self, key: str) -> Optional[pd.DataFrame]:
+        try:
+            return pd.read_parquet(self._path(key))
+        except (OSError, ValueError):
+            return None
+
+    def _write(self, key: str, frame: pd.DataFrame, covers_from: str):
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        frame.to_parquet(tmp_path)
+        os.replace(tmp_path, path)
+        with self._lock:
+            self._index[key] = {
+                "refreshed": time.time(),
+                "accessed": time.time(),
+                "covers_from": covers_from,
+                "bytes": os.path.getsize(path),
+            }
+            self._written.add(key)
+            self._removed.discard(key)
+
+    def _remove(self, key: str):
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+        self._index.pop(key, None)
+        self._removed.add(key)
+        self._written.discard(key)
+        self.evictions += 1
+
+    def _load_index(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            with open(os.path.join(self.cache_dir, self.INDEX_FILE)) as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return {}
+
+    def _index_stamp(self) -> Optional[tuple]:
+        try:
+            stat = os.stat(os.path.join(self.cache_dir, self.INDEX_FILE))
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size, stat.st_ino
+
+    @contextmanager
+    def _index_lock(self):
+        """Hold the index's file lock, so processes sharing the cache save it one at a time."""
+        if fcntl is None:
+            yield
+            return
+        with open(os.path.join(self.cache_dir, self.INDEX_FILE + ".lock"), "a") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def _save_index(self):
+        """
+        Merge the index with the one on disk and save it. Entries another process added or refreshed
+        are kept, entries it evicted are dropped unless this process has written them since, and the
+        later access time wins for entries both know.
+        """
+        path = os.path.join(self.cache_dir, self.INDEX_FILE)
+        with self._lock, self._index_lock():
+            # Unchanged since our last save (the common case): skip re-reading our own index.
+            merged = dict(self._index) if self._index_stamp() == self._stamp else self._load_index()
+            for key in self._removed:
+                merged.pop(key, None)
+            for key, entry in self._index.items():
+                theirs = merged.get(key)
+                if theirs is None:
+                    # Missing on disk: ours if we just wrote it, otherwise another process evicted it.
+                    if key in self._written or os.path.exists(self._path(key)):
+                        merged[key] = entry
+                elif key in self._written or entry["refreshed"] >= theirs["refreshed"]:
+                    merged[key] = {**entry, "accessed": max(entry["accessed"], theirs["accessed"])}
+                else:
+                    theirs["accessed"] = max(entry["accessed"], theirs["accessed"])
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "w") as file:
+                file.write(json.dumps(merged))  # dumps uses the C encoder, dump does not
+            os.replace(tmp_path, path)
+            self._stamp = self._index_stamp()
+            self._index = merged
+            self._written.clear()
+            self._removed.clear()
+            self._saved = time.time()
+
+
+_default_cache: Optional[PriceCache] = None
+
+
+def get_price_cache() -> PriceCache:
+    """Return the process-wide price cache shared by all agents."""
+    global _default_cache
+    if _default_cache is None:
+        from src.core.providers import get_provider
+
+        provider = get_provider()
+        # Keep generated data out of the live cache.
+        cache_dir = os.environ.get("ZENITH_CACHE_DIR", DEFAULT_CACHE_DIR)
+        if not provider.live:
+            cache_dir = f"{cache_dir}-{provider.name}"
+        _default_cache = PriceCache(cache_dir, fetcher=provider.history)
+    return _default_cache
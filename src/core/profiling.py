@@ -0,0 +1,239 @@
+import json
+import math
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import nullcontext
+from typing import Any, Dict, List, Optional, Tuple
+
+# Kinds of work a span can time. Every agent method reports its time under one of these.
+SPAN_KINDS = ("fetch", "compute", "render", "output")
+
+# Histogram bucket upper bounds in seconds, Prometheus style (cumulative, ending at +Inf).
+BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, math.inf)
+
+PREFIX = "zenith_"
+HELP = {
+    "span_seconds": "Time spent in instrumented fetch/compute/render/output spans.",
+    "stage_seconds": "Time spent in agent stages.",
+    "stage_failures_total": "Agent stages that raised.",
+    "price_cache_requests_total": "Price cache lookups by result.",
+    "trends_requests_total": "Google Trends requests by result.",
+}
+
+LabelKey = Tuple[str, Tuple[Tuple[str, str], ...]]
+
+_NULL_SPAN = nullcontext()
+
+
+class Histogram:
+    """Count, sum, extremes and cumulative bucket counts of observed values."""
+
+    def __init__(self, buckets: Tuple[float, ...] = BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = 0.0
+
+    def observe(self, value: float):
+        self.count += 1
+        self.sum += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+        self.counts[bisect_left(self.buckets, value)] += 1
+
+    def cumulative(self) -> List[int]:
+        total, counts = 0, []
+        for count in self.counts:
+            total += count
+            counts.append(total)
+        return counts
+
+
+class Span:
+    """Times one block of work and records it in the `span_seconds` histogram on exit."""
+
+    __slots__ = ("metrics", "labels", "start", "seconds")
+
+    def __init__(self, metrics: "Metrics", labels: Dict[str, str]):
+        self.metrics = metrics
+        self.labels = labels
+        self.seconds = 0.0
+
+    def __enter__(self) -> "Span":
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.seconds = time.perf_counter() - self.start
+        if exc_type is not None:
+            self.labels["error"] = exc_type.__name__
+        self.metrics.observe("span_seconds", self.seconds, **self.labels)
+        return False
+
+
+class Metrics:
+    """
+    In-process counters and histograms, keyed by metric name and labels, exportable as Prometheus text
+    or JSON. Disabled by default: `span`, `increment` and `observe` then return straight away, so
+    instrumented code costs an attribute check per call.
+    """
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self.counters: Dict[LabelKey, float] = {}
+        self.histograms: Dict[LabelKey, Histogram] = {}
+        self._lock = threading.Lock()
+
+    def enable(self):
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def reset(self):
+        with self._lock:
+            self.counters.clear()
+            self.histograms.clear()
+
+    def span(self, kind: str, ticker: Optional[str] = None, **labels: Any):
+        """Context manager timing a `kind` of work (see SPAN_KINDS), optionally for one ticker."""
+        if not self.enabled:
+            return _NULL_SPAN
+        if kind not in SPAN_KINDS:
+            raise ValueError(f"Span kind must be one of {SPAN_KINDS}, got {kind}")
+        labels["kind"] = kind
+        if ticker is not None:
+            labels["ticker"] = ticker
+        return Span(self, {key: str(value) for key, value in labels.items()})
+
+    def increment(self, name: str, value: float = 1, **labels: Any):
+        if not self.enabled:
+            return
+        key = _key(name, labels)
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def observe(self, name: str, value: float, **labels: Any):
+        if not self.enabled:
+            return
+        key = _key(name, labels)
+        with self._lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = Histogram()
+            histogram.observe(value)
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "counters": [
+                    {"name": PREFIX + name, "labels": dict(labels), "value": value}
+                    for (name, labels), value in sorted(self.counters.items())
+                ],
+                "histograms": [
+                    {
+                        "name": PREFIX + name,
+                        "labels": dict(labels),
+                        "count": histogram.count,
+                        "sum": histogram.sum,
+                        "min": histogram.min if histogram.count else None,
+                        "max": histogram.max,
+                        "buckets": {_bound(bound): count for bound, count in zip(histogram.buckets,
+                                                                                 histogram.cumulative())},
+                    }
+                    for (name, labels), histogram in sorted(self.histograms.items())
+                ],
+            }
+
+    def to_prometheus(self) -> str:
+        """Prometheus text exposition format, e.g. for node_exporter's textfile collector."""
+        lines: List[str] = []
+        described = set()
+
+        def describe(name: str, kind: str):
+            if name not in described:
+                described.add(name)
+                lines.append(f"# HELP {PREFIX}{name} {HELP.get(name, name)}")
+                lines.append(f"# TYPE {PREFIX}{name} {kind}")
+
+        with self._lock:
+            for (name, labels), value in sorted(self.counters.items()):
+                describe(name, "counter")
+                lines.append(f"{PREFIX}{name}{_labels(labels)} {value:g}")
+            for (name, labels), histogram in sorted(self.histograms.items()):
+                describe(name, "histogram")
+                for bound, count in zip(histogram.buckets, histogram.cumulative()):
+                    lines.append(f"{PREFIX}{name}_bucket{_labels(labels + (('le', _bound(bound)),))} {count}")
+                lines.append(f"{PREFIX}{name}_sum{_labels(labels)} {histogram.sum:.6f}")
+                lines.append(f"{PREFIX}{name}_count{_labels(labels)} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+    def write(self, path: str):
+        """
+        Write every metric to `path`: JSON for a .json file, Prometheus text otherwise. The file is
+        replaced atomically so a scraper never reads a half-written export.
+        """
+        text = json.dumps(self.to_dict(), indent=2) if path.endswith(".json") else self.to_prometheus()
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w") as file:
+            file.write(text)
+        os.replace(tmp, path)
+
+    def breakdown(self, top: int = 20) -> str:
+        """
+        Plain-text timing report: seconds per agent stage, then per ticker and span kind for the
+        `top` tickers that took longest.
+        """
+        with self._lock:
+            stages = [(dict(labels), h) for (name, labels), h in self.histograms.items() if name == "stage_seconds"]
+            spans = [(dict(labels), h) for (name, labels), h in self.histograms.items() if name == "span_seconds"]
+
+        lines = [f"{'Stage':<40} {'calls':>6} {'total s':>10} {'mean s':>10} {'max s':>10}"]
+        for labels, h in sorted(stages, key=lambda item: -item[1].sum):
+            name = f"{labels.get('agent', '')}.{labels.get('stage', '')}"
+            lines.append(f"{name:<40} {h.count:>6} {h.sum:>10.4f} {h.sum / h.count:>10.4f} {h.max:>10.4f}")
+
+        totals: Dict[str, Dict[str, float]] = {}
+        for labels, h in spans:
+            row = totals.setdefault(labels.get("ticker", "(all)"), dict.fromkeys(SPAN_KINDS, 0.0))
+            row[labels["kind"]] += h.sum
+        ranked = sorted(totals.items(), key=lambda item: -sum(item[1].values()))
+        lines += ["", f"{'Ticker':<16}" + "".join(f"{kind:>10}" for kind in SPAN_KINDS) + f"{'total':>10}"]
+        for ticker, row in ranked[:top]:
+            lines.append(f"{ticker:<16}" + "".join(f"{row[kind]:>10.4f}" for kind in SPAN_KINDS)
+                         + f"{sum(row.values()):>10.4f}")
+        if len(ranked) > top:
+            lines.append(f"... {len(ranked) - top} more tickers")
+        return "\n".join(lines)
+
+
+def _key(name: str, labels: Dict[str, Any]) -> LabelKey:
+    return name, tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def _bound(bound: float) -> str:
+    return "+Inf" if math.isinf(bound) else f"{bound:g}"
+
+
+def _labels(labels: Tuple[Tuple[str, str], ...]) -> str:
+    if not labels:
+        return ""
+    escaped = (value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, value in labels)
+    return "{" + ",".join(f'{key}="{value}"' for (key, _), value in zip(labels, escaped)) + "}"
+
+
+# Shared registry. Enabled by the CLI's --profile/--metrics-file options or ZENITH_PROFILE=1.
+METRICS = Metrics(enabled=os.environ.get("ZENITH_PROFILE", "") not in ("", "0"))
+
+
+def span(kind: str, ticker: Optional[str] = None, **labels: Any):
+    """Time a block of work in the shared registry; a no-op context manager while profiling is off."""
+    if not METRICS.enabled:
+        return _NULL_SPAN
+    return METRICS.span(kind, ticker, **labels)
@@ -0,0 +1,251 @@
+import zlib
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.core import settings
+from src.core.price_cache import period_start
+
+# Bars per year by interval, used to annualize statistics and to scale synthetic drift and volatility.
+TRADING_DAYS = 252
+SESSION_MINUTES = 390
+MARKET_TZ = "America/New_York"
+
+# Synthetic series walk forward from a fixed origin per interval, so every request for the same
+# ticker sees the same bars and incremental cache top-ups line up with what was cached before.
+SYNTHETIC_ORIGINS = {"intraday": "2024-01-02", "daily": "2000-01-03"}
+
+
+class DataProvider:
+    """
+    Source of raw market data behind the price cache and the Google Trends scheduler.
+
+    `history` has the price cache fetcher signature: bars for a whole yfinance-style `period`, or
+    everything from `start` onwards. `trends_client` returns an object with pytrends' TrendReq
+    `build_payload`/`interest_over_time`/`related_queries` methods. `live` providers call remote
+    services, so their responses are cached in the main cache directories and their requests paced.
+    """
+
+    name = "base"
+    live = False
+
+    def history(self, ticker: str, interval: str, period: Optional[str] = None,
+                start: Optional[pd.Timestamp] = None) -> pd.DataFrame:
+        raise NotImplementedError
+
+    def trends_client(self) -> Any:
+        raise NotImplementedError
+
+
+class YFinanceProvider(DataProvider):
+    """Live data from Yahoo Finance and Google Trends."""
+
+    name = "yfinance"
+    live = True
+
+    def history(self, ticker: str, interval: str, period: Optional[str] = None,
+                start: Optional[pd.Timestamp] = None) -> pd.DataFrame:
+        import yfinance as yf
+
+        if start is not None:
+            return yf.Ticker(ticker).history(start=start, interval=interval)
+        return yf.Ticker(ticker).history(period=period, interval=interval)
+
+    def trends_client(self) -> Any:
+        from pytrends.request import TrendReq
+
+        return TrendReq(hl="en-US", tz=360)
+
+
+def interval_minutes(interval: str) -> Optional[int]:
+    """Bar length in minutes for intraday intervals ("5m", "1h", ...), None for daily and longer."""
+    if interval.endswith("m") and not interval.endswith("mo") and interval[:-1].isdigit():
+        return int(interval[:-1])
+    if interval.endswith("h") and interval[:-1].isdigit():
+        return 60 * int(interval[:-1])
+    return None
+
+
+def bar_index(interval: str, start: pd.Timestamp, end: pd.Timestamp) -> pd.DatetimeIndex:
+    """
+    Bar timestamps like yfinance returns them for US equities: business days (holidays ignored) at
+    midnight exchange time for daily and longer intervals, regular-session bar starts intraday.
+    """
+    minutes = interval_minutes(interval)
+    first = np.datetime64(start.tz_convert(MARKET_TZ).date(), "D")
+    last = np.datetime64(end.tz_convert(MARKET_TZ).date(), "D")
+    days = np.arange(first, last + 1)
+    days = days[np.is_busday(days)]
+    if minutes is None:
+        if interval == "5d":
+            days = days[::5]
+        elif interval in ("1wk", "1mo", "3mo"):
+            # First business day of each Monday-based week, month or quarter.
+            if interval == "1wk":
+                periods = (days.astype(int) + 3) // 7  # day 0 (1970-01-01) was a Thursday
+            else:
+                periods = days.astype("datetime64[M]").astype(int) // (3 if interval == "3mo" else 1)
+            days = days[np.r_[True, periods[1:] != periods[:-1]]] if len(days) else days
+        elif interval != "1d":
+            raise ValueError(f"Unsupported interval: {interval}")
+        return pd.DatetimeIndex(days).tz_localize(MARKET_TZ)
+
+    offsets = (np.arange(0, SESSION_MINUTES, minutes) + 9 * 60 + 30).astype("timedelta64[m]")
+    stamps = (days[:, None] + offsets[None, :]).ravel()
+    index = pd.DatetimeIndex(stamps).tz_localize(MARKET_TZ)
+    return index[(index >= start) & (index <= end)]
+
+
+BARS_PER_YEAR = {"1d": TRADING_DAYS, "5d": TRADING_DAYS / 5, "1wk": 52, "1mo": 12, "3mo": 4}
+
+
+def bars_per_year(interval: str) -> float:
+    """
+    Regular-session bars in a year of `interval` bars, the annualization factor for per-bar returns:
+    252 daily bars, 252 * 390 one-minute bars, 252 * 7 hourly bars (the last one a half hour).
+    """
+    minutes = interval_minutes(interval)
+    if minutes is not None:
+        return TRADING_DAYS * -(-SESSION_MINUTES // minutes)
+    if interval not in BARS_PER_YEAR:
+        raise ValueError(f"Unsupported interval: {interval}")
+    return BARS_PER_YEAR[interval]
+
+
+def synthetic_tickers(count: int) -> List[str]:
+    return [f"SYN{i:05d}" for i in range(count)]
+
+
+class SyntheticProvider(DataProvider):
+    """
+    Deterministic OHLCV and Google Trends data for offline runs and benchmarks.
+
+    Each ticker gets its own drift, volatility and market correlation derived from its name and `seed`;
+    returns mix a shared market factor with idiosyncratic noise so correlations look realistic.
+    Bars end at `end` (default: now) and the same ticker, interval and seed always give the same bars.
+    """
+
+    name = "synthetic"
+
+    def __init__(self, seed: int = 0, end: Optional[pd.Timestamp] = None):
+        self.seed = seed
+        if end is not None:
+            end = pd.Timestamp(end)
+            end = end.tz_localize(MARKET_TZ) if end.tz is None else end.tz_convert(MARKET_TZ)
+        self.end = end
+        self._market: Dict[str, np.ndarray] = {}
+
+    def history(self, ticker: str, interval: str, period: Optional[str] = None,
+                start: Optional[pd.Timestamp] = None) -> pd.DataFrame:
+        end = self.end if self.end is not None else pd.Timestamp.now(tz=MARKET_TZ)
+        origin_key = "intraday" if interval_minutes(interval) is not None else "daily"
+        origin = pd.Timestamp(SYNTHETIC_ORIGINS[origin_key], tz=MARKET_TZ)
+        if start is None:
+            start = period_start(period or "max", now=end.tz_convert("UTC"))
+        start = origin if start is None else max(pd.Timestamp(start), origin)
+
+        index = bar_index(interval, origin, end)
+        closes, opens, highs, lows, volumes = self._walk(ticker, interval, len(index))
+        frame = pd.DataFrame(
+            {"Open": opens, "High": highs, "Low": lows, "Close": closes, "Volume": volumes}, index=index
+        )
+        return frame[frame.index >= start]
+
+    def bulk(self, tickers: List[str], interval: str = "1d", period: str = "1y",
+             field: str = "Close") -> pd.DataFrame:
+        """One field for many tickers as a dates x tickers panel, without going through the cache."""
+        return pd.DataFrame({ticker: self.history(ticker, interval, period=period)[field] for ticker in tickers})
+
+    def trends_client(self) -> "SyntheticTrendsClient":
+        return SyntheticTrendsClient(seed=self.seed)
+
+    def _walk(self, ticker: str, interval: str, bars: int):
+        # One generator per stream, so a longer history extends each stream without reshuffling it.
+        key = zlib.crc32(ticker.encode())
+        params, shocks, gaps, upper, lower, volume = (np.random.default_rng([self.seed, key, i]) for i in range(6))
+        per_bar = 1 / bars_per_year(interval)
+        drift = params.uniform(-0.05, 0.15) * per_bar
+        volatility = params.uniform(0.15, 0.6) * np.sqrt(per_bar)
+        correlation = params.uniform(0.2, 0.8)  # with the shared market factor
+        level = params.lognormal(4, 1)
+
+        market = self._market_returns(interval, bars)
+        noise = correlation * market + np.sqrt(1 - correlation ** 2) * shocks.standard_normal(bars)
+        returns = drift + volatility * noise
+        closes = level * np.exp(np.cumsum(returns))
+        opens = np.concatenate([[level], closes[:-1]]) * np.exp(0.1 * volatility * gaps.standard_normal(bars))
+        highs = np.maximum(opens, closes) * np.exp(0.5 * volatility * np.abs(upper.standard_normal(bars)))
+        lows = np.minimum(opens, closes) * np.exp(-0.5 * volatility * np.abs(lower.standard_normal(bars)))
+        volumes = np.round(volume.lognormal(13, 0.5, bars) * (1 + 10 * np.abs(returns)))
+        return closes, opens, highs, lows, volumes
+
+    def _market_returns(self, interval: str, bars: int) -> np.ndarray:
+        cached = self._market.get(interval)
+        if cached is None or len(cached) < bars:
+            cached = np.random.default_rng([self.seed, 0]).standard_normal(max(bars, 1))
+            self._market[interval] = cached
+        return cached[:bars]
+
+
+class SyntheticTrendsClient:
+    """
+    Stands in for pytrends' TrendReq with deterministic data. Like Google Trends it answers with
+    integer 0-100 interest relative to the busiest term of each request, at most five terms at a time.
+    `fail_every` makes every n-th request fail like a throttled (HTTP 429) response.
+    """
+
+    def __init__(self, seed: int = 0, periods: int = 260, fail_every: int = 0):
+        self.seed = seed
+        self.index = pd.date_range(end=pd.Timestamp.now().normalize(), periods=periods, freq="W-SUN")
+        self.fail_every = fail_every
+        self.calls = 0
+        self.kw_list: List[str] = []
+
+    def popularity(self, keyword: str) -> np.ndarray:
+        """The underlying (unscaled) search interest for a keyword."""
+        rng = np.random.default_rng([self.seed, zlib.crc32(keyword.encode())])
+        level = rng.lognormal(3, 1)
+        return level * np.exp(np.cumsum(rng.normal(0, 0.05, len(self.index))))
+
+    def build_payload(self, kw_list, cat=0, timeframe="today 5-y", geo="", gprop=""):
+        if len(kw_list) > 5:
+            raise ValueError("The request can only contain up to 5 keywords")
+        self.kw_list = list(kw_list)
+
+    def interest_over_time(self) -> pd.DataFrame:
+        self._call()
+        raw = pd.DataFrame({keyword: self.popularity(keyword) for keyword in self.kw_list}, index=self.index)
+        data = (raw * 100 / raw.to_numpy().max()).round().astype(int)
+        data["isPartial"] = False
+        return data
+
+    def related_queries(self) -> Dict[str, Dict[str, Optional[pd.DataFrame]]]:
+        self._call()
+        return {
+            keyword: {"top": pd.DataFrame({"query": [f"{keyword} price"], "value": [100]}), "rising": None}
+            for keyword in self.kw_list
+        }
+
+    def _call(self):
+        self.calls += 1
+        if self.fail_every and self.calls % self.fail_every == 0:
+            raise RuntimeError("The request failed: Google returned a response with code 429")
+
+
+PROVIDERS = {provider.name: provider for provider in (YFinanceProvider, SyntheticProvider)}
+
+_providers: Dict[str, DataProvider] = {}
+
+
+def get_provider(name: Optional[str] = None) -> DataProvider:
+    """
+    Return the shared provider called `name`, by default the one selected by `settings.DATA_PROVIDER`
+    (ZENITH_DATA_PROVIDER, or the CLI's --provider option).
+    """
+    name = name or settings.DATA_PROVIDER
+    if name not in PROVIDERS:
+        raise ValueError(f"Unknown data provider: {name}. Choose from {sorted(PROVIDERS)}")
+    if name not in _providers:
+        _providers[name] = PROVIDERS[name]()
+    return _providers[name]
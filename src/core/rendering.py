@@ -0,0 +1,144 @@
+import hashlib
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+from src.core.profiling import span
+from src.core.settings import DEFAULT_CHART_MODE, RENDER_MODES
+
+# Chart name -> (draw function taking a Figure plus chart data, figure size in inches)
+CHARTS: Dict[str, Tuple[Callable[..., None], Tuple[float, float]]] = {}
+MAX_FILENAME = 100  # Characters kept of a chart's name, leaving room for the extension within NAME_MAX
+
+ChartJob = Tuple[str, Dict[str, Any], str]  # (chart name, chart data, file name without extension)
+
+
+def chart(name: str, figsize: Tuple[float, float]):
+    """Register a draw function under `name` so it can be rendered by name in worker processes."""
+    def decorator(fn):
+        CHARTS[name] = (fn, figsize)
+        return fn
+    return decorator
+
+
+@chart("portfolio_performance", (10, 6))
+def draw_portfolio_performance(fig, values: pd.Series, title: str = "Portfolio Performance"):
+    ax = fig.add_subplot()
+    ax.plot(values, label="Portfolio")
+    ax.set_title(title)
+    ax.set_xlabel("Date")
+    ax.set_ylabel("Normalized Value")
+    ax.legend()
+    ax.grid()
+
+
+@chart("correlation_matrix", (10, 8))
+def draw_correlation_matrix(fig, correlation_matrix: pd.DataFrame, title: str = "Correlation Matrix"):
+    import seaborn as sns
+
+    ax = fig.add_subplot()
+    sns.heatmap(correlation_matrix, annot=True, cmap="coolwarm", fmt=".2f", ax=ax)
+    ax.set_title(title)
+
+
+@chart("trends", (10, 6))
+def draw_trends(fig, data: pd.DataFrame, keywords: List[str], title: str = "Google Trends for Keywords"):
+    ax = fig.add_subplot()
+    for keyword in keywords:
+        ax.plot(data.index, data[keyword], label=keyword)
+    ax.set_title(title)
+    ax.set_xlabel("Date")
+    ax.set_ylabel("Interest over time")
+    ax.legend(title="Keywords")
+    ax.tick_params(axis="x", labelrotation=45)
+
+
+def save_chart(name: str, data: Dict[str, Any], path: str, formats: Sequence[str]) -> List[str]:
+    """
+    Draw a registered chart on a display-less Agg canvas and write it once per format.
+    Returns the written file paths.
+    """
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    draw, figsize = CHARTS[name]
+    fig = Figure(figsize=figsize)
+    FigureCanvasAgg(fig)
+    draw(fig, **data)
+    fig.tight_layout()
+    paths = []
+    for fmt in formats:
+        paths.append(f"{path}.{fmt}")
+        fig.savefig(paths[-1], format=fmt)
+    return paths
+
+
+def _save_job(job: ChartJob, output_dir: str, formats: Sequence[str]) -> List[str]:
+    name, data, filename = job
+    return save_chart(name, data, os.path.join(output_dir, filename), formats)
+
+
+def safe_filename(text: str) -> str:
+    """
+    A filesystem-safe chart name. Long names (e.g. Trends charts over dozens of keywords) are cut to
+    MAX_FILENAME characters and end in a short hash of the full name, so they stay distinct.
+    """
+    name = re.sub(r"[^A-Za-z0-9_.-]+", "_", text).strip("_") or "chart"
+    if len(name) <= MAX_FILENAME:
+        return name
+    digest = hashlib.sha1(text.encode()).hexdigest()[:10]
+    return f"{name[:MAX_FILENAME - len(digest) - 1].rstrip('_.-')}_{digest}"
+
+
+class ChartRenderer:
+    """
+    Renders registered charts either interactively ("show", blocking on plt.show()), to image files in
+    `output_dir` without a display ("file"), or not at all ("off").
+    """
+
+    def __init__(self, mode: str = DEFAULT_CHART_MODE, output_dir: str = "charts",
+                 formats: Iterable[str] = ("png",), processes: Optional[int] = None):
+        if mode not in RENDER_MODES:
+            raise ValueError(f"Chart mode must be one of {RENDER_MODES}, got {mode}")
+        self.mode = mode
+        self.output_dir = output_dir
+        self.formats = [fmt.strip().lower() for fmt in formats if fmt.strip()]
+        self.processes = processes
+
+    def render(self, name: str, data: Dict[str, Any], filename: str) -> List[str]:
+        """Render one chart; returns the written file paths (empty unless in file mode)."""
+        if self.mode == "off":
+            return []
+        with span("render", chart=name, mode=self.mode):
+            if self.mode == "show":
+                import matplotlib.pyplot as plt
+
+                draw, figsize = CHARTS[name]
+                fig = plt.figure(figsize=figsize)
+                draw(fig, **data)
+                fig.tight_layout()
+                plt.show()
+                return []
+            os.makedirs(self.output_dir, exist_ok=True)
+            return _save_job((name, data, safe_filename(filename)), self.output_dir, self.formats)
+
+    def render_many(self, jobs: List[ChartJob]) -> List[str]:
+        """
+        Render many charts. In file mode they are spread over a process pool (matplotlib drawing is
+        CPU-bound and holds the GIL); other modes fall back to rendering one at a time.
+        """
+        if self.mode != "file" or len(jobs) < 2 or self.processes == 1:
+            return [path for name, data, filename in jobs for path in self.render(name, data, filename)]
+
+        os.makedirs(self.output_dir, exist_ok=True)
+        jobs = [(name, data, safe_filename(filename)) for name, data, filename in jobs]
+        # Worker processes don't report to this process's metrics, so the pool is timed as one span.
+        with span("render", chart="pool", mode=self.mode), ProcessPoolExecutor(max_workers=self.processes) as executor:
+            written = executor.map(
+                _save_job, jobs, [self.output_dir] * len(jobs), [self.formats] * len(jobs),
+                chunksize=max(1, len(jobs) // (4 * (self.processes or os.cpu_count() or 1))),
+            )
+            return [path for paths in written for path in paths]
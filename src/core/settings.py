@@ -0,0 +1,26 @@
+import os
+
+# Defaults shared by the CLI and the agents. Kept free of third-party imports so the CLI can read
+# them without loading the scientific stack.
+
+DEFAULT_WORKERS = int(os.environ.get("ZENITH_FETCH_WORKERS", 8))
+
+RENDER_MODES = ("show", "file", "off")
+DEFAULT_CHART_MODE = os.environ.get("ZENITH_CHARTS", "show")
+
+# "yfinance" for live data or "synthetic" for deterministic generated data (see src/core/providers.py).
+DATA_PROVIDERS = ("yfinance", "synthetic")
+DATA_PROVIDER = os.environ.get("ZENITH_DATA_PROVIDER", "yfinance")
+
+# Address of a running `zenith serve` daemon ("host:port", "http://host:port" or "unix:///path/to.sock").
+# When set (ZENITH_SERVER or the CLI's --server option), commands are sent to it instead of run locally.
+SERVER = os.environ.get("ZENITH_SERVER", "")
+DEFAULT_SERVER_PORT = 8765
+DEFAULT_REFRESH = int(os.environ.get("ZENITH_REFRESH", 300))  # Seconds between the daemon's data refreshes
+
+# Memory ceiling in MB for portfolio statistics. When set, returns are streamed over date blocks and
+# prices beyond half the limit are memory-mapped (0 keeps the in-memory pandas path).
+MEMORY_LIMIT_MB = float(os.environ.get("ZENITH_MEMORY_LIMIT_MB", 0))
+
+# Trading days of intraday bars computed at a time (see src/core/bar_store.py).
+DEFAULT_CHUNK_DAYS = 20
@@ -0,0 +1,314 @@
+import threading
+import time
+from collections import OrderedDict
+from itertools import combinations
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.core.bulk_fetch import BulkFetchResult, fetch_many
+from src.core.price_cache import DEFAULT_TTL, PriceCache, get_price_cache, period_start
+from src.core.providers import MARKET_TZ, interval_minutes
+from src.core.settings import DEFAULT_WORKERS
+
+Timeframe = Tuple[str, str]  # (yfinance period, yfinance interval), e.g. ("6mo", "1wk")
+
+SESSION_OPEN = 9 * 60 + 30  # Intraday bars are aligned to the 9:30 open, like yfinance's
+
+# How far back yfinance serves each intraday interval; daily and longer bars have no limit.
+INTRADAY_LOOKBACK_DAYS = {1: 7, 60: 730, 90: 60}
+DEFAULT_INTRADAY_LOOKBACK_DAYS = 60
+
+# Bar length in minutes for ordering intervals from finest to coarsest.
+LONG_INTERVAL_MINUTES = {"1d": 1440, "5d": 5 * 1440, "1wk": 7 * 1440, "1mo": 31 * 1440, "3mo": 92 * 1440}
+
+# How each column is combined when bars are merged into coarser ones; unknown columns keep the last value.
+AGGREGATIONS = {"Open": "first", "High": "max", "Low": "min", "Close": "last", "Volume": "sum",
+                "Dividends": "sum", "Stock Splits": "max"}
+
+MAX_BASES = 4096  # Base frames kept in memory
+
+
+def bar_minutes(interval: str) -> int:
+    minutes = interval_minutes(interval)
+    if minutes is not None:
+        return minutes
+    if interval not in LONG_INTERVAL_MINUTES:
+        raise ValueError(f"Unsupported interval: {interval}")
+    return LONG_INTERVAL_MINUTES[interval]
+
+
+def can_resample(source: str, target: str) -> bool:
+    """
+    Whether `target` bars can be built from `source` bars: finer intraday bars whose length divides
+    the target's, intraday into daily and longer, daily into anything longer, and months into quarters.
+    Weeks straddle month ends, so they can't be merged into months.
+    """
+    if source == target:
+        return True
+    source_minutes, target_minutes = interval_minutes(source), interval_minutes(target)
+    if source_minutes is not None:
+        return target_minutes is None or (target_minutes > source_minutes and target_minutes % source_minutes == 0)
+    if target_minutes is not None:
+        return False
+    return (source == "1d" and target in LONG_INTERVAL_MINUTES) or (source == "1mo" and target == "3mo")
+
+
+def reaches_back(interval: str, period: str, now: Optional[pd.Timestamp] = None) -> bool:
+    """Whether the provider serves `interval` bars as far back as `period`."""
+    minutes = interval_minutes(interval)
+    if minutes is None:
+        return True
+    start = period_start(period, now)
+    if start is None:
+        return False
+    now = now if now is not None else pd.Timestamp.now(tz="UTC")
+    limit = INTRADAY_LOOKBACK_DAYS.get(minutes, DEFAULT_INTRADAY_LOOKBACK_DAYS)
+    return now - start < pd.Timedelta(days=limit - 1)  # a day's margin for the provider's own cut-off
+
+
+def widest_period(periods: Iterable[str], now: Optional[pd.Timestamp] = None) -> str:
+    now = now if now is not None else pd.Timestamp.now(tz="UTC")
+    starts = {period: period_start(period, now) for period in periods}
+    return min(starts, key=lambda period: pd.Timestamp.min.tz_localize("UTC") if starts[period] is None else starts[period])
+
+
+def plan_fetches(timeframes: Sequence[Timeframe]) -> Dict[Timeframe, List[Timeframe]]:
+    """
+    Group the requested timeframes into as few downloads as possible. Each download is keyed by its
+    (period, interval) and lists the timeframes derived from it: it uses the widest period of the
+    group at an interval fine enough to resample into every member, within the provider's lookback
+    limit for intraday bars.
+    """
+    now = pd.Timestamp.now(tz="UTC")
+    timeframes = list(dict.fromkeys(timeframes))
+
+    def serves(base: str, timeframe: Timeframe) -> bool:
+        period, interval = timeframe
+        return interval == base or (can_resample(base, interval) and reaches_back(base, period, now))
+
+    # Only a handful of distinct intervals are ever requested, so search the base sets exhaustively:
+    # fewest downloads first, then the coarsest bases (the least data to transfer and resample).
+    intervals = sorted({interval for _, interval in timeframes}, key=bar_minutes)
+    for size in range(1, len(intervals) + 1):
+        covering = [bases for bases in combinations(intervals, size)
+                    if all(any(serves(base, timeframe) for base in bases) for timeframe in timeframes)]
+        if covering:
+            bases = max(covering, key=lambda bases: sum(bar_minutes(base) for base in bases))
+            break
+
+    # Serve each timeframe from the coarsest chosen base that can, so e.g. daily bars come from a
+    # daily download rather than being rebuilt from intraday bars when both are fetched anyway.
+    assigned: Dict[str, List[Timeframe]] = {base: [] for base in bases}
+    for timeframe in timeframes:
+        assigned[max((base for base in bases if serves(base, timeframe)), key=bar_minutes)].append(timeframe)
+    return {
+        (widest_period([period for period, _ in served], now), base): served
+        for base, served in assigned.items() if served
+    }
+
+
+def _buckets(index: pd.DatetimeIndex, interval: str) -> Tuple[np.ndarray, pd.DatetimeIndex, np.ndarray]:
+    """
+    Group key per bar (non-decreasing for a sorted index), each bar's coarse-bar label, and the
+    calendar day each bar's coarse period begins on.
+    """
+    local = index.tz_convert(MARKET_TZ) if index.tz is not None else index
+    midnight = local.normalize()
+    days = (midnight.tz_localize(None) if midnight.tz is not None else midnight).to_numpy().astype("datetime64[D]")
+    day_numbers = days.astype(np.int64)
+    minutes = interval_minutes(interval)
+
+    if minutes is not None:
+        slot = (local.hour.to_numpy() * 60 + local.minute.to_numpy() - SESSION_OPEN) // minutes
+        keys = day_numbers * 10_000 + slot
+        labels = midnight + pd.to_timedelta(SESSION_OPEN + slot * minutes, unit="min")
+        return keys, labels, days
+    if interval == "1d":
+        return day_numbers, midnight, days
+    if interval == "5d":
+        keys = np.cumsum(np.r_[True, day_numbers[1:] != day_numbers[:-1]]) - 1
+        return keys // 5, midnight, days
+    if interval == "1wk":
+        weeks = (day_numbers + 3) // 7  # day 0 (1970-01-01) was a Thursday
+        return weeks, midnight, (weeks * 7 - 3).astype("datetime64[D]")
+    if interval in ("1mo", "3mo"):
+        size = 3 if interval == "3mo" else 1
+        periods = days.astype("datetime64[M]").astype(np.int64) // size
+        return periods, midnight, (periods * size).astype("datetime64[M]").astype("datetime64[D]")
+    raise ValueError(f"Unsupported interval: {interval}")
+
+
+def resample_ohlcv(frame: pd.DataFrame, interval: str, start: Optional[pd.Timestamp] = None) -> pd.DataFrame:
+    """
+    Merge bars into coarser `interval` bars: first open, highest high, lowest low, last close and
+    summed volume. Each bar is labelled like yfinance's: the session slot start for intraday bars,
+    midnight exchange time for daily bars, and the first trading day of longer bars.
+
+    With `start`, bars whose week, month or quarter began before it are dropped, so a lookback
+    window doesn't open with a partial bar.
+    """
+    if frame.empty:
+        return frame
+    keys, labels, begins = _buckets(frame.index, interval)
+    starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+    ends = np.r_[starts[1:], len(keys)] - 1
+    if start is not None:
+        first_day = np.datetime64(pd.Timestamp(start).tz_convert(MARKET_TZ).date(), "D")
+        keep = begins[starts] >= first_day
+        starts, ends = starts[keep], ends[keep]
+        if not len(starts):
+            return frame.iloc[:0]
+
+    columns = {}
+    for column in frame.columns:
+        values = frame[column].to_numpy()
+        how = AGGREGATIONS.get(column, "last")
+        if how == "first":
+            columns[column] = values[starts]
+        elif how == "max":
+            columns[column] = np.maximum.reduceat(values, starts)
+        elif how == "min":
+            columns[column] = np.minimum.reduceat(values, starts)
+        elif how == "sum":
+            columns[column] = np.add.reduceat(values, starts)
+        else:
+            columns[column] = values[ends]
+    return pd.DataFrame(columns, index=labels[starts], columns=frame.columns)
+
+
+class TimeframeData:
+    """
+    Multi-timeframe price data from as few downloads as possible.
+
+    Each ticker's bars are fetched once per base interval, over the widest period requested so far,
+    and kept in memory. Other timeframes are derived locally: shorter lookbacks are slices of the base
+    frame and coarser intervals are resampled from it, so 1d/1wk/1mo analyses over 1mo/6mo/1y windows
+    need one daily download per ticker.
+    """
+
+    def __init__(self, cache: Optional[PriceCache] = None, max_workers: int = DEFAULT_WORKERS,
+                 ttl: float = DEFAULT_TTL, max_bases: int = MAX_BASES):
+        self.cache = cache or get_price_cache()
+        self.max_workers = max_workers
+        self.ttl = ttl
+        self.max_bases = max_bases
+        self.downloads = 0
+        self.derived = 0
+        # ticker -> interval -> (period, fetched at, frame), so a lookup only sees that ticker's frames
+        self._bases: Dict[str, Dict[str, Tuple[str, float, pd.DataFrame]]] = {}
+        self._recency: "OrderedDict[Tuple[str, str], None]" = OrderedDict()  # Least recently used first
+        self._lock = threading.Lock()
+
+    def history(self, ticker: str, period: str = "1y", interval: str = "1d") -> pd.DataFrame:
+        """Bars for one ticker and timeframe, derived from a held frame when one covers it."""
+        ticker = ticker.strip().upper()
+        frame = self._derive(ticker, period, interval)
+        if frame is None:
+            self._store(ticker, period, interval, self.cache.history(ticker, period=period, interval=interval))
+            frame = self._derive(ticker, period, interval)
+        return frame
+
+    def fetch_many(self, tickers: Iterable[str], timeframes: Sequence[Timeframe]) -> Dict[Timeframe, BulkFetchResult]:
+        """
+        Bars for every ticker in every (period, interval) timeframe. Tickers are downloaded
+        concurrently once per planned base fetch (see `plan_fetches`), and only when no held frame
+        already covers them.
+        """
+        unique = list(dict.fromkeys(ticker.strip().upper() for ticker in tickers if ticker.strip()))
+        failures: Dict[str, str] = {}
+        for (period, interval), served in plan_fetches(timeframes).items():
+            missing = [ticker for ticker in unique
+                       if any(self._base(ticker, *timeframe) is None for timeframe in served)]
+            if missing:
+                fetched = fetch_many(missing, period=period, interval=interval, max_workers=self.max_workers,
+                                     cache=self.cache)
+                failures.update(fetched.failures)
+                for ticker, frame in fetched.frames.items():
+                    self._store(ticker, period, interval, frame)
+
+        results = {}
+        for period, interval in dict.fromkeys(timeframes):
+            frames = {}
+            for ticker in unique:
+                frame = self._derive(ticker, period, interval)
+                if frame is not None:
+                    frames[ticker] = frame
+            results[period, interval] = BulkFetchResult(
+                frames, {ticker: failures.get(ticker, "not fetched") for ticker in unique if ticker not in frames}
+            )
+        return results
+
+    def refresh(self) -> Dict[str, str]:
+        """Top up every held frame through the price cache; returns the tickers that failed."""
+        with self._lock:
+            groups: Dict[Timeframe, List[str]] = {}
+            for ticker, held in self._bases.items():
+                for interval, (period, _, _) in held.items():
+                    groups.setdefault((period, interval), []).append(ticker)
+        failures: Dict[str, str] = {}
+        for (period, interval), tickers in groups.items():
+            fetched = fetch_many(tickers, period=period, interval=interval, max_workers=self.max_workers,
+                                 cache=self.cache)
+            failures.update(fetched.failures)
+            for ticker, frame in fetched.frames.items():
+                self._store(ticker, period, interval, frame)
+        return failures
+
+    def stats(self) -> Dict[str, int]:
+        return {"downloads": self.downloads, "derived": self.derived, "held": len(self._recency)}
+
+    def __len__(self) -> int:
+        return len(self._recency)
+
+    def _base(self, ticker: str, period: str, interval: str) -> Optional[Tuple[str, pd.DataFrame]]:
+        """A fresh held (interval, frame) reaching back over `period` that `interval` bars can be built from."""
+        now = time.time()
+        start = period_start(period, pd.Timestamp(now, unit="s", tz="UTC"))
+        with self._lock:
+            candidates = [(base_interval, entry) for base_interval, entry in self._bases.get(ticker, {}).items()
+                          if can_resample(base_interval, interval)]
+            # Prefer the held interval closest to the one requested: less to resample.
+            for base_interval, (base_period, fetched_at, frame) in sorted(candidates, key=lambda c: -bar_minutes(c[0])):
+                # The frame reaches back over its period as of when it was fetched.
+                base_start = period_start(base_period, pd.Timestamp(fetched_at, unit="s", tz="UTC"))
+                if now - fetched_at < self.ttl and (base_start is None or (start is not None and base_start <= start)):
+                    self._recency.move_to_end((ticker, base_interval))
+                    return base_interval, frame
+        return None
+
+    def _derive(self, ticker: str, period: str, interval: str) -> Optional[pd.DataFrame]:
+        base = self._base(ticker, period, interval)
+        if base is None:
+            return None
+        base_interval, frame = base
+        start = period_start(period)
+        if base_interval != interval:
+            self.derived += 1
+            frame = resample_ohlcv(frame, interval, start)
+        return frame if start is None else frame[frame.index >= start]
+
+    def _store(self, ticker: str, period: str, interval: str, frame: pd.DataFrame):
+        with self._lock:
+            self._bases.setdefault(ticker, {})[interval] = (period, time.time(), frame)
+            self._recency[ticker, interval] = None
+            self._recency.move_to_end((ticker, interval))
+            self.downloads += 1
+            while len(self._recency) > self.max_bases:
+                (old_ticker, old_interval), _ = self._recency.popitem(last=False)
+                held = self._bases[old_ticker]
+                del held[old_interval]
+                if not held:
+                    del self._bases[old_ticker]
+
+
+_default_timeframes: Optional[TimeframeData] = None
+
+
+def get_timeframes() -> TimeframeData:
+    """Return the process-wide multi-timeframe store over the shared price cache."""
+    global _default_timeframes
+    if _default_timeframes is None:
+        _default_timeframes = TimeframeData(get_price_cache())
+    return _default_timeframes
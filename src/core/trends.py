@@ -0,0 +1,236 @@
+import hashlib
+import json
+import logging
+import os
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import pandas as pd
+
+from src.core.profiling import METRICS, span
+from src.core.providers import get_provider
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "zenith", "trends")
+DEFAULT_TTL = 60 * 60  # Seconds before a cached response is requested again
+MAX_TERMS = 5  # Google Trends compares at most five terms per request
+DEFAULT_RATE = 0.2  # Requests per second once the burst allowance is spent
+DEFAULT_BURST = 3
+
+logger = logging.getLogger("Zenith")
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket: `capacity` requests may go out back to back, after which callers are
+    paced to `rate` requests per second.
+    """
+
+    def __init__(self, rate: float = DEFAULT_RATE, capacity: int = DEFAULT_BURST,
+                 clock: Callable[[], float] = time.monotonic, sleep: Callable[[float], None] = time.sleep):
+        if rate <= 0 or capacity < 1:
+            raise ValueError("Token bucket rate must be positive and capacity at least 1.")
+        self.rate = rate
+        self.capacity = capacity
+        self.clock = clock
+        self.sleep = sleep
+        self.tokens = float(capacity)
+        self.updated = clock()
+        self.waited = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """Take one token, sleeping until one is available. Returns the time spent waiting."""
+        with self._lock:
+            now = self.clock()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            wait = max(0.0, (1 - self.tokens) / self.rate)
+            # Claim the token now (possibly going negative) so concurrent callers queue up behind us.
+            self.tokens -= 1
+        if wait:
+            self.sleep(wait)
+            self.waited += wait
+        return wait
+
+
+def keyword_batches(keywords: Sequence[str], anchor: str, size: int = MAX_TERMS) -> List[List[str]]:
+    """
+    Split keywords into requests of at most `size` terms that all include `anchor`, so every batch
+    can be rescaled against the same reference series.
+    """
+    others = [keyword for keyword in keywords if keyword != anchor]
+    step = size - 1
+    return [[anchor] + others[start:start + step] for start in range(0, len(others), step)] or [[anchor]]
+
+
+def rescale_batches(frames: List[pd.DataFrame], anchor: str) -> pd.DataFrame:
+    """
+    Put per-batch interest frames (each 0-100 relative to its own peak) on one scale using the
+    anchor column they share, then renormalize so the overall peak is 100.
+    """
+    reference = frames[0][anchor].astype(float)
+    scaled = [frames[0].astype(float)]
+    for frame in frames[1:]:
+        anchor_total = frame[anchor].astype(float).sum()
+        if anchor_total == 0:
+            raise ValueError(f"Anchor '{anchor}' has no interest in one batch; pick a more popular anchor.")
+        factor = reference.sum() / anchor_total
+        scaled.append(frame.drop(columns=[anchor]).astype(float) * factor)
+    combined = pd.concat(scaled, axis=1)
+    peak = combined.to_numpy().max()
+    return combined * (100.0 / peak) if peak > 0 else combined
+
+
+class TrendsScheduler:
+    """
+    Google Trends requests with batching, an on-disk response cache and client-side rate limiting.
+
+    Keyword lists longer than five terms are split into overlapping batches sharing an anchor term and
+    stitched onto one comparable scale. Responses are cached per (request kind, keywords, timeframe,
+    geo) for `ttl` seconds, and live requests are paced by a token bucket and retried with backoff.
+    `client` is anything with pytrends' `build_payload`/`interest_over_time`/`related_queries`.
+    """
+
+    def __init__(self, client: Any = None, cache_dir: Optional[str] = None, ttl: float = DEFAULT_TTL,
+                 bucket: Optional[TokenBucket] = None, retries: int = 3, backoff: float = 5.0):
+        provider = get_provider()
+        self._client = client
+        self._provider = provider
+        self.cache_dir = cache_dir or os.environ.get("ZENITH_TRENDS_CACHE_DIR", DEFAULT_CACHE_DIR)
+        if cache_dir is None and not provider.live:
+            # Keep generated data out of the live cache.
+            self.cache_dir = f"{self.cache_dir}-{provider.name}"
+        self.ttl = ttl
+        # Generated data needs no pacing.
+        self.bucket = bucket or (TokenBucket() if provider.live else TokenBucket(rate=1e9, capacity=1))
+        self.retries = retries
+        self.backoff = backoff
+        self.hits = 0
+        self.misses = 0
+        self.requests = 0
+        # pytrends keeps the payload on the client between build_payload and the fetch, so requests
+        # from concurrent threads (the daemon's) take turns with it.
+        self._client_lock = threading.Lock()
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    @property
+    def client(self):
+        """Trends session from the data provider, created on first live request."""
+        if self._client is None:
+            self._client = self._provider.trends_client()
+        return self._client
+
+    def interest_over_time(self, keywords: Sequence[str], timeframe: str = "today 5-y", geo: str = "",
+                           anchor: Optional[str] = None) -> pd.DataFrame:
+        """
+        Interest over time for any number of keywords, one column per keyword on a shared 0-100 scale.
+
+        `anchor` defaults to the first keyword. A popular anchor keeps the integer rounding of
+        low-interest batches from distorting the rescaling.
+        """
+        keywords = list(dict.fromkeys(keyword.strip() for keyword in keywords if keyword.strip()))
+        if not keywords:
+            raise ValueError("Keywords list is empty.")
+        if len(keywords) <= MAX_TERMS:
+            return self._interest(keywords, timeframe, geo)
+
+        anchor = anchor or keywords[0]
+        frames = [self._interest(batch, timeframe, geo) for batch in keyword_batches(keywords, anchor)]
+        if any(frame.empty for frame in frames):
+            return pd.DataFrame()
+        with span("compute", source="trends"):
+            return rescale_batches(frames, anchor)[keywords]
+
+    def related_queries(self, keywords: Sequence[str], timeframe: str = "today 5-y",
+                        geo: str = "") -> Dict[str, Dict[str, Optional[pd.DataFrame]]]:
+        """Top and rising related queries per keyword, fetched five keywords per request."""
+        keywords = list(dict.fromkeys(keyword.strip() for keyword in keywords if keyword.strip()))
+        results: Dict[str, Dict[str, Optional[pd.DataFrame]]] = {}
+        for start in range(0, len(keywords), MAX_TERMS):
+            batch = keywords[start:start + MAX_TERMS]
+            results.update(self._related(batch, timeframe, geo))
+        return results
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "requests": self.requests,
+            "rate_limited_seconds": round(self.bucket.waited, 3),
+        }
+
+    def _interest(self, batch: List[str], timeframe: str, geo: str) -> pd.DataFrame:
+        path = self._path("interest", batch, timeframe, geo, "parquet")
+        if self._fresh(path):
+            self.hits += 1
+            METRICS.increment("trends_requests_total", result="cache_hit")
+            return pd.read_parquet(path)[batch]
+
+        self.misses += 1
+        data = self._request(lambda client: client.interest_over_time(), batch, timeframe, geo)
+        data = data.drop(columns=["isPartial"], errors="ignore")
+        if not data.empty:
+            self._save(path, data.to_parquet)
+        return data
+
+    def _related(self, batch: List[str], timeframe: str, geo: str) -> Dict[str, Dict[str, Optional[pd.DataFrame]]]:
+        path = self._path("related", batch, timeframe, geo, "json")
+        if self._fresh(path):
+            self.hits += 1
+            METRICS.increment("trends_requests_total", result="cache_hit")
+            with open(path) as f:
+                cached = json.load(f)
+            return {
+                keyword: {kind: None if rows is None else pd.DataFrame(rows) for kind, rows in tables.items()}
+                for keyword, tables in cached.items()
+            }
+
+        self.misses += 1
+        data = self._request(lambda client: client.related_queries(), batch, timeframe, geo)
+        text = json.dumps({
+            keyword: {
+                kind: None if table is None else table.to_dict(orient="records")
+                for kind, table in (tables or {}).items()
+            }
+            for keyword, tables in data.items()
+        })
+
+        def write(partial: str):
+            with open(partial, "w") as f:
+                f.write(text)
+
+        self._save(path, write)
+        return data
+
+    def _request(self, fetch: Callable[[Any], Any], batch: List[str], timeframe: str, geo: str) -> Any:
+        for attempt in range(self.retries + 1):
+            self.bucket.acquire()
+            self.requests += 1
+            try:
+                with span("fetch", source="trends"), self._client_lock:
+                    self.client.build_payload(batch, timeframe=timeframe, geo=geo)
+                    data = fetch(self.client)
+                METRICS.increment("trends_requests_total", result="ok")
+                return data
+            except Exception as e:
+                METRICS.increment("trends_requests_total", result="error")
+                if attempt == self.retries:
+                    raise
+                logger.warning(f"Google Trends request for {batch} failed ({e}); retrying")
+                # Throttling responses need a much longer pause than the bucket's steady-state pacing.
+                time.sleep(self.backoff * (2 ** attempt) * (1 + random.random()))
+
+    def _save(self, path: str, write: Callable[[str], None]):
+        """Write a cached response atomically, so readers never see a partial file."""
+        partial = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        write(partial)
+        os.replace(partial, path)
+
+    def _path(self, kind: str, batch: List[str], timeframe: str, geo: str, suffix: str) -> str:
+        key = json.dumps([kind, sorted(batch), timeframe, geo])
+        return os.path.join(self.cache_dir, f"{kind}-{hashlib.sha1(key.encode()).hexdigest()}.{suffix}")
+
+    def _fresh(self, path: str) -> bool:
+        return os.path.exists(path) and time.time() - os.path.getmtime(path) < self.ttl
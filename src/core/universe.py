@@ -0,0 +1,53 @@
+from typing import Dict, List, Optional, Tuple
+
+
+def _parse_universe(path: str) -> List[Tuple[str, Optional[float]]]:
+    entries: List[Tuple[str, Optional[float]]] = []
+    with open(path) as file:
+        for line in file:
+            line = line.split("#", 1)[0].strip()
+            if not line:
+                continue
+            fields = [field.strip() for field in line.split(",") if field.strip()]
+            if len(fields) == 2 and _is_number(fields[1]):
+                entries.append((fields[0].upper(), float(fields[1])))
+            else:
+                entries.extend((ticker.upper(), None) for ticker in fields)
+    return entries
+
+
+def load_universe(path: str) -> List[str]:
+    """
+    Read tickers from a universe file: one per line or comma-separated, `#` starts a comment.
+    A `TICKER,weight` line contributes just its ticker.
+    """
+    return list(dict.fromkeys(ticker for ticker, _ in _parse_universe(path)))
+
+
+def load_universe_weights(path: str) -> Dict[str, float]:
+    """
+    Read a universe file into a portfolio. Tickers without a weight get an equal share of
+    whatever weight is left over.
+    """
+    weights = dict(_parse_universe(path))
+    unweighted = [ticker for ticker, weight in weights.items() if weight is None]
+    if unweighted:
+        remaining = 1 - sum(weight for weight in weights.values() if weight is not None)
+        for ticker in unweighted:
+            weights[ticker] = remaining / len(unweighted)
+    return weights
+
+
+def _is_number(value: str) -> bool:
+    try:
+        float(value)
+        return True
+    except ValueError:
+        return False
+
+
+def load_keywords(path: str) -> List[str]:
+    """Read search keywords, one per line, keeping their case. `#` starts a comment."""
+    with open(path) as file:
+        keywords = (line.split("#", 1)[0].strip() for line in file)
+        return list(dict.fromkeys(keyword for keyword in keywords if keyword))
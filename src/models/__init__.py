@@ -1,4 +1,5 @@
 # src/models/__init__.py
 # Make models available for imports 
 from .trading_signals import SignalType
-from .data_models import Signal
\ No newline at end of file
+from .data_models import Signal
+from .signal_store import SignalBatch, SignalRow, SignalStore, TickerInterner
@@ -1,12 +1,28 @@
-from typing import NamedTuple 
-
-class Signal(NamedTuple):
-    ticker: str
-    signal_type: str
-    value: float
-    timestamp: str
-
-class SignalType:
-    BUY = "buy"
-    SELL = "sell"
-    HOLD = "hold"
+# src/models/data_models.py
+import time
+from typing import Dict, Any
+import pandas as pd  # Ensure pandas is properly imported
+
+class Signal:
+    """
+    A single signal object. For many signals per bar, record them in a SignalStore instead.
+    The timestamp is kept as int64 nanoseconds and only turned into a pd.Timestamp on access.
+    """
+
+    __slots__ = ("signal_type", "data", "timestamp_ns")
+
+    def __init__(self, signal_type: str, data: Dict[str, Any]):
+        self.signal_type = signal_type
+        self.data = data
+        self.timestamp_ns = time.time_ns()
+
+    @property
+    def timestamp(self) -> pd.Timestamp:
+        return pd.Timestamp(self.timestamp_ns, tz="UTC")
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "type": self.signal_type,
+            "data": self.data,
+            "timestamp": self.timestamp
+        }
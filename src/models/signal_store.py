@@ -0,0 +1,376 @@
+import time
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Union
+
+import numpy as np
+
+from src.models.trading_signals import SignalType
+
+COLUMNS = ("timestamp", "ticker_id", "signal_type", "value")
+DTYPES = {"timestamp": np.int64, "ticker_id": np.int32, "signal_type": np.int16, "value": np.float64}
+
+Timestamp = Union[int, Any]  # int64 ns since the epoch (UTC), or anything pandas can parse
+
+
+def now_ns() -> int:
+    """Current wall-clock time as int64 nanoseconds since the epoch, without building a Timestamp."""
+    return time.time_ns()
+
+
+def to_ns(timestamp: Optional[Timestamp]) -> int:
+    """Nanoseconds since the epoch for an int, datetime-like or string; now when None."""
+    if timestamp is None:
+        return now_ns()
+    if isinstance(timestamp, (int, np.integer)):
+        return int(timestamp)
+    import pandas as pd
+
+    timestamp = pd.Timestamp(timestamp)
+    return (timestamp.tz_localize("UTC") if timestamp.tz is None else timestamp).value
+
+
+def to_ns_array(timestamps: Union[Sequence, np.ndarray]) -> np.ndarray:
+    """
+    int64 nanoseconds since the epoch for a sequence of timestamps, like `to_ns` element-wise: ints
+    pass through, and datetimes, pandas Timestamps, strings and DatetimeIndexes are parsed, with
+    naive values taken as UTC.
+    """
+    stamps = np.asarray(timestamps)
+    if stamps.dtype.kind in "iu":
+        return stamps.astype(np.int64, copy=False)
+    import pandas as pd
+
+    index = pd.DatetimeIndex(timestamps)
+    index = index.tz_localize("UTC") if index.tz is None else index.tz_convert("UTC")
+    return index.as_unit("ns").asi8
+
+
+class TickerInterner:
+    """Maps ticker strings to dense int32 ids so signals store a small integer per row."""
+
+    def __init__(self):
+        self.ids: Dict[str, int] = {}
+        self.tickers: List[str] = []
+
+    def intern(self, ticker: str) -> int:
+        ticker_id = self.ids.get(ticker)
+        if ticker_id is None:
+            ticker_id = self.ids[ticker] = len(self.tickers)
+            self.tickers.append(ticker)
+        return ticker_id
+
+    def intern_many(self, tickers: Iterable[str]) -> np.ndarray:
+        return np.fromiter((self.intern(ticker) for ticker in tickers), dtype=np.int32)
+
+    def lookup(self, ticker_ids: np.ndarray) -> np.ndarray:
+        return np.asarray(self.tickers, dtype=object)[ticker_ids]
+
+    def __len__(self) -> int:
+        return len(self.tickers)
+
+
+class SignalRow:
+    """A view of one row of a SignalBatch; values are read from the batch's arrays on access."""
+
+    __slots__ = ("_batch", "_index")
+
+    def __init__(self, batch: "SignalBatch", index: int):
+        self._batch = batch
+        self._index = index
+
+    @property
+    def ticker(self) -> str:
+        return self._batch.interner.tickers[self._batch.ticker_id[self._index]]
+
+    @property
+    def signal_type(self) -> SignalType:
+        return SignalType.from_code(self._batch.signal_type[self._index])
+
+    @property
+    def value(self) -> float:
+        return float(self._batch.value[self._index])
+
+    @property
+    def timestamp_ns(self) -> int:
+        return int(self._batch.timestamp[self._index])
+
+    @property
+    def timestamp(self):
+        import pandas as pd
+
+        return pd.Timestamp(self.timestamp_ns, tz="UTC")
+
+    def to_dict(self) -> Dict[str, Any]:
+        """The signal as a {"type", "data", "timestamp"} message, as agents exchange them."""
+        return {
+            "type": self.signal_type,
+            "data": {"ticker": self.ticker, "value": self.value},
+            "timestamp": self.timestamp,
+        }
+
+    def __repr__(self) -> str:
+        return f"SignalRow({self.ticker}, {self.signal_type.value}, {self.value}, {self.timestamp_ns})"
+
+
+class SignalBatch:
+    """
+    Signals as parallel column arrays: int64 ns timestamps, interned int32 ticker ids, int16
+    SignalType codes and float64 values. Slicing and exports share the underlying arrays.
+    """
+
+    def __init__(self, timestamp: np.ndarray, ticker_id: np.ndarray, signal_type: np.ndarray, value: np.ndarray,
+                 interner: TickerInterner):
+        self.timestamp = timestamp
+        self.ticker_id = ticker_id
+        self.signal_type = signal_type
+        self.value = value
+        self.interner = interner
+
+    @classmethod
+    def empty(cls, interner: Optional[TickerInterner] = None) -> "SignalBatch":
+        return cls(*(np.empty(0, dtype=DTYPES[column]) for column in COLUMNS), interner or TickerInterner())
+
+    def __len__(self) -> int:
+        return len(self.timestamp)
+
+    def __getitem__(self, key):
+        if isinstance(key, (int, np.integer)):
+            index = int(key) + len(self) if key < 0 else int(key)
+            if not 0 <= index < len(self):
+                raise IndexError("SignalBatch index out of range")
+            return SignalRow(self, index)
+        return SignalBatch(self.timestamp[key], self.ticker_id[key], self.signal_type[key], self.value[key],
+                           self.interner)
+
+    def __iter__(self) -> Iterator[SignalRow]:
+        return (SignalRow(self, i) for i in range(len(self)))
+
+    def of_type(self, *signal_types: SignalType) -> "SignalBatch":
+        return self[np.isin(self.signal_type, [signal_type.code for signal_type in signal_types])]
+
+    def for_tickers(self, *tickers: str) -> "SignalBatch":
+        ids = [self.interner.ids[ticker] for ticker in tickers if ticker in self.interner.ids]
+        return self[np.isin(self.ticker_id, ids)]
+
+    def to_numpy(self) -> Dict[str, np.ndarray]:
+        """The column arrays themselves (no copy). Ticker ids index `interner.tickers`."""
+        return {column: getattr(self, column) for column in COLUMNS}
+
+    def to_arrow(self):
+        """
+        A pyarrow Table sharing the numeric buffers. Tickers and signal types are dictionary-encoded
+        columns whose indices are the stored ids and codes.
+        """
+        import pyarrow as pa
+
+        codes = [signal_type.value for signal_type in SignalType]
+        return pa.table({
+            "timestamp": pa.Array.from_buffers(pa.timestamp("ns", tz="UTC"), len(self),
+                                               [None, pa.py_buffer(np.ascontiguousarray(self.timestamp))]),
+            "ticker": pa.DictionaryArray.from_arrays(pa.array(self.ticker_id), pa.array(self.interner.tickers,
+                                                                                        type=pa.string())),
+            "signal_type": pa.DictionaryArray.from_arrays(pa.array(self.signal_type), pa.array(codes)),
+            "value": pa.array(self.value),
+        })
+
+    def to_parquet(self, path: str):
+        import pyarrow.parquet as pq
+
+        pq.write_table(self.to_arrow(), path)
+
+    def to_frame(self):
+        """A pandas DataFrame with categorical ticker and signal type columns."""
+        import pandas as pd
+
+        return pd.DataFrame({
+            "timestamp": pd.to_datetime(self.timestamp, utc=True),
+            "ticker": pd.Categorical.from_codes(self.ticker_id, categories=self.interner.tickers),
+            "signal_type": pd.Categorical.from_codes(self.signal_type,
+                                                     categories=[signal_type.value for signal_type in SignalType]),
+            "value": self.value,
+        })
+
+    @classmethod
+    def read_parquet(cls, path: str) -> "SignalBatch":
+        import pyarrow.parquet as pq
+
+        table = pq.read_table(path)
+        interner = TickerInterner()
+        tickers = table.column("ticker").combine_chunks()
+        types = table.column("signal_type").combine_chunks()
+        # Remap the file's dictionary indices onto our ticker ids and SignalType codes.
+        ticker_ids = interner.intern_many(tickers.dictionary.to_pylist())
+        codes = np.array([SignalType(value).code for value in types.dictionary.to_pylist()], dtype=np.int16)
+        return cls(
+            table.column("timestamp").combine_chunks().cast("int64").to_numpy(),
+            ticker_ids[tickers.indices.to_numpy()],
+            codes[types.indices.to_numpy()],
+            table.column("value").to_numpy(),
+            interner,
+        )
+
+
+class SignalStore:
+    """
+    Append-only columnar signal log.
+
+    Storage grows by doubling from `capacity`. With `max_rows` set, growth stops there and the store
+    becomes a ring buffer that overwrites its oldest rows. Rows are expected in non-decreasing time order, which lets `between` binary
+    search; out-of-order appends are accepted and fall back to a scan.
+    """
+
+    def __init__(self, capacity: int = 4096, max_rows: Optional[int] = None,
+                 interner: Optional[TickerInterner] = None):
+        if max_rows is not None:
+            capacity = min(capacity, max_rows)
+        self.max_rows = max_rows
+        self.interner = interner or TickerInterner()
+        self._columns = {column: np.empty(max(1, capacity), dtype=DTYPES[column]) for column in COLUMNS}
+        self._start = 0  # Physical index of the oldest row
+        self._size = 0
+        self._sorted = True
+        self.dropped = 0  # Rows overwritten by the ring buffer
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def capacity(self) -> int:
+        return len(self._columns["timestamp"])
+
+    def append(self, ticker: str, signal_type: SignalType, value: float = np.nan,
+               timestamp: Optional[Timestamp] = None):
+        """Add one signal; `timestamp` defaults to now."""
+        self.extend(
+            np.array([self.interner.intern(ticker)], dtype=np.int32),
+            np.array([signal_type.code], dtype=np.int16),
+            np.array([value], dtype=np.float64),
+            np.array([to_ns(timestamp)], dtype=np.int64),
+            interned=True,
+        )
+
+    def extend(self, tickers: Union[Sequence[str], np.ndarray], signal_types: Union[SignalType, Sequence, np.ndarray],
+               values: Union[float, Sequence[float], np.ndarray] = np.nan,
+               timestamps: Union[Timestamp, Sequence, np.ndarray, None] = None, interned: bool = False):
+        """
+        Add many signals at once. Scalars broadcast: one signal type, value or timestamp can cover every
+        row. `tickers` are interned unless `interned` says they already are ids.
+        """
+        ticker_ids = np.asarray(tickers, dtype=np.int32) if interned else self.interner.intern_many(tickers)
+        rows = len(ticker_ids)
+        if not rows:
+            return
+        if isinstance(signal_types, SignalType):
+            codes = np.full(rows, signal_types.code, dtype=np.int16)
+        elif isinstance(signal_types, np.ndarray) and signal_types.dtype.kind in "iu":
+            codes = signal_types.astype(np.int16, copy=False)
+        else:
+            codes = np.fromiter((signal_type.code for signal_type in signal_types), dtype=np.int16, count=rows)
+        if timestamps is None or np.isscalar(timestamps) or not hasattr(timestamps, "__len__"):
+            stamps = np.full(rows, to_ns(timestamps), dtype=np.int64)
+        else:
+            stamps = to_ns_array(timestamps)
+        values = np.broadcast_to(np.asarray(values, dtype=np.float64), (rows,))
+
+        if self._size and (stamps[0] < self._last_timestamp() or np.any(np.diff(stamps) < 0)):
+            self._sorted = False
+        elif not self._size and np.any(np.diff(stamps) < 0):
+            self._sorted = False
+        self._write({"timestamp": stamps, "ticker_id": ticker_ids, "signal_type": codes, "value": values})
+
+    def between(self, start: Optional[Timestamp] = None, end: Optional[Timestamp] = None) -> SignalBatch:
+        """Signals with start <= timestamp < end (either bound may be open), oldest first."""
+        low = np.iinfo(np.int64).min if start is None else to_ns(start)
+        high = np.iinfo(np.int64).max if end is None else to_ns(end)
+        if not self._sorted:
+            batch = self.batch()
+            return batch[(batch.timestamp >= low) & (batch.timestamp < high)]
+
+        parts = []
+        for segment in self._segments():
+            stamps = self._columns["timestamp"][segment]
+            first, last = np.searchsorted(stamps, [low, high], side="left")
+            parts.append(slice(segment.start + first, segment.start + last))
+        return self._gather(parts)
+
+    def batch(self) -> SignalBatch:
+        """Every stored signal, oldest first. A view when the rows are contiguous, else a copy."""
+        return self._gather(self._segments())
+
+    def latest(self, rows: int) -> SignalBatch:
+        return self.batch()[-rows:] if rows else SignalBatch.empty(self.interner)
+
+    def clear(self):
+        self._start = self._size = 0
+        self.dropped = 0
+        self._sorted = True
+
+    def _last_timestamp(self) -> int:
+        return int(self._columns["timestamp"][(self._start + self._size - 1) % self.capacity])
+
+    def _segments(self) -> List[slice]:
+        end = self._start + self._size
+        if end <= self.capacity:
+            return [slice(self._start, end)]
+        return [slice(self._start, self.capacity), slice(0, end - self.capacity)]
+
+    def _gather(self, parts: List[slice]) -> SignalBatch:
+        parts = [part for part in parts if part.stop > part.start] or [slice(0, 0)]
+        if len(parts) == 1:
+            columns = [self._columns[column][parts[0]] for column in COLUMNS]
+        else:
+            columns = [np.concatenate([self._columns[column][part] for part in parts]) for column in COLUMNS]
+        return SignalBatch(*columns, self.interner)
+
+    def _write(self, columns: Dict[str, np.ndarray]):
+        rows = len(columns["timestamp"])
+        needed = self._size + rows
+        if needed > self.capacity and (self.max_rows is None or self.capacity < self.max_rows):
+            self._grow(needed if self.max_rows is None else min(needed, self.max_rows))
+
+        if rows >= self.capacity:
+            # Only the newest rows fit; keep those.
+            self.dropped += needed - self.capacity
+            columns = {column: values[-self.capacity:] for column, values in columns.items()}
+            self._start, self._size, rows = 0, 0, self.capacity
+        elif needed > self.capacity:
+            overflow = needed - self.capacity
+            self._start = (self._start + overflow) % self.capacity
+            self._size -= overflow
+            self.dropped += overflow
+
+        position = (self._start + self._size) % self.capacity
+        head = min(rows, self.capacity - position)
+        for column, values in columns.items():
+            self._columns[column][position:position + head] = values[:head]
+            self._columns[column][:rows - head] = values[head:]
+        self._size += rows
+
+    def _grow(self, needed: int):
+        capacity = self.capacity
+        while capacity < needed:
+            capacity *= 2
+        if self.max_rows is not None:
+            capacity = min(capacity, self.max_rows)
+        batch = self.batch()
+        self._columns = {column: np.empty(capacity, dtype=DTYPES[column]) for column in COLUMNS}
+        for column in COLUMNS:
+            self._columns[column][:len(batch)] = getattr(batch, column)
+        self._start = 0
+
+
+def threshold_signals(store: SignalStore, tickers: Sequence[str], values: np.ndarray, low: float, high: float,
+                      below: Optional[SignalType] = None, above: Optional[SignalType] = None,
+                      timestamp: Optional[Timestamp] = None) -> int:
+    """
+    Vectorized screen: record `below` for every ticker whose value is under `low` and `above` for
+    every one over `high`, all stamped with one timestamp. Returns the number of signals added.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    tickers = np.asarray(tickers, dtype=object)
+    stamp = to_ns(timestamp)
+    added = 0
+    for signal_type, mask in ((below, values < low), (above, values > high)):
+        if signal_type is not None and mask.any():
+            store.extend(tickers[mask], signal_type, values[mask], stamp)
+            added += int(mask.sum())
+    return added
@@ -2,25 +2,32 @@
 from enum import Enum
 
 class SignalType(Enum):
+    """
+    Every signal the agents emit. Each member also has a small integer `code` (its definition order)
+    used by the columnar signal store, so add new members at the end.
+    """
+
     MA_CROSSOVER_BULLISH = "ma_crossover_bullish"
     MA_CROSSOVER_BEARISH = "ma_crossover_bearish"
     RSI_OVERSOLD = "rsi_oversold"
     RSI_OVERBOUGHT = "rsi_overbought"
     HIGH_VOLATILITY = "high_volatility"
+    ZSCORE_OVERSOLD = "zscore_oversold"
+    ZSCORE_OVERBOUGHT = "zscore_overbought"
+    MOMENTUM_BULLISH = "momentum_bullish"
+    MOMENTUM_BEARISH = "momentum_bearish"
+    BUY = "buy"
+    SELL = "sell"
+    HOLD = "hold"
+
+    @property
+    def code(self) -> int:
+        return _CODES[self]
 
-# src/models/data_models.py
-from typing import Dict, Any
-import pandas as pd  # Ensure pandas is properly imported
+    @classmethod
+    def from_code(cls, code: int) -> "SignalType":
+        return _MEMBERS[code]
 
-class Signal:
-    def __init__(self, signal_type: str, data: Dict[str, Any]):
-        self.signal_type = signal_type
-        self.data = data
-        self.timestamp = pd.Timestamp.now()
 
-    def to_dict(self) -> Dict[str, Any]:
-        return {
-            "type": self.signal_type,
-            "data": self.data,
-            "timestamp": self.timestamp
-        }
+_MEMBERS = list(SignalType)
+_CODES = {member: code for code, member in enumerate(_MEMBERS)}
@@ -1,59 +1,352 @@
 import click
-from src.agents.market_analyst import MarketDataAnalyst
-from src.agents.sentiment_analyst import SentimentAnalyst
-from src.agents.quant_analyst import QuantAnalyst 
-from src.agents.portfolio_manager_analyst import PortfolioManagerAnalyst 
 from src.core.logger import setup_logging
+from src.core import settings
+from src.core.profiling import METRICS, span
+from src.core.settings import DEFAULT_CHART_MODE, DEFAULT_CHUNK_DAYS, DEFAULT_REFRESH, DEFAULT_SERVER_PORT, DEFAULT_WORKERS, RENDER_MODES
+from src.core.universe import load_keywords, load_universe, load_universe_weights
 import json
+import os
+
+# Agents pull in pandas, yfinance, matplotlib, scipy and pytrends, so each command imports only the
+# agents it uses, inside the command, to keep `--help` and single commands quick to start.
 
 # Initialize logging 
 logger = setup_logging()
 
 @click.group()
-def cli():
+@click.option("--provider", default=None, type=click.Choice(settings.DATA_PROVIDERS), help="Market and trends data source (default: yfinance, or ZENITH_DATA_PROVIDER); synthetic generates deterministic offline data")
+@click.option("--server", default=None, help="Send commands to a running `serve` daemon at host:port or unix:///path.sock (default: ZENITH_SERVER)")
+@click.option("--profile", is_flag=True, help="Print a per-stage and per-ticker timing breakdown when the command finishes")
+@click.option("--profile-output", default=None, help="Also run the command under cProfile and write its stats to this file")
+@click.option("--metrics-file", default=None, envvar="ZENITH_METRICS_FILE", help="Write counters and timing histograms here when the command finishes: Prometheus text, or JSON for a .json path")
+@click.pass_context
+def cli(ctx, provider, server, profile, profile_output, metrics_file):
     """CLI for Zenith AI Tools"""
-    pass
+    if provider:
+        settings.DATA_PROVIDER = provider
+    if server:
+        settings.SERVER = server
+    if profile or profile_output or metrics_file:
+        start_profiling(ctx, profile, profile_output, metrics_file)
+
+def start_profiling(ctx, profile, profile_output, metrics_file):
+    """
+    Turn on span metrics (and cProfile for --profile-output) and report them once the command finishes.
+    """
+    METRICS.enable()
+    profiler = None
+    if profile_output:
+        import cProfile
+
+        profiler = cProfile.Profile()
+        profiler.enable()
+
+    def finish():
+        if profiler:
+            # cProfile only sees the main thread; worker threads show up in the span breakdown instead.
+            profiler.disable()
+            profiler.dump_stats(profile_output)
+            click.echo(f"cProfile stats written to {profile_output} (inspect with python -m pstats)")
+        if profile:
+            click.echo("\nProfile:")
+            click.echo(METRICS.breakdown())
+        if metrics_file:
+            METRICS.write(metrics_file)
+            logger.info(f"Metrics written to {metrics_file}")
+
+    ctx.call_on_close(finish)
+
+def resolve_tickers(tickers, universe):
+    """
+    Combine --tickers and --universe into one ticker list, prompting when neither was given.
+    """
+    tickers_list = load_universe(universe) if universe else []
+    if not tickers and not tickers_list:
+        tickers = click.prompt("Enter tickers (comma-separated)")
+    if tickers:
+        tickers_list += [ticker.strip() for ticker in tickers.split(",") if ticker.strip()]
+    return list(dict.fromkeys(tickers_list))
+
+def chart_options(command):
+    """
+    Add --charts/--chart-dir/--chart-format to a command that draws charts.
+    """
+    command = click.option("--chart-format", default="png", help="Comma-separated file formats for --charts file, e.g. png,svg")(command)
+    command = click.option("--chart-dir", default="charts", help="Output directory for --charts file")(command)
+    command = click.option("--charts", default=DEFAULT_CHART_MODE, type=click.Choice(RENDER_MODES), help="Show charts in a window, write them to files, or skip them (default: show, or ZENITH_CHARTS)")(command)
+    return command
+
+def remote(endpoint, payload):
+    """
+    Run a command on the daemon given by --server/ZENITH_SERVER, or return None to run it locally.
+    """
+    if not settings.SERVER:
+        return None
+    from src.terminal.client import ZenithClient
+
+    return ZenithClient(settings.SERVER).request(endpoint, payload)
+
+def parse_timeframes(timeframes):
+    """
+    Parse "period:interval" pairs such as "1mo:1d,1y:1wk,5y:1mo" into [(period, interval), ...].
+    """
+    parsed = []
+    for item in timeframes.split(","):
+        period, _, interval = item.strip().partition(":")
+        if not period or not interval:
+            raise ValueError(f"Timeframes must look like period:interval, e.g. 1y:1wk, got {item!r}")
+        parsed.append((period, interval))
+    return list(dict.fromkeys(parsed))
+
+def output_option(command):
+    """
+    Add --output to a command that reports one record per ticker.
+    """
+    return click.option("--output", default=None, help="Stream one record per result to a .ndjson/.jsonl, .json, .csv or .parquet file as each completes, or - for NDJSON on stdout")(command)
+
+def emit(records, output, show, command, key="ticker"):
+    """
+    Hand each record to `show` for the terminal and, with --output, to a streaming writer, as the
+    records are produced. With --output - the NDJSON replaces the terminal output.
+    """
+    from src.core.output import open_writer
+
+    writer = open_writer(output, key=key) if output else None
+    try:
+        for record in records:
+            with span("output", record.get("ticker"), command=command):
+                if writer is not None:
+                    writer.write(record)
+                if output != "-":
+                    show(record)
+    finally:
+        if writer is not None:
+            writer.close()
+            if output != "-":
+                click.echo(f"\n{writer.count} records saved to {output}")
+
+def make_renderer(charts, chart_dir, chart_format):
+    from src.core.rendering import ChartRenderer
+
+    return ChartRenderer(charts, output_dir=chart_dir, formats=chart_format.split(","))
 
 # Market Analysis Command
 @cli.command(name="market-analysis")
 @click.option(
     "--tickers",
-    prompt="Enter tickers (comma-separated)",
+    default=None,
     help="Comma-separated list of tickers to analyze",
 )
+@click.option("--universe", default=None, help="Path to a universe file with one ticker per line")
+@click.option("--workers", default=DEFAULT_WORKERS, help="Number of concurrent downloads")
+@click.option("--timeframes", default=None, help='Analyze several period:interval timeframes from shared downloads, e.g. "1mo:1d,1y:1wk,5y:1mo"')
 @click.option(
     "--config-path",
     default="config/market_analyst_config.yaml",
     help="Path to configuration file",
 )
-def market_analysis(tickers, config_path):
+@output_option
+def market_analysis(tickers, universe, workers, timeframes, config_path, output):
     """
     Perform market analysis for the provided tickers.
     """
-    tickers_list = [ticker.strip() for ticker in tickers.split(",")]
     try:
-        market_analyst = MarketDataAnalyst(config_path)
-        for ticker in tickers_list:
-            logger.info(f"Analyzing market data for {ticker}")
-            moving_averages = market_analyst.analyze_moving_averages(ticker)
-            rsi = market_analyst.analyze_rsi(ticker)
-            volatility = market_analyst.analyze_volatility(ticker)
-
-            click.echo(f"\nMarket Analysis for {ticker}:")
-            click.echo(f"Moving Averages: {moving_averages}")
-            click.echo(f"RSI: {rsi}")
-            click.echo(f"Volatility: {volatility}")
+        tickers_list = resolve_tickers(tickers, universe)
+        timeframes_list = parse_timeframes(timeframes) if timeframes else None
+        if timeframes_list:
+            response = remote("timeframes", {"tickers": tickers_list, "timeframes": timeframes_list})
+        else:
+            response = remote("market", {"tickers": tickers_list})
+
+        if response is not None:
+            sections = response["results"].items() if timeframes_list else [(None, response["results"])]
+            records = [{**({"timeframe": timeframe} if timeframe else {}), "ticker": ticker, **indicators}
+                       for timeframe, results in sections for ticker, indicators in results.items()]
+            records += [{"ticker": ticker, "error": message} for ticker, message in response["failures"].items()]
+        else:
+            from src.agents.market_analyst import MarketDataAnalyst
+            from src.core.price_cache import get_price_cache
+
+            market_analyst = MarketDataAnalyst(config_path)
+            logger.info(f"Fetching market data for {len(tickers_list)} tickers")
+            if timeframes_list:
+                results, failures = market_analyst.analyze_timeframes(tickers_list, timeframes_list, max_workers=workers)
+                records = [{"timeframe": timeframe, "ticker": ticker, **result.to_dict()}
+                           for timeframe, by_ticker in results.items() for ticker, result in by_ticker.items()]
+                records += [{"ticker": ticker, "error": message} for ticker, message in failures.items()]
+                logger.info(f"Timeframes: {market_analyst.timeframes.stats()}")
+            else:
+                # One record per ticker as soon as it is done, so a large universe streams out.
+                records = (
+                    {"ticker": ticker, "error": error} if error else {"ticker": ticker, **result.to_dict()}
+                    for ticker, result, error in market_analyst.iter_universe(tickers_list, max_workers=workers)
+                )
+
+        def show(record):
+            if "error" in record:
+                click.echo(f"\nFailed to analyze {record['ticker']}: {record['error']}")
+                return
+            timeframe = f" ({record['timeframe']})" if "timeframe" in record else ""
+            click.echo(f"\nMarket Analysis for {record['ticker']}{timeframe}:")
+            click.echo(f"Moving Averages: {{'short': {record['ma_short']}, 'long': {record['ma_long']}}}")
+            click.echo(f"RSI: {record['rsi']}")
+            click.echo(f"Volatility: {record['volatility']}")
+
+        emit(records, output, show, command="market-analysis", key=("timeframe", "ticker") if timeframes_list else "ticker")
+        if response is None:
+            logger.info(f"Price cache: {get_price_cache().stats()}")
     except Exception as e:
         logger.error(f"Error analyzing market data: {e}")
         click.echo(f"Error: {e}")
 
+# Screen Command
+@cli.command(name="screen")
+@click.option("--tickers", default=None, help="Comma-separated list of tickers to screen")
+@click.option("--universe", default=None, help="Path to a universe file with one ticker per line")
+@click.option("--where", default=None, help='Filter expression over indicator and signal columns, e.g. "rsi < 30 and volatility > 0.4"')
+@click.option("--rank-by", default=None, help="Column to rank matches by, e.g. volatility")
+@click.option("--top", default=None, type=int, help="Keep only the first N matches")
+@click.option("--ascending", is_flag=True, help="Rank smallest first")
+@click.option("--period", default="1y", help="History the indicators are computed over")
+@click.option("--interval", default="1d", help="Bar interval")
+@click.option("--as-of", default=None, help="Screen as of the last bar on or before this date (YYYY-MM-DD)")
+@click.option("--refresh", is_flag=True, help="Rebuild the indicator table even if a saved one is fresh")
+@click.option("--workers", default=DEFAULT_WORKERS, help="Number of concurrent downloads")
+@click.option("--config-path", default="config/market_analyst_config.yaml", help="Path to configuration file")
+@output_option
+def screen(tickers, universe, where, rank_by, top, ascending, period, interval, as_of, refresh, workers, config_path,
+           output):
+    """
+    Screen a universe by indicator values and signal conditions, optionally ranked to a top k.
+    """
+    try:
+        tickers_list = resolve_tickers(tickers, universe)
+        query = {"where": where, "rank_by": rank_by, "top": top, "ascending": ascending}
+        table_options = {"period": period, "interval": interval, "as_of": as_of, "refresh": refresh}
+        response = remote("screen", {"tickers": tickers_list, **query, **table_options})
+        if response is not None:
+            records = response["results"]
+        else:
+            from src.agents.market_analyst import MarketDataAnalyst
+            from src.core.output import to_builtin
+
+            market_analyst = MarketDataAnalyst(config_path)
+            matches = market_analyst.screen(tickers_list, **query, max_workers=workers, **table_options)
+            records = to_builtin(matches.reset_index())
+
+        from src.models.trading_signals import SignalType
+
+        signal_names = [signal_type.value for signal_type in SignalType]
+
+        def show(record):
+            if record.get("error"):
+                click.echo(f"{record['ticker']:<8} failed: {record['error']}")
+                return
+            values = "  ".join(f"{name} {record[name]:.4g}" if record[name] is not None else f"{name} -"
+                               for name in dict.fromkeys(["close", "rsi", "volatility", rank_by]) if name)
+            signals = ", ".join(name for name in signal_names if record.get(name))
+            click.echo(f"{record['ticker']:<8} {values}  [{signals}]")
+
+        if output != "-":
+            click.echo(f"{len(records)} of {len(tickers_list)} tickers match")
+        emit(records, output, show, command="screen")
+    except Exception as e:
+        logger.error(f"Error screening tickers: {e}")
+        click.echo(f"Error: {e}")
+
+# Intraday Command
+@cli.command(name="intraday")
+@click.option("--tickers", default=None, help="Comma-separated list of tickers to analyze")
+@click.option("--universe", default=None, help="Path to a universe file with one ticker per line")
+@click.option("--interval", default="1m", help="Intraday bar interval, e.g. 1m, 5m or 1h")
+@click.option("--period", default="5d", help="Bars to download into the bar store first (within the provider's intraday lookback)")
+@click.option("--no-fetch", is_flag=True, help="Only use bars already in the bar store")
+@click.option("--start", default=None, help="First trading day to analyze (YYYY-MM-DD, default: the first stored)")
+@click.option("--end", default=None, help="Last trading day to analyze (YYYY-MM-DD, default: the last stored)")
+@click.option("--chunk-days", default=DEFAULT_CHUNK_DAYS, help="Trading days of bars computed at a time")
+@click.option("--strategy", default=None, type=click.Choice(["mean_reversion", "momentum"]), help="Also backtest this strategy's signal over every bar")
+@click.option("--window", default=None, type=int, help="Z-score window or momentum periods for --strategy, in bars")
+@click.option("--threshold", default=None, type=float, help="Signal level that opens a position for --strategy")
+@click.option("--cost-bps", default=0.0, help="Transaction cost in basis points per unit traded for --strategy")
+@click.option("--workers", default=DEFAULT_WORKERS, help="Number of concurrent downloads")
+@click.option("--config-path", default="config/market_analyst_config.yaml", help="Path to configuration file")
+@output_option
+def intraday(tickers, universe, interval, period, no_fetch, start, end, chunk_days, strategy, window, threshold,
+             cost_bps, workers, config_path, output):
+    """
+    Indicators, and optionally strategy statistics, over stored intraday bars, computed a chunk of days at a time.
+    """
+    try:
+        tickers_list = resolve_tickers(tickers, universe)
+        from src.agents.market_analyst import MarketDataAnalyst
+
+        market_analyst = MarketDataAnalyst(config_path)
+        failures = {}
+        if not no_fetch:
+            written, failures = market_analyst.ingest_intraday(tickers_list, period, interval, max_workers=workers)
+            logger.info(f"Stored {sum(written.values())} days of {interval} bars for {len(written)} tickers")
+        if strategy:
+            from src.agents.quant_analyst import QuantAnalyst
+
+            quant_analyst = QuantAnalyst("config/quant_analyst_config.yaml")
+
+        def analyze():
+            for ticker in tickers_list:
+                if ticker in failures:
+                    yield {"ticker": ticker, "error": failures[ticker]}
+                    continue
+                try:
+                    record = market_analyst.analyze_intraday(ticker, interval, start, end, chunk_days=chunk_days).to_dict()
+                    if strategy:
+                        record.update(strategy=strategy, **quant_analyst.analyze_intraday(
+                            strategy, ticker, interval, start, end, window, threshold, cost_bps, chunk_days))
+                    yield record
+                except ValueError as e:
+                    yield {"ticker": ticker, "error": str(e)}
+
+        def show(record):
+            if "error" in record:
+                click.echo(f"\nFailed to analyze {record['ticker']}: {record['error']}")
+                return
+            click.echo(f"\nIntraday Analysis for {record['ticker']} ({interval}):")
+            click.echo(f"Moving Averages: {{'short': {record['ma_short']}, 'long': {record['ma_long']}}}")
+            click.echo(f"RSI: {record['rsi']}")
+            click.echo(f"Volatility: {record['volatility']}")
+            if strategy:
+                click.echo(f"{strategy} over {record['bars']} bars from {record['start']} to {record['end']}: "
+                           f"return {record['total_return']:.2%}, Sharpe {record['sharpe']:.2f}, "
+                           f"max drawdown {record['max_drawdown']:.2%}, exposure {record['exposure']:.0%}")
+
+        emit(analyze(), output, show, command="intraday")
+        logger.info(f"Bar store: {market_analyst.bar_store.stats()}")
+    except Exception as e:
+        logger.error(f"Error analyzing intraday bars: {e}")
+        click.echo(f"Error: {e}")
+
+# Bar Store Command
+@cli.command(name="bar-store")
+@click.option("--clear", is_flag=True, help="Remove every stored intraday bar.")
+def bar_store(clear):
+    """
+    Show intraday bar store usage, optionally clearing it.
+    """
+    from src.core.bar_store import get_bar_store
+
+    store = get_bar_store()
+    if clear:
+        store.clear()
+        click.echo(f"Cleared bar store at {store.root}")
+    click.echo(f"Bar Store ({store.root}): {store.stats()}")
+
 # Sentiment Analysis Command
 @cli.command(name="sentiment-analysis")
 @click.option(
     "--keywords",
-    prompt="Enter keywords (comma-separated)",
+    default=None,
     help="Comma-separated list of keywords to analyze sentiment",
 )
+@click.option("--keywords-file", default=None, help="Path to a file with one keyword per line")
+@click.option("--anchor", default=None, help="Keyword shared by every batch when more than five are given")
 @click.option("--timeframe", default="now 7-d", help="Timeframe for trends (default: now 7-d)")
 @click.option("--region", default="US", help="Region for trends (default: US)")
 @click.option(
@@ -61,22 +354,100 @@ def market_analysis(tickers, config_path):
     default="config/sentiment_analyst_config.yaml",
     help="Path to configuration file",
 )
-def sentiment_analysis(keywords, timeframe, region, config_path):
+@chart_options
+def sentiment_analysis(keywords, keywords_file, anchor, timeframe, region, config_path, charts, chart_dir,
+                       chart_format):
     """
     Perform sentiment analysis for the provided keywords.
     """
-    keywords_list = [kw.strip() for kw in keywords.split(",")]
+    keywords_list = load_keywords(keywords_file) if keywords_file else []
+    if keywords or not keywords_list:
+        keywords = keywords or click.prompt("Enter keywords (comma-separated)")
+        keywords_list += [kw.strip() for kw in keywords.split(",") if kw.strip()]
     try:
+        response = remote("sentiment", {"keywords": keywords_list, "timeframe": timeframe, "region": region,
+                                        "anchor": anchor})
+        if response is not None:
+            if charts != "off":
+                import pandas as pd
+
+                data = pd.DataFrame(response["trends"], index=pd.to_datetime(response["index"]))
+                make_renderer(charts, chart_dir, chart_format).render(
+                    "trends", {"data": data, "keywords": list(data.columns)}, "trends_" + "_".join(data.columns))
+            click.echo("\nSentiment Analysis Complete.")
+            return
+
+        from src.agents.sentiment_analyst import SentimentAnalyst
+
         sentiment_analyst = SentimentAnalyst(config_path)
+        sentiment_analyst.renderer = make_renderer(charts, chart_dir, chart_format)
         # Get trending keywords and visualize the trends
-        trends = sentiment_analyst.get_trending_keywords(keywords_list, timeframe, region)
-        sentiment_analyst.visualize_trends(trends)
+        sentiment_analyst.get_trending_keywords(keywords_list, timeframe, region, visualize=charts != "off",
+                                                anchor=anchor)
 
         click.echo("\nSentiment Analysis Complete.")
+        logger.info(f"Google Trends: {sentiment_analyst.trends.stats()}")
     except Exception as e:
         logger.error(f"Error analyzing sentiment: {e}")
         click.echo(f"Error: {e}")
 
+# Sentiment Lead/Lag Command
+@cli.command(name="lead-lag")
+@click.option("--keywords", default=None, help="Comma-separated list of keywords")
+@click.option("--keywords-file", default=None, help="Path to a file with one keyword per line")
+@click.option("--tickers", default=None, help="Comma-separated list of tickers")
+@click.option("--universe", default=None, help="Path to a universe file with one ticker per line")
+@click.option("--anchor", default=None, help="Keyword shared by every Trends batch when more than five are given")
+@click.option("--timeframe", default="today 5-y", help="Trends timeframe; prices are fetched to match (default: today 5-y, weekly)")
+@click.option("--region", default="", help="Region for trends (default: worldwide)")
+@click.option("--max-lag", default=8, help="Largest lead or lag to test, in Trends periods (weeks for today 5-y)")
+@click.option("--min-lag", default=0, help="Ignore relationships at leads/lags shorter than this (1 skips same-period moves)")
+@click.option("--top", default=20, help="Number of keyword/ticker pairs to report")
+@click.option("--levels", is_flag=True, help="Correlate interest levels instead of period-to-period changes")
+@click.option("--method", default="auto", type=click.Choice(["auto", "fft", "direct"]), help="How lagged products are computed")
+@click.option("--workers", default=DEFAULT_WORKERS, help="Number of concurrent downloads")
+@click.option("--config-path", default="config/sentiment_analyst_config.yaml", help="Path to configuration file")
+@click.option("--output", default=None, help="Save the reported pairs as .ndjson/.jsonl, .json, .csv or .parquet, or - for NDJSON on stdout")
+def lead_lag(keywords, keywords_file, tickers, universe, anchor, timeframe, region, max_lag, min_lag, top, levels,
+             method, workers, config_path, output):
+    """
+    Find which search keywords lead or lag which tickers' returns.
+    """
+    keywords_list = load_keywords(keywords_file) if keywords_file else []
+    if keywords or not keywords_list:
+        keywords = keywords or click.prompt("Enter keywords (comma-separated)")
+        keywords_list += [kw.strip() for kw in keywords.split(",") if kw.strip()]
+    try:
+        tickers_list = resolve_tickers(tickers, universe)
+        options = {"timeframe": timeframe, "region": region, "anchor": anchor, "max_lag": max_lag,
+                   "min_lag": min_lag, "top": top, "difference": not levels, "method": method}
+        report = remote("lead-lag", {"keywords": keywords_list, "tickers": tickers_list, **options})
+        if report is None:
+            from src.agents.sentiment_analyst import SentimentAnalyst
+
+            sentiment_analyst = SentimentAnalyst(config_path)
+            report = sentiment_analyst.lead_lag(keywords_list, tickers_list, max_workers=workers, **options)
+
+        def show(record):
+            if record["leader"] == "keyword":
+                relation = f"leads by {record['lag']}"
+            elif record["leader"] == "ticker":
+                relation = f"lags by {-record['lag']}"
+            else:
+                relation = "moves with"
+            click.echo(f"{record['keyword']:<24} {relation:<14} {record['ticker']:<8} r={record['correlation']:+.3f} "
+                       f"z={record['z_score']:+.2f}  (same period r={record['contemporaneous']:+.3f})")
+
+        if output != "-":
+            click.echo(f"{len(keywords_list)} keywords x {len(tickers_list)} tickers over {report['periods']} periods "
+                       f"({str(report['start'])[:10]} to {str(report['end'])[:10]}), lags up to {max_lag}:")
+            for ticker, reason in report["skipped"].items():
+                click.echo(f"Skipped {ticker}: {reason}")
+        emit(report["pairs"], output, show, command="lead-lag", key=("keyword", "ticker"))
+    except Exception as e:
+        logger.error(f"Error computing lead/lag: {e}")
+        click.echo(f"Error: {e}")
+
 # Quantitative Analysis Command
 @cli.command(name="quant-analysis")
 @click.option(
@@ -86,9 +457,11 @@ def sentiment_analysis(keywords, timeframe, region, config_path):
 )
 @click.option(
     "--tickers",
-    prompt="Enter tickers (comma-separated)",
+    default=None,
     help="Comma-separated list of tickers to analyze",
 )
+@click.option("--universe", default=None, help="Path to a universe file with one ticker per line")
+@click.option("--workers", default=DEFAULT_WORKERS, help="Number of concurrent downloads")
 @click.option(
     "--timeframe",
     default="1y",
@@ -99,27 +472,41 @@ def sentiment_analysis(keywords, timeframe, region, config_path):
     default="config/quant_analyst_config.yaml",
     help="Path to configuration file",
 )
-@click.option(
-    "--output",
-    default=None,
-    help="Optional path to save results as a JSON file",
-)
-def quant_analysis(strategy, tickers, timeframe, config_path, output):
+@output_option
+@click.option("--top-k", default=20, help="Number of pairs to report for pairs_trading")
+@click.option("--min-correlation", default=0.7, help="Minimum return correlation for a pairs_trading candidate")
+def quant_analysis(strategy, tickers, universe, workers, timeframe, config_path, output, top_k, min_correlation):
     """
     Perform quantitative analysis using the specified strategy.
     """
-    tickers_list = [ticker.strip() for ticker in tickers.split(",")]
     try:
-        quant_analyst = QuantAnalyst(config_path=config_path)
-        results = quant_analyst.analyze(strategy=strategy, tickers=tickers_list, timeframe=timeframe)
+        tickers_list = resolve_tickers(tickers, universe)
+        results = remote("quant", {"strategy": strategy, "tickers": tickers_list, "timeframe": timeframe,
+                                   "top_k": top_k, "min_correlation": min_correlation})
+        if results is not None:
+            records = ({"ticker": ticker, **result} for ticker, result in results.items())
+        else:
+            from src.agents.quant_analyst import QuantAnalyst
 
-        click.echo("Quantitative Analysis Results:")
-        click.echo(json.dumps(results, indent=4))
+            quant_analyst = QuantAnalyst(config_path=config_path)
+            quant_analyst.max_workers = workers
+            quant_analyst.config.update({"pairs_top_k": top_k, "pairs_min_correlation": min_correlation})
+            records = ({"ticker": ticker, **result}
+                       for ticker, result in quant_analyst.iter_analyze(strategy, tickers_list, timeframe))
 
-        if output:
-            with open(output, "w") as file:
-                json.dump(results, file, indent=4)
-            click.echo(f"Results saved to {output}")
+        def show(record):
+            from src.core.output import dumps
+
+            record = dict(record)
+            click.echo(f"{record.pop('ticker')}: {dumps(record, indent=4)}")
+
+        if output != "-":
+            click.echo("Quantitative Analysis Results:")
+        emit(records, output, show, command="quant-analysis")
+        if results is None:
+            from src.core.price_cache import get_price_cache
+
+            logger.info(f"Price cache: {get_price_cache().stats()}")
     except AttributeError as e:
         logger.error(f"Method error in QuantAnalyst: {e}")
         click.echo(f"Error: {e}")
@@ -127,36 +514,447 @@ def quant_analysis(strategy, tickers, timeframe, config_path, output):
         logger.error(f"Error performing quantitative analysis: {e}")
         click.echo(f"Error: {e}")
 
+# Backtest Command
+@cli.command(name="backtest")
+@click.option("--strategy", required=True, type=click.Choice(["mean_reversion", "momentum"]), help="The strategy to backtest")
+@click.option("--tickers", default=None, help="Comma-separated list of tickers to backtest")
+@click.option("--universe", default=None, help="Path to a universe file with one ticker per line")
+@click.option("--workers", default=DEFAULT_WORKERS, help="Number of concurrent downloads")
+@click.option("--timeframe", default="10y", help="Timeframe of history to backtest over")
+@click.option("--windows", default=None, help='Windows to sweep, e.g. "10,20,50" or "5:100:5"')
+@click.option("--thresholds", default=None, help='Thresholds to sweep, e.g. "1,1.5,2" or "0.5:3:0.25"')
+@click.option("--cost-bps", default=0.0, help="Transaction cost in basis points per unit traded")
+@click.option("--processes", default=None, type=int, help="Spread windows over this many worker processes")
+@click.option("--config-path", default="config/quant_analyst_config.yaml", help="Path to configuration file")
+@click.option("--output", default=None, help="Optional path to save every backtest as .csv, .ndjson/.jsonl, .json or .parquet")
+def backtest(strategy, tickers, universe, workers, timeframe, windows, thresholds, cost_bps, processes, config_path, output):
+    """
+    Backtest a grid of strategy parameters and report the best combination per ticker.
+    """
+    from src.agents.quant_analyst import QuantAnalyst
+    from src.analytics.backtest import best_parameters, parse_grid
+
+    try:
+        tickers_list = resolve_tickers(tickers, universe)
+        quant_analyst = QuantAnalyst(config_path=config_path)
+        quant_analyst.max_workers = workers
+        results = quant_analyst.backtest(
+            strategy,
+            tickers_list,
+            timeframe=timeframe,
+            windows=parse_grid(windows, int) if windows else None,
+            thresholds=parse_grid(thresholds) if thresholds else None,
+            cost_bps=cost_bps,
+            processes=processes,
+        )
+
+        with span("output", command="backtest"):
+            click.echo(f"Backtested {len(results)} parameter/ticker combinations. Best by Sharpe ratio:")
+            click.echo(best_parameters(results).to_string())
+
+            if output:
+                from src.core.output import open_writer
+
+                with open_writer(output, key="row") as writer:
+                    writer.write_many(results.reset_index().to_dict("records"))
+                click.echo(f"Results saved to {output}")
+    except Exception as e:
+        logger.error(f"Error running backtest: {e}")
+        click.echo(f"Error: {e}")
+
 
 # Portfolio Manager Command 
 @cli.command(name="portfolio-manager")
-@click.option("--portfolio", required=True, help="Portfolio in JSON format, e.g., '{\"AAPL\": 0.4, \"GOOGL\": 0.3, \"MSFT\": 0.3}'")
+@click.option("--portfolio", default=None, help="Portfolio in JSON format, e.g., '{\"AAPL\": 0.4, \"GOOGL\": 0.3, \"MSFT\": 0.3}'")
+@click.option("--universe", default=None, help="Path to a universe file of TICKER[,weight] lines (missing weights are split equally)")
+@click.option("--workers", default=DEFAULT_WORKERS, help="Number of concurrent downloads")
 @click.option("--timeframe", default="1y", help="Timeframe for historical data.")
 @click.option("--config-path", required=True, help="Path to config file.")
-def portfolio_manager(portfolio, timeframe, config_path):
+@click.option("--memory-limit", default=None, type=float, help="Memory ceiling in MB for statistics; streams returns over date blocks (default: ZENITH_MEMORY_LIMIT_MB)")
+@click.option("--float32", "use_float32", is_flag=True, help="Store prices as float32 to halve their memory")
+@chart_options
+def portfolio_manager(portfolio, universe, workers, timeframe, config_path, memory_limit, use_float32, charts, chart_dir,
+                      chart_format):
     """
     Manage portfolio, analyze performance, and visualize metrics.
     """
     try:
-        portfolio = json.loads(portfolio)
+        if portfolio:
+            portfolio = json.loads(portfolio)
+        elif universe:
+            portfolio = load_universe_weights(universe)
+        else:
+            raise click.UsageError("Provide either --portfolio or --universe.")
+
+        if settings.SERVER:
+            # The daemon writes file charts itself, under its own --chart-dir; interactive windows need a local run.
+            response = remote("portfolio", {"portfolio": portfolio, "timeframe": timeframe,
+                                            "chart_dir": chart_dir if charts == "file" else None,
+                                            "chart_format": chart_format})
+            with span("output", command="portfolio-manager"):
+                click.echo(f"Portfolio Metrics: {response['metrics']}")
+                for path in response["charts"]:
+                    click.echo(f"Saved {path}")
+            if charts == "show":
+                click.echo("Charts can't be shown through --server; use --charts file or run locally.")
+            return
+
+        from src.agents.portfolio_manager_analyst import PortfolioManagerAnalyst
+        from src.core.price_cache import get_price_cache
+
         manager = PortfolioManagerAnalyst(config_path)
         manager.set_portfolio(portfolio)
         manager.timeframe = timeframe
+        manager.max_workers = workers
+        if memory_limit:
+            manager.memory_limit_mb = memory_limit
+        if use_float32:
+            import numpy as np
+
+            manager.dtype = np.float32
+        manager.renderer = make_renderer(charts, chart_dir, chart_format)
         manager.fetch_data()
         
         metrics = manager.calculate_portfolio_metrics()
-        click.echo(f"Portfolio Metrics: {metrics}")
+        with span("output", command="portfolio-manager"):
+            click.echo(f"Portfolio Metrics: {metrics}")
+        logger.info(f"Price cache: {get_price_cache().stats()}")
+
+        if charts != "off":
+            click.echo("Visualizing portfolio performance...")
+            for path in manager.visualize_portfolio_performance():
+                click.echo(f"Saved {path}")
+
+            click.echo("Visualizing correlation matrix...")
+            for path in manager.visualize_correlation_matrix():
+                click.echo(f"Saved {path}")
+
+    except Exception as e:
+        click.echo(f"Error: {e}")
+
+
+# Portfolio Risk Command
+@cli.command(name="portfolio-risk")
+@click.option("--portfolio", default=None, help="Portfolio in JSON format, e.g., '{\"AAPL\": 0.6, \"MSFT\": 0.4}'")
+@click.option("--universe", default=None, help="Path to a universe file of TICKER[,weight] lines (missing weights are split equally)")
+@click.option("--workers", default=DEFAULT_WORKERS, help="Number of concurrent downloads")
+@click.option("--timeframe", default="1y", help="Timeframe for historical data.")
+@click.option("--confidence", default="0.95,0.99", help="Comma-separated confidence levels")
+@click.option("--horizons", default="1,10", help="Comma-separated horizons in trading days")
+@click.option("--paths", default=100_000, help="Monte Carlo paths (0 skips the simulation)")
+@click.option("--processes", default=None, type=int, help="Spread the simulation over this many worker processes")
+@click.option("--seed", default=None, type=int, help="Seed for reproducible simulations")
+@click.option("--scenarios", default=None, help='Shock scenarios as JSON or a .json file, e.g. \'{"crash": {"*": -0.2}, "tech": {"AAPL": -0.15}}\'')
+@click.option("--no-propagate", is_flag=True, help="Leave tickers a scenario doesn't name unshocked instead of moving them by their covariance")
+@click.option("--config-path", default="config/portfolio_manager_config.yaml", help="Path to config file.")
+@click.option("--output", default=None, help="Save the full report as .json, or the VaR table as .ndjson/.jsonl, .csv or .parquet")
+def portfolio_risk(portfolio, universe, workers, timeframe, confidence, horizons, paths, processes, seed, scenarios,
+                   no_propagate, config_path, output):
+    """
+    Historical, parametric and Monte Carlo VaR/CVaR, drawdowns and stress scenarios for a portfolio.
+    """
+    try:
+        if portfolio:
+            portfolio = json.loads(portfolio)
+        elif universe:
+            portfolio = load_universe_weights(universe)
+        else:
+            raise click.UsageError("Provide either --portfolio or --universe.")
+        if scenarios:
+            if os.path.exists(scenarios):
+                with open(scenarios) as file:
+                    scenarios = json.load(file)
+            else:
+                scenarios = json.loads(scenarios)
+        options = {"confidences": [float(c) for c in confidence.split(",")],
+                   "horizons": [int(h) for h in horizons.split(",")],
+                   "paths": paths, "seed": seed, "scenarios": scenarios, "propagate": not no_propagate}
+
+        report = remote("risk", {"portfolio": portfolio, "timeframe": timeframe, **options})
+        if report is None:
+            from src.agents.portfolio_manager_analyst import PortfolioManagerAnalyst
+
+            manager = PortfolioManagerAnalyst(config_path)
+            manager.set_portfolio(portfolio)
+            manager.timeframe = timeframe
+            manager.max_workers = workers
+            manager.fetch_data()
+            report = manager.risk_report(processes=processes, **options)
+
+        with span("output", command="portfolio-risk"):
+            click.echo(f"{'Method':<12} {'Confidence':>10} {'Horizon':>8} {'VaR':>9} {'CVaR':>9}")
+            for row in report["var"]:
+                click.echo(f"{row['method']:<12} {row['confidence']:>10.2%} {row['horizon']:>7}d "
+                           f"{row['var']:>9.2%} {row['cvar']:>9.2%}")
+            drawdown = report["drawdown"]
+            click.echo(f"\nMax drawdown {drawdown['max_drawdown']:.2%} (peak {drawdown['peak']}, trough "
+                       f"{drawdown['trough']}, recovered {drawdown['recovery']}); current {drawdown['current_drawdown']:.2%}, "
+                       f"longest {drawdown['longest_drawdown_days']} days below a peak")
+            for name, result in report.get("scenarios", {}).items():
+                click.echo(f"Scenario {name}: portfolio return {result['portfolio_return']:.2%}")
+
+            if output:
+                from src.core.output import dumps, open_writer, output_format
+
+                if output_format(output) == "json":
+                    with open(output, "w") as file:
+                        file.write(dumps(report, indent=4))
+                else:
+                    with open_writer(output, key=("method", "confidence")) as writer:
+                        writer.write_many(report["var"])
+                click.echo(f"Report saved to {output}")
+    except Exception as e:
+        logger.error(f"Error computing portfolio risk: {e}")
+        click.echo(f"Error: {e}")
+
+
+# Rolling Portfolio Analytics Command
+@cli.command(name="portfolio-rolling")
+@click.option("--portfolio", default=None, help="Portfolio in JSON format, e.g., '{\"AAPL\": 0.6, \"MSFT\": 0.4}'")
+@click.option("--universe", default=None, help="Path to a universe file of TICKER[,weight] lines (missing weights are split equally)")
+@click.option("--workers", default=DEFAULT_WORKERS, help="Number of concurrent downloads")
+@click.option("--timeframe", default="5y", help="Timeframe for historical data.")
+@click.option("--windows", default="60,120,252", help="Comma-separated rolling windows in trading days")
+@click.option("--benchmark", default=None, help="Ticker to compute rolling beta against, e.g. SPY")
+@click.option("--risk-free-rate", default=0.0, help="Annualized risk-free rate for Sharpe ratios")
+@click.option("--correlations", default=None, help="Also write rolling correlation matrices to this .npy file (dates and tickers go to a .json beside it)")
+@click.option("--correlation-window", default=60, help="Window in trading days for --correlations")
+@click.option("--step", default=1, help="Trading days between the correlation matrices written")
+@click.option("--memory-limit", default=None, type=float, help="Memory ceiling in MB for statistics; streams returns over date blocks (default: ZENITH_MEMORY_LIMIT_MB)")
+@click.option("--float32", "use_float32", is_flag=True, help="Store prices and correlation matrices as float32")
+@click.option("--config-path", default="config/portfolio_manager_config.yaml", help="Path to config file.")
+@click.option("--output", default=None, help="Save every date's metrics per window as .ndjson/.jsonl, .json, .csv or .parquet")
+def portfolio_rolling(portfolio, universe, workers, timeframe, windows, benchmark, risk_free_rate, correlations,
+                      correlation_window, step, memory_limit, use_float32, config_path, output):
+    """
+    Rolling Sharpe ratio, volatility, return and beta of a portfolio, and rolling correlation matrices.
+    """
+    try:
+        if portfolio:
+            portfolio = json.loads(portfolio)
+        elif universe:
+            portfolio = load_universe_weights(universe)
+        else:
+            raise click.UsageError("Provide either --portfolio or --universe.")
+        if correlations and not correlations.endswith(".npy"):
+            raise click.UsageError("--correlations must be a .npy path.")
+
+        import numpy as np
+        from src.agents.portfolio_manager_analyst import PortfolioManagerAnalyst
+
+        manager = PortfolioManagerAnalyst(config_path)
+        manager.set_portfolio(portfolio)
+        manager.timeframe = timeframe
+        manager.max_workers = workers
+        if memory_limit:
+            manager.memory_limit_mb = memory_limit
+        if use_float32:
+            manager.dtype = np.float32
+        manager.fetch_data()
+        result = manager.rolling_metrics([int(w) for w in windows.split(",")], benchmark, risk_free_rate)
+
+        from src.core.output import dumps, open_writer
 
-        click.echo("Visualizing portfolio performance...")
-        manager.visualize_portfolio_performance()
+        with span("output", command="portfolio-rolling"):
+            click.echo(f"{'Window':>6} {'Return':>9} {'Volatility':>11} {'Sharpe':>8} {'Beta':>7}   (as of {result.dates[-1].date()})")
+            for window, latest in result.latest().items():
+                click.echo(f"{window:>5}d {latest['return']:>9.2%} {latest['volatility']:>11.2%} "
+                           f"{latest['sharpe']:>8.2f} {latest['beta']:>7.2f}")
+            if output:
+                with open_writer(output, key="date") as writer:
+                    writer.write_many(result.records())
+                click.echo(f"Rolling metrics saved to {output}")
 
-        click.echo("Visualizing correlation matrix...")
-        manager.visualize_correlation_matrix()
+        if correlations:
+            dates, matrices = manager.rolling_correlations(correlation_window, step, path=correlations)
+            matrices.flush()
+            with open(correlations[:-len(".npy")] + ".json", "w") as file:
+                file.write(dumps({"window": correlation_window, "step": step, "tickers": list(portfolio.keys()),
+                                  "dates": dates}))
+            click.echo(f"{len(dates)} correlation matrices of {len(portfolio)} tickers saved to {correlations}")
+    except Exception as e:
+        logger.error(f"Error computing rolling portfolio analytics: {e}")
+        click.echo(f"Error: {e}")
+
+
+# Price Cache Command
+@cli.command(name="price-cache")
+@click.option("--clear", is_flag=True, help="Remove every cached price series.")
+def price_cache(clear):
+    """
+    Show price cache usage, optionally clearing it.
+    """
+    from src.core.price_cache import get_price_cache
+
+    cache = get_price_cache()
+    if clear:
+        cache.clear()
+        click.echo(f"Cleared price cache at {cache.cache_dir}")
+    click.echo(f"Price Cache ({cache.cache_dir}): {cache.stats()}")
+
+# Portfolio Optimization Command
+@cli.command(name="portfolio-optimize")
+@click.option("--tickers", default=None, help="Comma-separated list of tickers to allocate between")
+@click.option("--universe", default=None, help="Path to a universe file with one ticker per line")
+@click.option("--workers", default=DEFAULT_WORKERS, help="Number of concurrent downloads")
+@click.option("--timeframe", default="1y", help="Timeframe for historical data.")
+@click.option("--objective", default="max_sharpe", type=click.Choice(["min_variance", "max_sharpe", "target_return"]), help="Optimization objective")
+@click.option("--target-return", default=None, type=float, help="Annualized return for the target_return objective")
+@click.option("--max-weight", default=1.0, help="Cap on each asset's absolute weight")
+@click.option("--allow-short", is_flag=True, help="Allow negative weights (down to -max-weight)")
+@click.option("--risk-free-rate", default=0.0, help="Annualized risk-free rate for Sharpe ratios")
+@click.option("--frontier-points", default=0, help="Also trace the efficient frontier at this many points")
+@click.option("--monte-carlo", default=0, help="Also evaluate this many random portfolios")
+@click.option("--config-path", default="config/market_analyst_config.yaml", help="Path to config file.")
+def portfolio_optimize(tickers, universe, workers, timeframe, objective, target_return, max_weight, allow_short,
+                       risk_free_rate, frontier_points, monte_carlo, config_path):
+    """
+    Optimize portfolio weights and trace the efficient frontier.
+    """
+    try:
+        tickers_list = resolve_tickers(tickers, universe)
+        constraints = {"max_weight": max_weight, "risk_free_rate": risk_free_rate}
+        response = remote("optimize", {"tickers": tickers_list, "timeframe": timeframe, "objective": objective,
+                                       "target_return": target_return, "allow_short": allow_short,
+                                       "frontier_points": frontier_points, "monte_carlo": monte_carlo,
+                                       **constraints})
+        if response is None:
+            from src.agents.portfolio_manager_analyst import PortfolioManagerAnalyst
+
+            manager = PortfolioManagerAnalyst(config_path)
+            manager.set_portfolio({ticker: 1 / len(tickers_list) for ticker in tickers_list})
+            manager.timeframe = timeframe
+            manager.max_workers = workers
+            manager.fetch_data()
+
+            constraints["long_only"] = not allow_short
+            response = {"result": manager.optimize(objective, target_return=target_return, **constraints)}
+            if frontier_points:
+                response["frontier"] = manager.efficient_frontier(frontier_points, **constraints)
+            if monte_carlo:
+                response["monte_carlo"] = manager.monte_carlo_portfolios(monte_carlo, **constraints)
+
+        from src.core.output import dumps
+
+        with span("output", command="portfolio-optimize"):
+            click.echo(f"Optimal Portfolio ({objective}): {dumps(response['result'], indent=4)}")
+
+            if "frontier" in response:
+                import pandas as pd
 
+                click.echo("\nEfficient Frontier:")
+                click.echo(pd.DataFrame(response["frontier"]).round(4).to_string(index=False))
+
+            if "monte_carlo" in response:
+                click.echo(f"\nMonte Carlo Portfolios: {dumps(response['monte_carlo'], indent=4)}")
     except Exception as e:
+        logger.error(f"Error optimizing portfolio: {e}")
         click.echo(f"Error: {e}")
 
 
+# Combined Analysis Command
+@cli.command(name="analyze-all")
+@click.option("--tickers", default=None, help="Comma-separated watchlist of tickers")
+@click.option("--universe", default=None, help="Path to a universe file of TICKER[,weight] lines (weights set the portfolio)")
+@click.option("--keywords", default=None, help="Comma-separated Google Trends keywords (default: the tickers)")
+@click.option("--timeframe", default="1y", help="Timeframe for price history")
+@click.option("--trends-timeframe", default="today 12-m", help="Timeframe for Google Trends")
+@click.option("--region", default="US", help="Region for Google Trends")
+@click.option("--workers", default=DEFAULT_WORKERS, help="Number of concurrent downloads")
+@click.option("--output", default=None, help="Optional path to save the full report as .json, or one record per ticker as .ndjson/.jsonl, .csv or .parquet")
+def analyze_all(tickers, universe, keywords, timeframe, trends_timeframe, region, workers, output):
+    """
+    Run the market, quant, sentiment and portfolio agents concurrently over one watchlist.
+    """
+    try:
+        weights = load_universe_weights(universe) if universe else {}
+        tickers_list = list(weights)
+        if tickers or not weights:
+            # Tickers from --tickers carry no weights, so the portfolio falls back to equal weights.
+            tickers_list = list(dict.fromkeys(tickers_list + resolve_tickers(tickers, None)))
+            weights = {}
+        keywords_list = [kw.strip() for kw in keywords.split(",") if kw.strip()] if keywords else None
+
+        report = remote("analyze-all", {"tickers": tickers_list, "keywords": keywords_list, "timeframe": timeframe,
+                                        "trends_timeframe": trends_timeframe, "region": region,
+                                        "weights": weights or None})
+        if report is None:
+            from src.agents.orchestrator import Orchestrator
+            from src.core.price_cache import get_price_cache
+
+            orchestrator = Orchestrator(max_workers=workers)
+            report = orchestrator.run_sync(tickers_list, keywords=keywords_list, timeframe=timeframe,
+                                           trends_timeframe=trends_timeframe, region=region, weights=weights or None)
+            logger.info(f"Price cache: {get_price_cache().stats()}")
+
+        from src.core.output import dumps
+
+        with span("output", command="analyze-all"):
+            for section in ("market", "quant", "sentiment", "portfolio"):
+                click.echo(f"\n{section.title()}:")
+                click.echo(dumps(report[section], indent=4))
+            for ticker, message in report["failures"].items():
+                click.echo(f"\nFailed to fetch {ticker}: {message}")
+
+            click.echo("\nStage timings:")
+            status = report["status"]
+            for agent in [status] + list(status["agents"].values()):
+                for stage, record in agent["stages"].items():
+                    click.echo(f"  {agent['name']:<24} {stage:<16} {record['state']:<8} {record['seconds']:.3f}s")
+
+            if output:
+                save_report(report, output)
+                click.echo(f"Report saved to {output}")
+    except Exception as e:
+        logger.error(f"Error running combined analysis: {e}")
+        click.echo(f"Error: {e}")
+
+
+def save_report(report, output):
+    """
+    Write an analyze-all report: the whole nested report for .json, otherwise one flattened record
+    per ticker with its market indicators and strategy results.
+    """
+    from src.core.output import dumps, open_writer, output_format
+
+    if output_format(output) == "json":
+        with open(output, "w") as file:
+            file.write(dumps(report, indent=4))
+        return
+    market = report["market"] if "error" not in report["market"] else {}
+    quant = report["quant"] if "error" not in report["quant"] else {}
+    with open_writer(output) as writer:
+        for ticker, indicators in market.items():
+            record = {"ticker": ticker, "market": {key: value for key, value in indicators.items() if key != "ticker"}}
+            for strategy in ("mean_reversion", "momentum"):
+                if ticker in quant.get(strategy, {}):
+                    record[strategy] = quant[strategy][ticker]
+            writer.write(record)
+        for ticker, message in report["failures"].items():
+            writer.write({"ticker": ticker, "error": message})
+
+
+# Daemon Command
+@cli.command(name="serve")
+@click.option("--host", default="127.0.0.1", help="Interface to listen on")
+@click.option("--port", default=DEFAULT_SERVER_PORT, help="TCP port to listen on")
+@click.option("--socket", "socket_path", default=None, help="Listen on this Unix socket instead of TCP")
+@click.option("--refresh", default=DEFAULT_REFRESH, help="Seconds between background data refreshes (0 disables them)")
+@click.option("--workers", default=DEFAULT_WORKERS, help="Number of concurrent downloads")
+@click.option("--chart-dir", default=".", help="Directory charts requested through the daemon are written under; clients' --chart-dir is relative to it")
+def serve(host, port, socket_path, refresh, workers, chart_dir):
+    """
+    Run a daemon that keeps prices, indicators and Trends data warm and answers other commands run with --server.
+    """
+    from src.terminal.server import serve as run_server
+
+    address = f"unix://{socket_path}" if socket_path else f"{host}:{port}"
+    try:
+        run_server(address, refresh=refresh, max_workers=workers, chart_dir=chart_dir)
+    except Exception as e:
+        logger.error(f"Error running server: {e}")
+        click.echo(f"Error: {e}")
+
 
 if __name__ == "__main__":
     cli()
@@ -0,0 +1,88 @@
+import http.client
+import json
+import socket
+from typing import Any, Dict, Optional, Tuple
+
+from src.core.settings import DEFAULT_SERVER_PORT
+
+# Only the standard library here: the CLI imports this module when it acts as a thin client, and
+# skipping the scientific stack is the point of talking to a daemon.
+
+
+def parse_address(address: str) -> Tuple[str, Any]:
+    """
+    Split a server address into ("unix", socket path) or ("tcp", (host, port)). Accepts
+    "unix:///path/to.sock", a bare socket path, "http://host:port", "host:port" or just "host".
+    """
+    if address.startswith("unix://"):
+        return "unix", address[len("unix://"):]
+    if address.startswith("/") or address.endswith(".sock"):
+        return "unix", address
+    address = address.split("://", 1)[-1].rstrip("/")
+    host, _, port = address.rpartition(":") if ":" in address else (address, "", "")
+    if port and not port.isdigit():
+        raise ValueError(f"Invalid server address: {address}")
+    return "tcp", (host or "127.0.0.1", int(port) if port else DEFAULT_SERVER_PORT)
+
+
+class UnixHTTPConnection(http.client.HTTPConnection):
+    """HTTP over a Unix domain socket."""
+
+    def __init__(self, path: str, timeout: Optional[float] = None):
+        super().__init__("localhost", timeout=timeout)
+        self.path = path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        if self.timeout is not None:
+            self.sock.settimeout(self.timeout)
+        self.sock.connect(self.path)
+
+
+class ZenithClient:
+    """
+    Sends analysis requests to a `zenith serve` daemon and returns the decoded JSON results.
+    Errors the daemon reports for a request are raised as ValueError.
+    """
+
+    def __init__(self, address: str, timeout: Optional[float] = 600):
+        self.address = address
+        self.kind, self.target = parse_address(address)
+        self.timeout = timeout
+
+    def request(self, endpoint: str, payload: Optional[Dict[str, Any]] = None) -> Any:
+        """POST `payload` to an analysis endpoint, e.g. request("market", {"tickers": ["AAPL"]})."""
+        body = json.dumps(payload or {}).encode()
+        return self._send("POST", f"/{endpoint}", body)
+
+    def status(self) -> Dict[str, Any]:
+        return self._send("GET", "/status")
+
+    def metrics(self) -> str:
+        return self._send("GET", "/metrics")
+
+    def _connection(self) -> http.client.HTTPConnection:
+        if self.kind == "unix":
+            return UnixHTTPConnection(self.target, timeout=self.timeout)
+        host, port = self.target
+        return http.client.HTTPConnection(host, port, timeout=self.timeout)
+
+    def _send(self, method: str, path: str, body: Optional[bytes] = None) -> Any:
+        connection = self._connection()
+        try:
+            connection.request(method, path, body=body, headers={"Content-Type": "application/json"})
+            response = connection.getresponse()
+            data = response.read()
+        except (ConnectionError, FileNotFoundError, socket.timeout) as e:
+            raise ConnectionError(f"No Zenith server at {self.address} ({e}); start one with `zenith serve`") from e
+        finally:
+            connection.close()
+
+        if response.getheader("Content-Type", "").startswith("application/json"):
+            decoded = json.loads(data)
+            if response.status >= 400:
+                raise ValueError(decoded.get("error", f"HTTP {response.status}"))
+            return decoded
+        if response.status >= 400:
+            raise ValueError(f"HTTP {response.status}: {data.decode(errors='replace')}")
+        return data.decode()
@@ -0,0 +1,396 @@
+import json
+import logging
+import os
+import signal
+import socket
+import socketserver
+import threading
+import time
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from src.agents.market_analyst import MarketDataAnalyst
+from src.agents.orchestrator import Orchestrator
+from src.agents.portfolio_manager_analyst import PortfolioManagerAnalyst
+from src.agents.quant_analyst import QuantAnalyst
+from src.agents.sentiment_analyst import SentimentAnalyst
+from src.analytics.leadlag import price_window
+from src.core.bulk_fetch import BulkFetchResult
+from src.core.output import dumps
+from src.core.price_cache import PriceCache, get_price_cache
+from src.core.profiling import METRICS
+from src.core.rendering import ChartRenderer
+from src.core.settings import DEFAULT_REFRESH, DEFAULT_WORKERS
+from src.core.timeframes import TimeframeData
+from src.core.trends import TrendsScheduler
+from src.terminal.client import parse_address
+
+logger = logging.getLogger("Zenith")
+
+MAX_RESULTS = 256  # Memoized responses kept between refreshes
+REPLAY = 32  # Most recent distinct requests recomputed after each refresh
+LISTEN_BACKLOG = 128  # socketserver's default of 5 refuses bursts of concurrent CLI calls
+
+
+class AnalysisService:
+    """
+    The daemon's state: warm price frames, a shared Google Trends scheduler and memoized responses.
+
+    Responses are memoized per endpoint and parameters until the next refresh; concurrent identical
+    requests wait for one computation instead of repeating it. Every `refresh` seconds a background
+    thread tops up the prices, drops the memo and recomputes the most recent requests so they stay warm.
+    """
+
+    def __init__(self, refresh: float = DEFAULT_REFRESH, max_workers: int = DEFAULT_WORKERS,
+                 cache: Optional[PriceCache] = None, trends: Optional[TrendsScheduler] = None,
+                 chart_dir: str = "."):
+        self.cache = cache or get_price_cache()
+        # Stale series must be topped up on every scheduled refresh, not only after the cache's own TTL.
+        if refresh > 0:
+            self.cache.ttl = min(self.cache.ttl, refresh)
+        self.trends = trends or TrendsScheduler(ttl=min(refresh, 3600) if refresh > 0 else 3600)
+        self.prices = TimeframeData(self.cache, max_workers, ttl=self.cache.ttl)
+        self.refresh_interval = refresh
+        self.max_workers = max_workers
+        # Clients can't be trusted with arbitrary paths (TCP has no authentication), so every chart
+        # the daemon writes lands under this directory.
+        self.chart_dir = os.path.realpath(chart_dir)
+        self.generation = 0
+        self.started = time.time()
+        self.last_refresh: Optional[float] = None
+        self.requests = 0
+        self.hits = 0
+        self._results: "OrderedDict[str, Tuple[int, Any]]" = OrderedDict()
+        self._pending: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._refresher: Optional[threading.Thread] = None
+        self.endpoints: Dict[str, Callable[..., Any]] = {
+            "market": self.market,
+            "timeframes": self.timeframes,
+            "screen": self.screen,
+            "quant": self.quant,
+            "portfolio": self.portfolio,
+            "optimize": self.optimize,
+            "risk": self.risk,
+            "sentiment": self.sentiment,
+            "lead-lag": self.lead_lag,
+            "analyze-all": self.analyze_all,
+        }
+
+    def handle(self, endpoint: str, params: Dict[str, Any]) -> Any:
+        """Answer one request, from the memo when the same request was answered since the last refresh."""
+        if endpoint not in self.endpoints:
+            raise ValueError(f"Unknown endpoint: {endpoint}. Choose from {sorted(self.endpoints)}")
+        with self._lock:
+            self.requests += 1
+        return self._answer(json.dumps([endpoint, params], sort_keys=True, default=str), endpoint, params)
+
+    def refresh(self):
+        """Top up prices, invalidate memoized responses and recompute the most recent requests."""
+        start = time.perf_counter()
+        failures = self.prices.refresh()
+        with self._lock:
+            self.generation += 1
+            recent = list(self._results)[-REPLAY:]
+            self._results.clear()
+        for key in recent:
+            endpoint, params = json.loads(key)
+            try:
+                self._answer(key, endpoint, params)
+            except Exception as e:
+                logger.warning(f"Refreshing {endpoint} failed: {e}")
+        self.last_refresh = time.time()
+        logger.info(f"Refreshed {len(self.prices)} series and {len(recent)} responses in "
+                    f"{time.perf_counter() - start:.2f}s ({len(failures)} failures)")
+
+    def start(self):
+        """Start the background refresh thread."""
+        if self._refresher is None and self.refresh_interval > 0:
+            self._refresher = threading.Thread(target=self._refresh_loop, name="zenith-refresh", daemon=True)
+            self._refresher.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def status(self) -> Dict[str, Any]:
+        with self._lock:
+            memoized = len(self._results)
+        return {
+            "uptime": round(time.time() - self.started, 3),
+            "requests": self.requests,
+            "memo_hits": self.hits,
+            "memoized": memoized,
+            "series": len(self.prices),
+            "timeframes": self.prices.stats(),
+            "generation": self.generation,
+            "refresh_interval": self.refresh_interval,
+            "last_refresh": self.last_refresh,
+            "price_cache": self.cache.stats(),
+            "trends": self.trends.stats(),
+        }
+
+    # Endpoints. Parameters mirror the CLI options of the matching commands.
+
+    def market(self, tickers: List[str], period: str = "1y", interval: str = "1d") -> Dict[str, Any]:
+        fetched = self._fetch(tickers, period, interval)
+        results = self._agent(MarketDataAnalyst).analyze_fetched(fetched, interval)
+        return {"results": {ticker: result.to_dict() for ticker, result in results.items()},
+                "failures": fetched.failures}
+
+    def timeframes(self, tickers: List[str], timeframes: List[Tuple[str, str]]) -> Dict[str, Any]:
+        results, failures = self._agent(MarketDataAnalyst).analyze_timeframes(
+            tickers, [tuple(timeframe) for timeframe in timeframes], max_workers=self.max_workers)
+        return {"results": {timeframe: {ticker: result.to_dict() for ticker, result in by_ticker.items()}
+                            for timeframe, by_ticker in results.items()},
+                "failures": failures}
+
+    def screen(self, tickers: List[str], where: Optional[str] = None, rank_by: Optional[str] = None,
+               top: Optional[int] = None, ascending: bool = False, period: str = "1y", interval: str = "1d",
+               as_of: Optional[str] = None, refresh: bool = False) -> Dict[str, Any]:
+        matches = self._agent(MarketDataAnalyst).screen(tickers, where, rank_by, top, ascending, period=period,
+                                                        interval=interval, as_of=as_of, refresh=refresh,
+                                                        max_workers=self.max_workers)
+        return {"results": matches.reset_index().to_dict("records")}
+
+    def quant(self, strategy: str, tickers: List[str], timeframe: str = "1y", top_k: int = 20,
+              min_correlation: float = 0.7) -> Dict[str, Any]:
+        analyst = self._agent(QuantAnalyst)
+        analyst.config.update({"pairs_top_k": top_k, "pairs_min_correlation": min_correlation})
+        return analyst.analyze_fetched(strategy, self._fetch(tickers, timeframe))
+
+    def portfolio(self, portfolio: Dict[str, float], timeframe: str = "1y", chart_dir: Optional[str] = None,
+                  chart_format: str = "png") -> Dict[str, Any]:
+        manager = self._portfolio_manager(portfolio, timeframe)
+        response: Dict[str, Any] = {"metrics": manager.calculate_portfolio_metrics(), "charts": []}
+        if chart_dir:
+            renderer = ChartRenderer("file", output_dir=self._chart_path(chart_dir), formats=chart_format.split(","),
+                                     processes=1)
+            response["charts"] = renderer.render_many(manager.chart_jobs())
+        return response
+
+    def _chart_path(self, chart_dir: str) -> str:
+        """A client's chart directory, relative to the daemon's; paths that lead outside it raise ValueError."""
+        path = os.path.realpath(os.path.join(self.chart_dir, chart_dir))
+        if os.path.commonpath([path, self.chart_dir]) != self.chart_dir:
+            raise ValueError(f"Charts can only be written under the daemon's chart directory {self.chart_dir}, "
+                             f"not {chart_dir}; start serve with --chart-dir to change it")
+        return path
+
+    def optimize(self, tickers: List[str], timeframe: str = "1y", objective: str = "max_sharpe",
+                 target_return: Optional[float] = None, max_weight: float = 1.0, allow_short: bool = False,
+                 risk_free_rate: float = 0.0, frontier_points: int = 0, monte_carlo: int = 0) -> Dict[str, Any]:
+        manager = self._portfolio_manager({ticker: 1 / len(tickers) for ticker in tickers}, timeframe)
+        constraints = {"long_only": not allow_short, "max_weight": max_weight, "risk_free_rate": risk_free_rate}
+        response: Dict[str, Any] = {"result": manager.optimize(objective, target_return=target_return, **constraints)}
+        if frontier_points:
+            response["frontier"] = manager.efficient_frontier(frontier_points, **constraints).to_dict("records")
+        if monte_carlo:
+            response["monte_carlo"] = manager.monte_carlo_portfolios(monte_carlo, **constraints)
+        return response
+
+    def risk(self, portfolio: Dict[str, float], timeframe: str = "1y", confidences: Optional[List[float]] = None,
+             horizons: Optional[List[int]] = None, paths: int = 100_000, seed: Optional[int] = None,
+             scenarios: Optional[Dict[str, Dict[str, float]]] = None, propagate: bool = True) -> Dict[str, Any]:
+        manager = self._portfolio_manager(portfolio, timeframe)
+        options = {"confidences": confidences, "horizons": horizons}
+        return manager.risk_report(paths=paths, seed=seed, scenarios=scenarios, propagate=propagate,
+                                   **{key: value for key, value in options.items() if value})
+
+    def sentiment(self, keywords: List[str], timeframe: str = "now 7-d", region: str = "",
+                  anchor: Optional[str] = None) -> Dict[str, Any]:
+        data = self.trends.interest_over_time(keywords, timeframe=timeframe, geo=region, anchor=anchor)
+        if data.empty:
+            raise ValueError("No data found for the given keywords.")
+        return {"index": [stamp.isoformat() for stamp in data.index],
+                "trends": {keyword: data[keyword].tolist() for keyword in data.columns}}
+
+    def lead_lag(self, keywords: List[str], tickers: List[str], timeframe: str = "today 5-y", region: str = "",
+                 anchor: Optional[str] = None, max_lag: int = 8, min_lag: int = 0, top: int = 20,
+                 difference: bool = True, method: str = "auto") -> Dict[str, Any]:
+        analyst = self._agent(SentimentAnalyst)
+        analyst.trends = self.trends
+        return analyst.lead_lag(keywords, tickers, timeframe=timeframe, region=region, anchor=anchor, max_lag=max_lag,
+                                top=top, min_lag=min_lag, difference=difference, method=method,
+                                fetched=self._fetch(tickers, *price_window(timeframe)))
+
+    def analyze_all(self, tickers: List[str], keywords: Optional[List[str]] = None, timeframe: str = "1y",
+                    trends_timeframe: str = "today 12-m", region: str = "",
+                    weights: Optional[Dict[str, float]] = None) -> Dict[str, Any]:
+        orchestrator = Orchestrator(max_workers=self.max_workers)
+        orchestrator.sentiment.trends = self.trends
+        return orchestrator.run_sync(tickers, keywords=keywords, timeframe=timeframe,
+                                     trends_timeframe=trends_timeframe, region=region, weights=weights,
+                                     fetched=self._fetch(tickers, timeframe))
+
+    def _fetch(self, tickers: List[str], period: str = "1y", interval: str = "1d") -> BulkFetchResult:
+        return self.prices.fetch_many(tickers, [(period, interval)])[period, interval]
+
+    def _agent(self, cls):
+        # Agents are cheap to build; a fresh one per request keeps concurrent requests from sharing state.
+        agent = cls("")
+        agent.price_cache = self.cache
+        agent.timeframes = self.prices
+        agent.max_workers = self.max_workers
+        return agent
+
+    def _portfolio_manager(self, portfolio: Dict[str, float], timeframe: str) -> PortfolioManagerAnalyst:
+        manager = self._agent(PortfolioManagerAnalyst)
+        manager.set_portfolio(portfolio)
+        manager.timeframe = timeframe
+        manager.use_data(self._fetch(list(portfolio), timeframe))
+        return manager
+
+    def _answer(self, key: str, endpoint: str, params: Dict[str, Any]) -> Any:
+        with self._lock:
+            cached = self._cached(key)
+            pending = self._pending.setdefault(key, threading.Lock()) if cached is None else None
+        if cached is not None:
+            return cached
+
+        # One computation per key: identical concurrent requests wait here and then read the memo.
+        with pending:
+            with self._lock:
+                cached = self._cached(key)
+            if cached is not None:
+                return cached
+            generation = self.generation
+            try:
+                result = self.endpoints[endpoint](**params)
+            finally:
+                with self._lock:
+                    self._pending.pop(key, None)
+            with self._lock:
+                self._results[key] = (generation, result)
+                self._results.move_to_end(key)
+                while len(self._results) > MAX_RESULTS:
+                    self._results.popitem(last=False)
+            return result
+
+    def _cached(self, key: str) -> Optional[Any]:
+        """The memoized response for `key` if it was computed since the last refresh. Call with the lock held."""
+        cached = self._results.get(key)
+        if cached is not None and cached[0] == self.generation:
+            self._results.move_to_end(key)
+            self.hits += 1
+            return cached[1]
+        return None
+
+    def _refresh_loop(self):
+        while not self._stop.wait(self.refresh_interval):
+            try:
+                self.refresh()
+            except Exception as e:
+                logger.error(f"Background refresh failed: {e}")
+
+
+def to_json(value: Any) -> str:
+    """JSON for agent results, which mix NumPy scalars, pandas timestamps and plain Python values."""
+    return dumps(value)
+
+
+class RequestHandler(BaseHTTPRequestHandler):
+    """POST /<endpoint> with JSON parameters; GET /status, /metrics and /health."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        service: AnalysisService = self.server.service
+        if self.path == "/status":
+            self._reply(200, to_json(service.status()))
+        elif self.path == "/metrics":
+            self._reply(200, METRICS.to_prometheus(), "text/plain; version=0.0.4")
+        elif self.path == "/health":
+            self._reply(200, to_json({"ok": True}))
+        else:
+            self._reply(404, to_json({"error": f"Unknown path: {self.path}"}))
+
+    def do_POST(self):
+        service: AnalysisService = self.server.service
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            params = json.loads(self.rfile.read(length) or b"{}")
+            if not isinstance(params, dict):
+                raise ValueError("Request body must be a JSON object.")
+            result = service.handle(self.path.strip("/"), params)
+            self._reply(200, to_json(result))
+        except (ValueError, TypeError, KeyError) as e:
+            self._reply(400, to_json({"error": str(e)}))
+        except Exception as e:
+            logger.exception(f"Request to {self.path} failed")
+            self._reply(500, to_json({"error": str(e)}))
+
+    def _reply(self, status: int, body: str, content_type: str = "application/json"):
+        data = body.encode()
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        # Unix socket peers have no address, and per-request lines belong at debug level anyway.
+        logger.debug("%s %s", self.command, format % args)
+
+
+class TCPHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = LISTEN_BACKLOG
+
+
+class UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+    request_queue_size = LISTEN_BACKLOG
+
+    def get_request(self):
+        request, _ = super().get_request()
+        return request, ("local", 0)
+
+
+def make_server(address: str, service: AnalysisService) -> socketserver.BaseServer:
+    """A threaded HTTP server for `service` on a TCP "host:port" or a "unix:///path" socket."""
+    kind, target = parse_address(address)
+    if kind == "unix":
+        if os.path.exists(target):
+            probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                probe.connect(target)
+            except OSError:
+                os.remove(target)  # Left behind by a daemon that didn't shut down cleanly
+            else:
+                raise ValueError(f"A server is already listening on {target}")
+            finally:
+                probe.close()
+        server = UnixHTTPServer(target, RequestHandler)
+        os.chmod(target, 0o600)  # Only the owner's CLI may talk to the daemon
+    else:
+        server = TCPHTTPServer(target, RequestHandler)
+    server.service = service
+    return server
+
+
+def serve(address: str, refresh: float = DEFAULT_REFRESH, max_workers: int = DEFAULT_WORKERS, chart_dir: str = "."):
+    """Run the daemon until interrupted or terminated."""
+    METRICS.enable()
+    service = AnalysisService(refresh=refresh, max_workers=max_workers, chart_dir=chart_dir)
+    server = make_server(address, service)
+    service.start()
+    signal.signal(signal.SIGTERM, _terminate)
+    logger.info(f"Zenith daemon listening on {address}"
+                + (f" (refreshing every {refresh}s)" if refresh > 0 else " (background refresh off)"))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.stop()
+        server.server_close()
+        kind, target = parse_address(address)
+        if kind == "unix" and os.path.exists(target):
+            os.remove(target)
+
+
+def _terminate(signum, frame):
+    # Leave serve_forever the same way Ctrl-C does, so the socket file is removed.
+    raise KeyboardInterrupt